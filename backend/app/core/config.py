@@ -18,5 +18,93 @@ class Settings:
     FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:5173")
     BACKEND_URL: str = os.getenv("BACKEND_URL", "http://localhost:8080")
 
+    # OAuth provider endpoints (overridable for GitHub Enterprise or a local
+    # stand-in provider)
+    GOOGLE_OIDC_METADATA_URL: str = os.getenv(
+        "GOOGLE_OIDC_METADATA_URL",
+        "https://accounts.google.com/.well-known/openid-configuration",
+    )
+    GITHUB_OAUTH_URL: str = os.getenv("GITHUB_OAUTH_URL", "https://github.com")
+    GITHUB_API_URL: str = os.getenv("GITHUB_API_URL", "https://api.github.com")
+    # Shared HTTP client for provider API calls
+    OAUTH_HTTP_TIMEOUT_SECONDS: float = float(
+        os.getenv("OAUTH_HTTP_TIMEOUT_SECONDS", "10")
+    )
+    OAUTH_HTTP_MAX_CONNECTIONS: int = int(os.getenv("OAUTH_HTTP_MAX_CONNECTIONS", "20"))
+    # Google's OpenID metadata and signing keys are refetched after this long
+    OIDC_METADATA_TTL_SECONDS: float = float(
+        os.getenv("OIDC_METADATA_TTL_SECONDS", "3600")
+    )
+
+    # Database connections. Each worker has a sync and an async engine, so
+    # at most 2 * (DB_POOL_SIZE + DB_MAX_OVERFLOW) connections per worker.
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+    # Seconds to wait for a free connection before failing the request
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+    # Replace connections older than this (seconds), ahead of server and
+    # proxy idle timeouts
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+    DB_POOL_PRE_PING: bool = (
+        os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+    )
+    # Statements at least this slow are logged (0 disables the log)
+    DB_SLOW_QUERY_MS: float = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+
+    # Bearer token for the operational endpoints (/internal/stats and
+    # /metrics); while unset they answer 404
+    INTERNAL_API_TOKEN: str = os.getenv("INTERNAL_API_TOKEN", "")
+
+    # Upper bound on items in one /events/batch request
+    EVENT_BATCH_MAX_ITEMS: int = int(os.getenv("EVENT_BATCH_MAX_ITEMS", "500"))
+
+    # Largest file POST /events/import accepts
+    EVENT_IMPORT_MAX_BYTES: int = int(
+        os.getenv("EVENT_IMPORT_MAX_BYTES", str(10 * 1024 * 1024))
+    )
+
+    # Longest range /freebusy answers, and how far ahead a recurring event is
+    # checked for conflicts
+    FREEBUSY_MAX_DAYS: int = int(os.getenv("FREEBUSY_MAX_DAYS", "62"))
+    FREEBUSY_MAX_USERS: int = int(os.getenv("FREEBUSY_MAX_USERS", "100"))
+
+    # Change feed fan-out: "memory" (single process), "postgres"
+    # (LISTEN/NOTIFY, needed with several workers or instances) or "auto"
+    # (postgres when the database is Postgres)
+    EVENT_FEED_BACKEND: str = os.getenv("EVENT_FEED_BACKEND", "auto")
+    EVENT_FEED_QUEUE_SIZE: int = int(os.getenv("EVENT_FEED_QUEUE_SIZE", "100"))
+    EVENT_FEED_HEARTBEAT_SECONDS: float = float(
+        os.getenv("EVENT_FEED_HEARTBEAT_SECONDS", "15")
+    )
+
+    # Event listings this long are streamed as a chunked JSON array
+    EVENT_STREAM_MIN_ITEMS: int = int(os.getenv("EVENT_STREAM_MIN_ITEMS", "1000"))
+    EVENT_STREAM_CHUNK_SIZE: int = int(os.getenv("EVENT_STREAM_CHUNK_SIZE", "200"))
+
+    # Cached day-view layouts, one per version of a day listing (its ETag)
+    LAYOUT_CACHE_TTL_SECONDS: float = float(os.getenv("LAYOUT_CACHE_TTL_SECONDS", "300"))
+    LAYOUT_CACHE_MAX_SIZE: int = int(os.getenv("LAYOUT_CACHE_MAX_SIZE", "4096"))
+
+    # In-process cache of authenticated users (0 disables it)
+    USER_CACHE_TTL_SECONDS: float = float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+    USER_CACHE_MAX_SIZE: int = int(os.getenv("USER_CACHE_MAX_SIZE", "1024"))
+
+    # GET /users/search: result cap and the per-worker cache of results by
+    # query (0 disables it; new users show up in other workers after the TTL)
+    USER_SEARCH_MAX_RESULTS: int = int(os.getenv("USER_SEARCH_MAX_RESULTS", "20"))
+    USER_SEARCH_CACHE_TTL_SECONDS: float = float(
+        os.getenv("USER_SEARCH_CACHE_TTL_SECONDS", "30")
+    )
+    USER_SEARCH_CACHE_MAX_SIZE: int = int(os.getenv("USER_SEARCH_CACHE_MAX_SIZE", "2048"))
+
+    # Password hashing: the first scheme hashes new passwords, the others are
+    # still accepted and upgraded on the next successful login
+    PASSWORD_HASH_SCHEMES: list = os.getenv("PASSWORD_HASH_SCHEMES", "bcrypt").split(",")
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    # Hash/verify jobs allowed to run or wait per worker before failing fast
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+
 
 settings = Settings()
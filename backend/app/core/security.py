@@ -1,15 +1,36 @@
+import asyncio
+import hmac
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from fastapi.security import OAuth2PasswordBearer
+from fastapi import Depends, HTTPException
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBearer,
+    OAuth2PasswordBearer,
+)
 from app.schemas import TokenData
 from app.core.config import settings
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
+# For endpoints that also accept the token from elsewhere (e.g. ?token=)
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token", auto_error=False)
+# Operational endpoints (/internal/*, /metrics) take INTERNAL_API_TOKEN instead
+internal_token_scheme = HTTPBearer(auto_error=False)
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Password hashing. Pinning bcrypt rounds makes hashes with any other cost
+# factor (and any non-default scheme) "need update", so they are rehashed
+# transparently on the next successful login.
+pwd_context = CryptContext(
+    schemes=[scheme.strip() for scheme in settings.PASSWORD_HASH_SCHEMES],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+)
 
 # JWT settings
 SECRET_KEY = settings.SECRET_KEY
@@ -25,6 +46,69 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHashingBusy(Exception):
+    """Raised when too many hash/verify jobs are already queued."""
+
+
+class PasswordHasher:
+    """Runs password hashing on a dedicated, size-limited thread pool.
+
+    Hashing never occupies the event loop or the shared request threadpool,
+    and once `max_pending` jobs are running or queued further calls raise
+    PasswordHashingBusy immediately instead of piling up behind them.
+    """
+
+    def __init__(self, workers: int, max_pending: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._lock = threading.Lock()
+        self.pending = 0
+        self.rejected = 0
+
+    async def _run(self, fn: Callable, *args):
+        with self._lock:
+            if self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordHashingBusy()
+            self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, fn, *args)
+        finally:
+            with self._lock:
+                self.pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: Optional[str]
+    ) -> Tuple[bool, Optional[str]]:
+        """Verify a password; also return a new hash if the stored one is outdated."""
+        if not hashed_password:
+            return False, None
+        return await self._run(
+            pwd_context.verify_and_update, plain_password, hashed_password
+        )
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
+
+
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
     if expires_delta:
@@ -46,3 +130,20 @@ def decode_access_token(token: str) -> Optional[TokenData]:
     except JWTError:
         return None
     return token_data
+
+
+def require_internal_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(internal_token_scheme),
+) -> None:
+    """Admit requests bearing INTERNAL_API_TOKEN; 404 while it is unset."""
+    expected = settings.INTERNAL_API_TOKEN
+    if not expected:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), expected.encode()
+    ):
+        raise HTTPException(
+            status_code=401,
+            detail="Invalid internal token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -1,9 +1,37 @@
+import io
+import json
+from collections import Counter, defaultdict
 from datetime import date
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from itertools import islice
+from sqlalchemy import (
+    Row,
+    and_,
+    column,
+    delete,
+    func,
+    insert,
+    literal,
+    literal_column,
+    or_,
+    select,
+    table,
+    text,
+    tuple_,
+    union,
+    union_all,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import app.schemas as schemas
-from app.models.models import DBEvent, DBUser
+from app import event_feed, event_search
+from app.core.cache import user_cache
+from app.models.models import DBEvent, DBEventCount, DBUser, event_participants
+from app.recurrence import merge_occurrences, series_end, sort_key
+from app.user_search import SUBSTRING_MIN_LENGTH, invalidate_user_search, like_escape
 
 
 # --- User CRUD ---
@@ -26,8 +54,19 @@ def get_user_by_email(
     return query.first()
 
 
-def get_users(db: Session, skip: int = 0, limit: int = 100) -> List[DBUser]:
-    return db.query(DBUser).offset(skip).limit(limit).all()
+def get_users(
+    db: Session,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[str, int]] = None,
+) -> List[DBUser]:
+    query = db.query(DBUser)
+    if after:
+        # Keyset seek: start right after the last (username, id) already seen
+        query = query.filter(tuple_(DBUser.username, DBUser.id) > tuple_(*after))
+        skip = 0
+    query = query.order_by(DBUser.username, DBUser.id)
+    return query.offset(skip).limit(limit).all()
 
 
 def create_user(db: Session, user: schemas.UserCreate) -> DBUser:
@@ -44,6 +83,31 @@ def create_user(db: Session, user: schemas.UserCreate) -> DBUser:
     db.add(db_user)
     db.commit()
     db.refresh(db_user)
+    user_cache.invalidate(db_user.id)
+    invalidate_user_search()
+    return db_user
+
+
+def update_user_password(db: Session, db_user: DBUser, hashed_password: str) -> DBUser:
+    db_user.hashed_password = hashed_password
+    db.add(db_user)
+    db.commit()
+    user_cache.invalidate(db_user.id)
+    return db_user
+
+
+def link_oauth_account(
+    db: Session, db_user: DBUser, provider: str, provider_id: str
+) -> DBUser:
+    if provider == "google":
+        db_user.google_id = provider_id
+    elif provider == "github":
+        db_user.github_id = provider_id
+    db_user.provider = provider
+    db.add(db_user)
+    db.commit()
+    db.refresh(db_user)
+    user_cache.invalidate(db_user.id)
     return db_user
 
 
@@ -57,9 +121,127 @@ def get_user_by_oauth_id(
     return None
 
 
+def _search_key(db: Session, column):
+    key = func.lower(column)
+    if db.get_bind().dialect.name == "postgresql":
+        # Byte order, as in the ix_users_*_lower indexes: there every prefix
+        # is one contiguous range
+        key = key.collate("C")
+    return key
+
+
+def _has_prefix(key, query: str):
+    # No character sorts after U+10FFFF, so this is the range of the prefix
+    return and_(key >= query, key < query + "\U0010ffff")
+
+
+def search_users(db: Session, query: str, limit: int) -> Tuple[List[Row], bool]:
+    """Candidate users for a normalized (lowercased) query, and whether they
+    are all the users that match.
+
+    One query, one branch per kind of match, each stopping after `limit`
+    rows, so a one-letter prefix costs the same on any directory size:
+    username and email prefixes are read in index order, substrings (long
+    enough queries only) come from the trigram indexes on Postgres and a scan
+    elsewhere. app.user_search ranks the candidates.
+    """
+    columns = (DBUser.id, DBUser.username, DBUser.email, DBUser.image)
+    username, email = _search_key(db, DBUser.username), _search_key(db, DBUser.email)
+    branches = [
+        select(*columns, literal(0).label("branch"))
+        .where(_has_prefix(username, query))
+        .order_by(username, DBUser.id)
+        .limit(limit),
+        select(*columns, literal(1).label("branch"))
+        .where(_has_prefix(email, query))
+        .order_by(email, DBUser.id)
+        .limit(limit),
+    ]
+    if len(query) >= SUBSTRING_MIN_LENGTH:
+        pattern = "%" + like_escape(query) + "%"
+        branches.append(
+            select(*columns, literal(2).label("branch"))
+            .where(
+                or_(
+                    func.lower(DBUser.username).like(pattern, escape="/"),
+                    func.lower(DBUser.email).like(pattern, escape="/"),
+                ),
+                ~_has_prefix(username, query),
+                ~_has_prefix(email, query),
+            )
+            .limit(limit)
+        )
+    rows = db.execute(
+        union_all(*(branch.subquery().select() for branch in branches))
+    ).all()
+    complete = all(count < limit for count in Counter(row.branch for row in rows).values())
+    return rows, complete
+
+
 # --- Event CRUD ---
+# EventResponse serializes the creator and participants of every event, so
+# load them up front: one JOIN for the creator and one IN query for all
+# participants, instead of two lazy SELECTs per event.
+EVENT_LOAD_OPTIONS = (
+    joinedload(DBEvent.creator),
+    selectinload(DBEvent.participants),
+)
+
+
+def _event_columns(
+    event: schemas.EventBase,
+    exclude_unset: bool = False,
+    stored_recurrence: Optional[dict] = None,
+) -> dict:
+    """Column values for an event payload, in the form the events table stores.
+
+    `stored_recurrence` is the event's current rule, used to recompute
+    recurrence_end when an update moves the series without restating it.
+    """
+    columns = event.model_dump(
+        include=set(schemas.EventBase.model_fields), exclude_unset=exclude_unset
+    )
+    if "type" in columns:
+        columns["type"] = event.type.value
+    if "recurrence" in columns:
+        rule = event.recurrence
+    elif stored_recurrence is not None:
+        rule = schemas.RecurrenceRule.model_validate(stored_recurrence)
+    else:
+        return columns
+    columns["recurrence"] = rule.model_dump(mode="json") if rule else None
+    columns["recurrence_end"] = series_end(event.start_date, rule) if rule else None
+    return columns
+
+
 def get_event(db: Session, event_id: int) -> Optional[DBEvent]:
-    return db.query(DBEvent).filter(DBEvent.id == event_id).first()
+    return (
+        db.query(DBEvent)
+        .options(*EVENT_LOAD_OPTIONS)
+        .filter(DBEvent.id == event_id)
+        .first()
+    )
+
+
+def _visible_to(user_id: int, include_participating: bool, conditions: list):
+    """Filter for a user's events meeting the conditions.
+
+    With include_participating, events the user attends count too. They are
+    found as a UNION of two selects that each stay on an index:
+    ix_events_creator_start for the created events and
+    ix_event_participants_user_event for the attended ones. The conditions
+    go into both, so a date range narrows each side before the union
+    (which also drops the duplicates: creators attend their own events).
+    """
+    if not include_participating:
+        return and_(DBEvent.creator_id == user_id, *conditions)
+    created = select(DBEvent.id).where(DBEvent.creator_id == user_id, *conditions)
+    attended = (
+        select(DBEvent.id)
+        .join(event_participants, event_participants.c.event_id == DBEvent.id)
+        .where(event_participants.c.user_id == user_id, *conditions)
+    )
+    return DBEvent.id.in_(union(created, attended))
 
 
 def get_events(
@@ -68,17 +250,201 @@ def get_events(
     skip: int = 0,
     limit: int = 100,
     event_date: Optional[date] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[Tuple[date, int, int]] = None,
+    include_participating: bool = False,
 ) -> List[DBEvent]:
-    query = db.query(DBEvent).filter(DBEvent.creator_id == creator_id)
+    """List a user's events in (start_date, startMinute, id) order.
+
+    With a date range, recurring series are expanded into their occurrences
+    inside the range and merged lazily with the single events; without one,
+    the stored rows (series included) are listed as they are. With
+    include_participating, events the user attends are listed as well.
+    """
+    # An exact date is just a one-day range
     if event_date:
-        query = query.filter(DBEvent.start_date == event_date)
+        date_from = date_to = event_date
+    expand = date_from is not None or date_to is not None
+    conditions = []
+    if expand:
+        conditions.append(DBEvent.recurrence.is_(None))
+    if date_from:
+        conditions.append(DBEvent.start_date >= date_from)
+    if date_to:
+        conditions.append(DBEvent.start_date <= date_to)
+    if after:
+        # Keyset seek on the listing order; cost does not grow with page depth
+        conditions.append(
+            tuple_(DBEvent.start_date, DBEvent.startMinute, DBEvent.id)
+            > tuple_(*after)
+        )
+        skip = 0
+    query = (
+        db.query(DBEvent)
+        .options(*EVENT_LOAD_OPTIONS)
+        .filter(_visible_to(creator_id, include_participating, conditions))
+        # Ordered like ix_events_creator_start so the range is read in index order
+        .order_by(DBEvent.start_date, DBEvent.startMinute, DBEvent.id)
+    )
+
+    series = (
+        get_recurring_series(db, creator_id, date_from, date_to, include_participating)
+        if expand
+        else []
+    )
+    if not series:
+        return query.offset(skip).limit(limit).all()
+
+    # The first skip + limit merged items need at most that many single events
+    single_events = query.limit(skip + limit).all()
+    window_start = date_from
+    if after:
+        window_start = max(window_start or after[0], after[0])
+    occurrences = merge_occurrences(single_events, series, window_start, date_to)
+    if after:
+        occurrences = (o for o in occurrences if sort_key(o) > after)
+    return list(islice(occurrences, skip, skip + limit))
+
+
+def get_recurring_series(
+    db: Session,
+    creator_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    include_participating: bool = False,
+) -> List[DBEvent]:
+    """Recurring events of a user that may have occurrences in the range."""
+    conditions = [DBEvent.recurrence.isnot(None)]
+    if date_to:
+        conditions.append(DBEvent.start_date <= date_to)
+    if date_from:
+        conditions.append(
+            or_(DBEvent.recurrence_end.is_(None), DBEvent.recurrence_end >= date_from)
+        )
+    return (
+        db.query(DBEvent)
+        .options(*EVENT_LOAD_OPTIONS)
+        .filter(_visible_to(creator_id, include_participating, conditions))
+        .all()
+    )
+
+
+def search_events(
+    db: Session,
+    user_id: int,
+    terms: List[str],
+    skip: int = 0,
+    limit: int = 20,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> List[DBEvent]:
+    """Events the user created or attends matching every search term, best
+    match first (then latest first).
+
+    Matches come from the full-text index (see app.event_search), never a
+    scan of the user's events. With a date range, single events must start
+    in it and recurring series must have occurrences that may fall in it;
+    series are returned as stored, not expanded.
+    """
+    query = (
+        db.query(DBEvent)
+        .options(*EVENT_LOAD_OPTIONS)
+        .filter(
+            # Checked per match, by primary key, rather than listing
+            # everything the user attends
+            or_(
+                DBEvent.creator_id == user_id,
+                select(event_participants)
+                .where(
+                    event_participants.c.event_id == DBEvent.id,
+                    event_participants.c.user_id == user_id,
+                )
+                .exists(),
+            )
+        )
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        search_vector = literal_column(
+            f"events.{event_search.SEARCH_VECTOR_COLUMN}", postgresql.TSVECTOR
+        )
+        ts_query = func.to_tsquery(event_search.SEARCH_CONFIG, event_search.tsquery(terms))
+        query = query.filter(search_vector.op("@@")(ts_query))
+        score = func.ts_rank(search_vector, ts_query)
+    else:
+        fts = table(event_search.FTS_TABLE, column("rowid"))
+        fts_table = literal_column(event_search.FTS_TABLE)
+        query = query.join(fts, fts.c.rowid == DBEvent.id).filter(
+            fts_table.op("MATCH")(event_search.fts5_query(terms))
+        )
+        # Same column weights as the Postgres vector; bm25 is lower-is-better
+        score = -func.bm25(fts_table, 10.0, 5.0, 2.0)
+    if date_to:
+        query = query.filter(DBEvent.start_date <= date_to)
+    if date_from:
+        query = query.filter(
+            or_(
+                and_(DBEvent.recurrence.is_(None), DBEvent.start_date >= date_from),
+                and_(
+                    DBEvent.recurrence.isnot(None),
+                    or_(DBEvent.recurrence_end.is_(None), DBEvent.recurrence_end >= date_from),
+                ),
+            )
+        )
+    query = query.order_by(score.desc(), DBEvent.start_date.desc(), DBEvent.id.desc())
     return query.offset(skip).limit(limit).all()
 
 
+# Rows fetched per round trip when streaming a full calendar
+EXPORT_BATCH_SIZE = 500
+
+
+def export_events_query(creator_id: int):
+    """All of a user's stored events (series not expanded), for streamed reads.
+
+    Run with yield_per so rows come from a server-side cursor one batch at a
+    time; selectinload then loads participants once per batch. The creator
+    is not loaded: it is the exporting user.
+    """
+    return (
+        select(DBEvent)
+        .options(selectinload(DBEvent.participants))
+        .where(DBEvent.creator_id == creator_id)
+        .order_by(DBEvent.start_date, DBEvent.startMinute, DBEvent.id)
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+
+
+def get_events_version(db: Session, user_id: int) -> int:
+    return db.scalar(select(DBUser.events_version).where(DBUser.id == user_id)) or 0
+
+
+def _bump_events_version(db: Session, user_ids) -> None:
+    """Invalidate the listing ETags of everyone who sees the written events."""
+    user_ids = set(user_ids)
+    if user_ids:
+        db.execute(
+            update(DBUser)
+            .where(DBUser.id.in_(user_ids))
+            .values(events_version=DBUser.events_version + 1)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def _participants_by_event(db: Session, event_ids) -> Dict[int, set]:
+    participants = defaultdict(set)
+    rows = db.execute(
+        select(event_participants.c.event_id, event_participants.c.user_id).where(
+            event_participants.c.event_id.in_(set(event_ids))
+        )
+    )
+    for event_id, user_id in rows:
+        participants[event_id].add(user_id)
+    return participants
+
+
 def create_event(db: Session, event: schemas.EventCreate, creator_id: int) -> DBEvent:
-    # Use model_dump instead of dict method pydantic v2
-    event_data = event.model_dump(exclude={"participants"})
-    db_event = DBEvent(**event_data, creator_id=creator_id)
+    db_event = DBEvent(**_event_columns(event), creator_id=creator_id)
 
     # Add creator to participants list
     participant_ids = set(event.participants or [])
@@ -89,32 +455,773 @@ def create_event(db: Session, event: schemas.EventCreate, creator_id: int) -> DB
         db_event.participants.extend(participants)
 
     db.add(db_event)
+    _bump_event_count(db, creator_id, *_count_key(db_event), 1)
+    viewer_ids = {creator_id, *(p.id for p in db_event.participants)}
+    _bump_events_version(db, viewer_ids)
+    db.flush()  # Assigns the id the change notice refers to
+    event_feed.publish(db, "created", db_event.id, db_event.start_date, viewer_ids)
     db.commit()
-    db.refresh(db_event)
-    return db_event
+    return get_event(db, db_event.id)
+
+
+class EventWriteRejected(Exception):
+    """A conditional event write matched no row.
+
+    `reason` is "not_found", "forbidden" or "stale" (the event is at another
+    version than the caller expected); `version` is the current one.
+    """
+
+    def __init__(self, reason: str, version: Optional[int] = None):
+        super().__init__(reason)
+        self.reason = reason
+        self.version = version
+
+
+def _write_conditions(
+    event_id: int, creator_id: int, versions: Optional[Iterable[int]]
+) -> list:
+    """Match the event only if it is the creator's and, given versions, at one."""
+    conditions = [DBEvent.id == event_id, DBEvent.creator_id == creator_id]
+    if versions is not None:
+        conditions.append(DBEvent.version.in_(set(versions)))
+    return conditions
+
+
+def _rejection(current: Optional[Row], creator_id: int) -> EventWriteRejected:
+    """Why a write to the event in `current` (creator_id, version) was refused."""
+    if current is None:
+        return EventWriteRejected("not_found")
+    if current.creator_id != creator_id:
+        return EventWriteRejected("forbidden", current.version)
+    return EventWriteRejected("stale", current.version)
+
+
+def _reject(db: Session, event_id: int, creator_id: int) -> EventWriteRejected:
+    """Roll back a write that matched nothing and read why; only on failure."""
+    db.rollback()
+    current = db.execute(
+        select(DBEvent.creator_id, DBEvent.version).where(DBEvent.id == event_id)
+    ).first()
+    return _rejection(current, creator_id)
+
+
+def _event_users(
+    db: Session, event_id: int, user_ids: Iterable[int]
+) -> Tuple[Dict[int, DBUser], set]:
+    """The given users and the event's participants, in one query.
+
+    Returns the users by id and the ids of those who attend the event.
+    """
+    attending = (
+        select(DBUser, literal(True).label("attending"))
+        .join(event_participants, event_participants.c.user_id == DBUser.id)
+        .where(event_participants.c.event_id == event_id)
+    )
+    others = select(DBUser, literal(False).label("attending")).where(
+        DBUser.id.in_(set(user_ids))
+    )
+    rows = union_all(attending, others).subquery()
+    user = aliased(DBUser, rows)
+    users, attendees = {}, set()
+    for db_user, is_attending in db.execute(select(user, rows.c.attending)):
+        users[db_user.id] = db_user
+        if is_attending:
+            attendees.add(db_user.id)
+    return users, attendees
+
+
+def _set_people(db_event: DBEvent, users: Dict[int, DBUser], participant_ids) -> None:
+    """Fill creator and participants from loaded users, without lazy loads."""
+    set_committed_value(db_event, "creator", users[db_event.creator_id])
+    participants = [users[user_id] for user_id in sorted(participant_ids)]
+    set_committed_value(db_event, "participants", participants)
+
+
+def _update_event_row(
+    db: Session,
+    event: schemas.EventUpdate,
+    event_id: int,
+    creator_id: int,
+    versions: Optional[Iterable[int]],
+) -> Tuple[DBEvent, Row]:
+    """Write the event's columns and bump its version; returns it and its old state.
+
+    On Postgres this is one statement: a CTE locks the row if the conditions
+    hold, and the UPDATE joins it to return the old state with the new row.
+    Elsewhere the old state is read first and the UPDATE only applies while
+    the event is still at the version read.
+    """
+    where = _write_conditions(event_id, creator_id, versions)
+    if db.get_bind().dialect.name == "postgresql":
+        old = (
+            select(DBEvent.id, DBEvent.start_date, DBEvent.type, DBEvent.recurrence)
+            .where(*where)
+            .with_for_update()
+            .cte("old")
+        )
+        columns = _event_columns(event, exclude_unset=True)
+        row = db.execute(
+            update(DBEvent)
+            .where(DBEvent.id == old.c.id)
+            .values(**columns, version=DBEvent.version + 1)
+            .returning(DBEvent, old.c.start_date, old.c.type, old.c.recurrence)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).first()
+        if row is None:
+            raise _reject(db, event_id, creator_id)
+        db_event = row[0]
+        if "recurrence" not in columns and db_event.recurrence is not None:
+            # The stored rule was not known when the UPDATE was built
+            rule = schemas.RecurrenceRule.model_validate(db_event.recurrence)
+            recurrence_end = series_end(db_event.start_date, rule)
+            if recurrence_end != db_event.recurrence_end:
+                db.execute(
+                    update(DBEvent)
+                    .where(DBEvent.id == event_id)
+                    .values(recurrence_end=recurrence_end)
+                    .execution_options(synchronize_session=False)
+                )
+                set_committed_value(db_event, "recurrence_end", recurrence_end)
+        return db_event, row
+
+    while True:
+        current = db.execute(
+            select(
+                DBEvent.creator_id,
+                DBEvent.version,
+                DBEvent.start_date,
+                DBEvent.type,
+                DBEvent.recurrence,
+            ).where(DBEvent.id == event_id)
+        ).first()
+        if (
+            current is None
+            or current.creator_id != creator_id
+            or (versions is not None and current.version not in set(versions))
+        ):
+            raise _rejection(current, creator_id)
+        columns = _event_columns(
+            event, exclude_unset=True, stored_recurrence=current.recurrence
+        )
+        db_event = db.scalars(
+            update(DBEvent)
+            .where(*where, DBEvent.version == current.version)
+            .values(**columns, version=DBEvent.version + 1)
+            .returning(DBEvent)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        ).first()
+        if db_event is not None:
+            return db_event, current
+        # Written by someone else since the read; check again against that
 
 
 def update_event(
-    db: Session, event: schemas.EventUpdate, event_id: int
-) -> Optional[DBEvent]:
-    db_event = get_event(db, event_id)
-    if db_event:
-        event_data = event.model_dump(exclude_unset=True, exclude={"participants"})
-        for key, value in event_data.items():
-            setattr(db_event, key, value)
-        if event.participants is not None:
-            participants = (
-                db.query(DBUser).filter(DBUser.id.in_(event.participants)).all()
+    db: Session,
+    event: schemas.EventUpdate,
+    event_id: int,
+    creator_id: int,
+    versions: Optional[Iterable[int]] = None,
+) -> DBEvent:
+    """Update the creator's event, if at one of `versions` when given.
+
+    Ownership and the version are checked by the UPDATE that writes the row,
+    so there is no read-then-write window; raises EventWriteRejected when the
+    conditions do not hold. Participants are diffed rather than rewritten,
+    and the returned event comes with its creator and participants from the
+    same users query, without reloading it.
+    """
+    db_event, old = _update_event_row(db, event, event_id, creator_id, versions)
+    users, attendees = _event_users(
+        db, event_id, {creator_id, *(event.participants or [])}
+    )
+    participant_ids = attendees
+    if event.participants is not None:
+        participant_ids = set(event.participants) & users.keys()
+        removed, added = attendees - participant_ids, participant_ids - attendees
+        if removed:
+            db.execute(
+                delete(event_participants).where(
+                    event_participants.c.event_id == event_id,
+                    event_participants.c.user_id.in_(removed),
+                )
             )
-            db_event.participants = participants
-        db.commit()
-        db.refresh(db_event)
+        if added:
+            db.execute(
+                insert(event_participants),
+                [{"event_id": event_id, "user_id": user_id} for user_id in added],
+            )
+    _set_people(db_event, users, participant_ids)
+
+    old_key, new_key = (old.start_date, old.type), _count_key(db_event)
+    if new_key != old_key:
+        _bump_event_count(db, creator_id, *old_key, -1)
+        _bump_event_count(db, creator_id, *new_key, 1)
+    viewer_ids = {creator_id, *attendees, *participant_ids}
+    _bump_events_version(db, viewer_ids)
+    event_feed.publish(db, "updated", event_id, db_event.start_date, viewer_ids)
+    db.commit()
     return db_event
 
 
-def delete_event(db: Session, event_id: int) -> Optional[DBEvent]:
-    db_event = get_event(db, event_id)
-    if db_event:
-        db.delete(db_event)
-        db.commit()
+def delete_event(
+    db: Session,
+    event_id: int,
+    creator_id: int,
+    versions: Optional[Iterable[int]] = None,
+) -> DBEvent:
+    """Delete the creator's event, if at one of `versions` when given.
+
+    The participant rows go first (they reference the event), then a
+    conditional DELETE ... RETURNING removes the event; if its conditions do
+    not hold, both are rolled back and EventWriteRejected is raised.
+    """
+    attendees = set(
+        db.scalars(
+            delete(event_participants)
+            .where(event_participants.c.event_id == event_id)
+            .returning(event_participants.c.user_id)
+        )
+    )
+    db_event = db.scalars(
+        delete(DBEvent)
+        .where(*_write_conditions(event_id, creator_id, versions))
+        .returning(DBEvent)
+        .execution_options(synchronize_session=False)
+    ).first()
+    if db_event is None:
+        raise _reject(db, event_id, creator_id)
+    users = {
+        user.id: user
+        for user in db.scalars(
+            select(DBUser).where(DBUser.id.in_(attendees | {creator_id}))
+        )
+    }
+    _set_people(db_event, users, attendees & users.keys())
+
+    _bump_event_count(db, creator_id, *_count_key(db_event), -1)
+    viewer_ids = {creator_id, *attendees}
+    _bump_events_version(db, viewer_ids)
+    event_feed.publish(db, "deleted", event_id, db_event.start_date, viewer_ids)
+    db.commit()
     return db_event
+
+
+# --- Free/busy ---
+def get_busy_events(
+    db: Session,
+    user_ids: List[int],
+    date_from: date,
+    date_to: date,
+    exclude_event_id: Optional[int] = None,
+) -> List[Tuple[set, date, Optional[dict], int, int]]:
+    """Events occupying any of the users in the range, with who they occupy.
+
+    Returns (user_ids, start_date, recurrence, startMinute, endMinute) tuples;
+    user_ids is the subset of the requested users that created or attend.
+    """
+    user_ids = set(user_ids)
+    attended = select(event_participants.c.event_id).where(
+        event_participants.c.user_id.in_(user_ids)
+    )
+    in_range = or_(
+        DBEvent.recurrence.is_(None)
+        & DBEvent.start_date.between(date_from, date_to),
+        DBEvent.recurrence.isnot(None)
+        & (DBEvent.start_date <= date_to)
+        & or_(DBEvent.recurrence_end.is_(None), DBEvent.recurrence_end >= date_from),
+    )
+    query = select(
+        DBEvent.id,
+        DBEvent.creator_id,
+        DBEvent.start_date,
+        DBEvent.recurrence,
+        DBEvent.startMinute,
+        DBEvent.endMinute,
+    ).where(
+        or_(DBEvent.creator_id.in_(user_ids), DBEvent.id.in_(attended)), in_range
+    )
+    if exclude_event_id is not None:
+        query = query.where(DBEvent.id != exclude_event_id)
+    rows = db.execute(query).all()
+    if not rows:
+        return []
+
+    occupied = defaultdict(set)
+    for row in rows:
+        if row.creator_id in user_ids:
+            occupied[row.id].add(row.creator_id)
+    participant_rows = db.execute(
+        select(event_participants.c.event_id, event_participants.c.user_id).where(
+            event_participants.c.event_id.in_([row.id for row in rows]),
+            event_participants.c.user_id.in_(user_ids),
+        )
+    )
+    for event_id, user_id in participant_rows:
+        occupied[event_id].add(user_id)
+
+    return [
+        (
+            occupied[row.id],
+            row.start_date,
+            row.recurrence,
+            row.startMinute,
+            row.endMinute,
+        )
+        for row in rows
+    ]
+
+
+# --- Batch event writes ---
+def _batch_result(
+    op: schemas.BatchOperation,
+    index: int,
+    event_id: Optional[int] = None,
+    detail: Optional[str] = None,
+) -> schemas.EventBatchItemResult:
+    return schemas.EventBatchItemResult(
+        op=op,
+        index=index,
+        status=schemas.BatchItemStatus.error if detail else schemas.BatchItemStatus.ok,
+        id=event_id,
+        detail=detail,
+    )
+
+
+def _batch_rejection(
+    index: int, event_id: int, rejected: EventWriteRejected
+) -> schemas.EventBatchItemResult:
+    """The result of a batch update whose conditional UPDATE was refused."""
+    if rejected.reason == "stale":
+        return schemas.EventBatchItemResult(
+            op=schemas.BatchOperation.update,
+            index=index,
+            status=schemas.BatchItemStatus.conflict,
+            id=event_id,
+            detail=f"Event was modified; it is now at version {rejected.version}",
+        )
+    detail = (
+        "Event not found"
+        if rejected.reason == "not_found"
+        else "Not authorized to update this event"
+    )
+    return _batch_result(schemas.BatchOperation.update, index, event_id, detail)
+
+
+def _load_owned_events(
+    db: Session, creator_id: int, event_ids: List[int], op: schemas.BatchOperation
+) -> Tuple[Dict[int, Row], Dict[int, str]]:
+    """Fetch the caller's events' current state in one query; report the rest."""
+    rows = db.execute(
+        select(
+            DBEvent.id,
+            DBEvent.creator_id,
+            DBEvent.start_date,
+            DBEvent.type,
+            DBEvent.recurrence,
+            DBEvent.version,
+        ).where(DBEvent.id.in_(set(event_ids)))
+    ).all()
+    found = {row.id: row for row in rows}
+    owned, errors = {}, {}
+    for event_id in event_ids:
+        row = found.get(event_id)
+        if row is None:
+            errors[event_id] = "Event not found"
+        elif row.creator_id != creator_id:
+            errors[event_id] = f"Not authorized to {op.value} this event"
+        else:
+            owned[event_id] = row
+    return owned, errors
+
+
+def batch_events(
+    db: Session,
+    creator_id: int,
+    create: List[schemas.EventCreate],
+    update_items: List[schemas.EventBatchUpdate],
+) -> List[schemas.EventBatchItemResult]:
+    """Create and update many events in a single transaction.
+
+    Participant ids are resolved in one query, and new events and
+    event_participants rows are written with executemany statements. Each
+    update is its own UPDATE conditioned on the version the item carries (or
+    the one just read), so a concurrent write is never overwritten. Items
+    that target missing or foreign events are reported as errors and those
+    whose event has moved to another version as conflicts; both are skipped
+    and the rest are committed together.
+    """
+    results: List[schemas.EventBatchItemResult] = []
+    count_deltas: Counter = Counter()
+    viewer_ids = {creator_id}  # Users whose listings the batch changes
+
+    requested_ids = {creator_id}
+    for item in [*create, *update_items]:
+        requested_ids.update(item.participants or [])
+    known_user_ids = set(
+        db.scalars(select(DBUser.id).where(DBUser.id.in_(requested_ids)))
+    )
+
+    participant_rows = []
+    if create:
+        rows = [dict(_event_columns(item), creator_id=creator_id) for item in create]
+        new_ids = db.scalars(
+            insert(DBEvent).returning(DBEvent.id, sort_by_parameter_order=True), rows
+        ).all()
+        for index, (item, event_id) in enumerate(zip(create, new_ids)):
+            # The creator always participates in events they create
+            user_ids = (set(item.participants or []) | {creator_id}) & known_user_ids
+            participant_rows.extend(
+                {"event_id": event_id, "user_id": user_id} for user_id in user_ids
+            )
+            event_feed.publish(
+                db, "created", event_id, item.start_date, user_ids | {creator_id}
+            )
+            count_deltas[(item.start_date, item.type.value)] += 1
+            results.append(
+                _batch_result(schemas.BatchOperation.create, index, event_id)
+            )
+
+    if update_items:
+        owned, errors = _load_owned_events(
+            db,
+            creator_id,
+            [item.id for item in update_items],
+            schemas.BatchOperation.update,
+        )
+        old_participants = _participants_by_event(db, owned) if owned else {}
+        replaced_ids, seen_ids = [], set()
+        for index, item in enumerate(update_items):
+            if item.id in seen_ids:
+                errors.setdefault(item.id, "Event updated more than once in batch")
+            seen_ids.add(item.id)
+            if item.id in errors:
+                results.append(
+                    _batch_result(
+                        schemas.BatchOperation.update, index, item.id, errors[item.id]
+                    )
+                )
+                continue
+            current = owned[item.id]
+            expected = current.version if item.version is None else item.version
+            rejected = None
+            if expected == current.version:
+                columns = _event_columns(
+                    item, exclude_unset=True, stored_recurrence=current.recurrence
+                )
+                written = db.execute(
+                    update(DBEvent)
+                    .where(*_write_conditions(item.id, creator_id, [expected]))
+                    .values(**columns, version=DBEvent.version + 1)
+                    .execution_options(synchronize_session=False)
+                )
+                if written.rowcount != 1:
+                    # Changed or deleted since it was read above
+                    rejected = _rejection(
+                        db.execute(
+                            select(DBEvent.creator_id, DBEvent.version).where(
+                                DBEvent.id == item.id
+                            )
+                        ).first(),
+                        creator_id,
+                    )
+            else:
+                rejected = EventWriteRejected("stale", current.version)
+            if rejected is not None:
+                results.append(_batch_rejection(index, item.id, rejected))
+                continue
+            item_viewer_ids = {creator_id, *old_participants[item.id]}
+            if item.participants is not None:
+                replaced_ids.append(item.id)
+                new_participant_ids = set(item.participants) & known_user_ids
+                participant_rows.extend(
+                    {"event_id": item.id, "user_id": user_id}
+                    for user_id in new_participant_ids
+                )
+                item_viewer_ids |= new_participant_ids
+            viewer_ids |= item_viewer_ids
+            event_feed.publish(
+                db,
+                "updated",
+                item.id,
+                item.start_date or current.start_date,
+                item_viewer_ids,
+            )
+            count_deltas[(current.start_date, current.type)] -= 1
+            count_deltas[(item.start_date, item.type.value)] += 1
+            results.append(
+                _batch_result(schemas.BatchOperation.update, index, item.id)
+            )
+        if replaced_ids:
+            db.execute(
+                delete(event_participants).where(
+                    event_participants.c.event_id.in_(replaced_ids)
+                )
+            )
+
+    if participant_rows:
+        db.execute(insert(event_participants), participant_rows)
+        viewer_ids.update(row["user_id"] for row in participant_rows)
+    _apply_count_deltas(db, creator_id, count_deltas)
+    _bump_events_version(db, viewer_ids)
+    db.commit()
+    return results
+
+
+def delete_events(
+    db: Session, creator_id: int, event_ids: List[int]
+) -> List[schemas.EventBatchItemResult]:
+    owned, errors = _load_owned_events(
+        db, creator_id, event_ids, schemas.BatchOperation.delete
+    )
+    if owned:
+        participants = _participants_by_event(db, owned)
+        for row in owned.values():
+            event_feed.publish(
+                db,
+                "deleted",
+                row.id,
+                row.start_date,
+                {creator_id, *participants[row.id]},
+            )
+        _bump_events_version(db, {creator_id}.union(*participants.values()))
+        db.execute(
+            delete(event_participants).where(
+                event_participants.c.event_id.in_(list(owned))
+            )
+        )
+        db.execute(delete(DBEvent).where(DBEvent.id.in_(list(owned))))
+        count_deltas: Counter = Counter()
+        for row in owned.values():
+            count_deltas[(row.start_date, row.type)] -= 1
+        _apply_count_deltas(db, creator_id, count_deltas)
+    db.commit()
+    return [
+        _batch_result(
+            schemas.BatchOperation.delete, index, event_id, errors.get(event_id)
+        )
+        for index, event_id in enumerate(event_ids)
+    ]
+
+
+# --- Import ---
+# Events written per COPY / executemany round trip
+IMPORT_BATCH_SIZE = 1000
+
+# Columns an imported event fills, in COPY column order
+_IMPORT_COLUMNS = (
+    "title",
+    "start_date",
+    "time",
+    "duration",
+    "type",
+    "startMinute",
+    "endMinute",
+    "description",
+    "location",
+    "recurrence",
+    "recurrence_end",
+    "creator_id",
+)
+
+
+def _copy_field(value) -> str:
+    # COPY ... (FORMAT csv) reads an unquoted empty field as NULL
+    if value is None:
+        return ""
+    if isinstance(value, dict):
+        value = json.dumps(value)
+    elif isinstance(value, date):
+        value = value.isoformat()
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def _copy_rows(db: Session, table: str, columns, rows) -> None:
+    """COPY rows in on the session's own psycopg2 connection and transaction."""
+    quote = db.get_bind().dialect.identifier_preparer.quote
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_field(value) for value in row))
+        buffer.write("\n")
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table} ({', '.join(quote(column) for column in columns)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _insert_import_batch(db: Session, rows: List[dict]) -> List[int]:
+    """Insert event rows plus the creator's participant rows; returns the ids."""
+    if db.get_bind().dialect.driver == "psycopg2":
+        # COPY has no RETURNING: reserve the ids from the sequence up front
+        ids = db.scalars(
+            text(
+                "SELECT nextval(pg_get_serial_sequence('events', 'id')) "
+                "FROM generate_series(1, :n)"
+            ),
+            {"n": len(rows)},
+        ).all()
+        _copy_rows(
+            db,
+            "events",
+            ("id", *_IMPORT_COLUMNS),
+            (
+                [event_id, *(row[column] for column in _IMPORT_COLUMNS)]
+                for event_id, row in zip(ids, rows)
+            ),
+        )
+        _copy_rows(
+            db,
+            "event_participants",
+            ("event_id", "user_id"),
+            ((event_id, row["creator_id"]) for event_id, row in zip(ids, rows)),
+        )
+        return ids
+    ids = db.scalars(
+        insert(DBEvent).returning(DBEvent.id, sort_by_parameter_order=True), rows
+    ).all()
+    db.execute(
+        insert(event_participants),
+        [
+            {"event_id": event_id, "user_id": row["creator_id"]}
+            for event_id, row in zip(ids, rows)
+        ],
+    )
+    return ids
+
+
+def import_events(
+    db: Session,
+    creator_id: int,
+    events: Iterable[schemas.EventCreate],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> int:
+    """Insert a stream of new events in batches, in a single transaction.
+
+    Imported events have no participants besides the creator and need no
+    per-item results, so PostgreSQL (psycopg2) gets them through COPY and
+    other databases through executemany INSERTs. `events` is consumed lazily,
+    one batch at a time. Returns the number of events inserted.
+    """
+    events = iter(events)
+    imported = 0
+    count_deltas: Counter = Counter()
+    while True:
+        batch = list(islice(events, batch_size))
+        if not batch:
+            break
+        rows = [dict(_event_columns(event), creator_id=creator_id) for event in batch]
+        _insert_import_batch(db, rows)
+        for row in rows:
+            count_deltas[(row["start_date"], row["type"])] += 1
+        imported += len(rows)
+    if imported:
+        _apply_count_deltas(db, creator_id, count_deltas)
+        _bump_events_version(db, {creator_id})
+        # One notice for the whole import rather than one per event
+        event_feed.publish(db, "resync", None, None, {creator_id})
+    db.commit()
+    return imported
+
+
+# --- Event counters ---
+def _count_key(db_event: DBEvent) -> Tuple[date, str]:
+    # `type` may still hold the EventType enum before the row is flushed
+    return db_event.start_date, getattr(db_event.type, "value", db_event.type)
+
+
+def _bump_event_count(
+    db: Session, user_id: int, start_date: date, event_type: str, delta: int
+) -> None:
+    """Adjust one counter row inside the caller's transaction (no commit)."""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        dialect_insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = dialect_insert(DBEventCount).values(
+            user_id=user_id, start_date=start_date, type=event_type, count=delta
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "start_date", "type"],
+            set_={"count": DBEventCount.count + delta},
+        )
+        db.execute(stmt)
+    else:
+        counter = db.get(DBEventCount, (user_id, start_date, event_type))
+        if counter is None:
+            db.add(
+                DBEventCount(
+                    user_id=user_id, start_date=start_date, type=event_type, count=delta
+                )
+            )
+        else:
+            counter.count += delta
+        db.flush()
+
+    if delta < 0:
+        db.execute(
+            delete(DBEventCount).where(
+                DBEventCount.user_id == user_id,
+                DBEventCount.start_date == start_date,
+                DBEventCount.type == event_type,
+                DBEventCount.count <= 0,
+            )
+        )
+
+
+def _apply_count_deltas(db: Session, user_id: int, deltas: Counter) -> None:
+    for (start_date, event_type), delta in deltas.items():
+        if delta:
+            _bump_event_count(db, user_id, start_date, event_type, delta)
+
+
+def rebuild_event_counts(db: Session) -> None:
+    """Recompute every counter row from the events table."""
+    db.execute(delete(DBEventCount))
+    db.execute(
+        insert(DBEventCount).from_select(
+            ["user_id", "start_date", "type", "count"],
+            select(
+                DBEvent.creator_id, DBEvent.start_date, DBEvent.type, func.count()
+            ).group_by(DBEvent.creator_id, DBEvent.start_date, DBEvent.type),
+        )
+    )
+    db.commit()
+
+
+def get_event_stats(
+    db: Session,
+    user_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    bucket: Optional[schemas.StatsBucket] = None,
+) -> schemas.EventStats:
+    query = db.query(
+        DBEventCount.start_date, DBEventCount.type, DBEventCount.count
+    ).filter(DBEventCount.user_id == user_id)
+    if date_from:
+        query = query.filter(DBEventCount.start_date >= date_from)
+    if date_to:
+        query = query.filter(DBEventCount.start_date <= date_to)
+
+    by_type: Dict[str, int] = {t.value: 0 for t in schemas.EventType}
+    buckets: Dict[date, Dict[str, int]] = defaultdict(dict)
+    for start_date, event_type, count in query:
+        by_type[event_type] = by_type.get(event_type, 0) + count
+        if bucket == schemas.StatsBucket.month:
+            start_date = start_date.replace(day=1)
+        if bucket:
+            counts = buckets[start_date]
+            counts[event_type] = counts.get(event_type, 0) + count
+
+    return schemas.EventStats(
+        total=sum(by_type.values()),
+        by_type=by_type,
+        buckets=[
+            schemas.EventStatsBucket(date=bucket_date, counts=buckets[bucket_date])
+            for bucket_date in sorted(buckets)
+        ],
+    )
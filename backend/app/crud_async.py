@@ -0,0 +1,205 @@
+"""Async counterparts of the functions in app.crud.
+
+Each function runs the sync implementation through AsyncSession.run_sync, so
+the query logic lives in one place while every database round trip awaits on
+the asyncio driver instead of blocking a threadpool thread. Results are
+returned with everything EventResponse/UserResponse need already loaded; the
+async session never lazy-loads.
+"""
+
+from datetime import date
+from typing import AsyncIterator, Iterable, List, Optional, Tuple
+
+from sqlalchemy import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.crud as crud
+import app.schemas as schemas
+from app.models.models import DBEvent, DBUser
+
+
+# --- User CRUD ---
+async def get_user(db: AsyncSession, user_id: int) -> Optional[DBUser]:
+    return await db.run_sync(crud.get_user, user_id)
+
+
+async def get_user_by_email(
+    db: AsyncSession,
+    email: str,
+    provider: Optional[str] = None,
+    provider_id: Optional[str] = None,
+) -> Optional[DBUser]:
+    return await db.run_sync(crud.get_user_by_email, email, provider, provider_id)
+
+
+async def get_users(
+    db: AsyncSession,
+    skip: int = 0,
+    limit: int = 100,
+    after: Optional[Tuple[str, int]] = None,
+) -> List[DBUser]:
+    return await db.run_sync(crud.get_users, skip=skip, limit=limit, after=after)
+
+
+async def create_user(db: AsyncSession, user: schemas.UserCreate) -> DBUser:
+    return await db.run_sync(crud.create_user, user)
+
+
+async def update_user_password(
+    db: AsyncSession, db_user: DBUser, hashed_password: str
+) -> DBUser:
+    return await db.run_sync(crud.update_user_password, db_user, hashed_password)
+
+
+async def link_oauth_account(
+    db: AsyncSession, db_user: DBUser, provider: str, provider_id: str
+) -> DBUser:
+    return await db.run_sync(crud.link_oauth_account, db_user, provider, provider_id)
+
+
+async def get_user_by_oauth_id(
+    db: AsyncSession, provider: str, provider_id: str
+) -> Optional[DBUser]:
+    return await db.run_sync(crud.get_user_by_oauth_id, provider, provider_id)
+
+
+async def search_users(
+    db: AsyncSession, query: str, limit: int
+) -> Tuple[List[Row], bool]:
+    return await db.run_sync(crud.search_users, query, limit)
+
+
+# --- Event CRUD ---
+async def get_event(db: AsyncSession, event_id: int) -> Optional[DBEvent]:
+    return await db.run_sync(crud.get_event, event_id)
+
+
+async def get_events(
+    db: AsyncSession,
+    creator_id: int,
+    skip: int = 0,
+    limit: int = 100,
+    event_date: Optional[date] = None,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    after: Optional[Tuple[date, int, int]] = None,
+    include_participating: bool = False,
+) -> List[DBEvent]:
+    return await db.run_sync(
+        crud.get_events,
+        creator_id=creator_id,
+        skip=skip,
+        limit=limit,
+        event_date=event_date,
+        date_from=date_from,
+        date_to=date_to,
+        after=after,
+        include_participating=include_participating,
+    )
+
+
+async def create_event(
+    db: AsyncSession, event: schemas.EventCreate, creator_id: int
+) -> DBEvent:
+    return await db.run_sync(crud.create_event, event, creator_id)
+
+
+async def update_event(
+    db: AsyncSession,
+    event: schemas.EventUpdate,
+    event_id: int,
+    creator_id: int,
+    versions: Optional[Iterable[int]] = None,
+) -> DBEvent:
+    return await db.run_sync(crud.update_event, event, event_id, creator_id, versions)
+
+
+async def delete_event(
+    db: AsyncSession,
+    event_id: int,
+    creator_id: int,
+    versions: Optional[Iterable[int]] = None,
+) -> DBEvent:
+    return await db.run_sync(crud.delete_event, event_id, creator_id, versions)
+
+
+async def batch_events(
+    db: AsyncSession,
+    creator_id: int,
+    create: List[schemas.EventCreate],
+    update_items: List[schemas.EventBatchUpdate],
+) -> List[schemas.EventBatchItemResult]:
+    return await db.run_sync(crud.batch_events, creator_id, create, update_items)
+
+
+async def delete_events(
+    db: AsyncSession, creator_id: int, event_ids: List[int]
+) -> List[schemas.EventBatchItemResult]:
+    return await db.run_sync(crud.delete_events, creator_id, event_ids)
+
+
+async def stream_export_events(
+    db: AsyncSession, creator_id: int
+) -> AsyncIterator[DBEvent]:
+    """Yield every event of a user, read in yield_per batches.
+
+    Unlike the rest of this module this streams on the async result directly:
+    run_sync would have to materialize the whole result first.
+    """
+    result = await db.stream_scalars(crud.export_events_query(creator_id))
+    async for event in result:
+        yield event
+
+
+async def search_events(
+    db: AsyncSession,
+    user_id: int,
+    terms: List[str],
+    skip: int = 0,
+    limit: int = 20,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+) -> List[DBEvent]:
+    return await db.run_sync(
+        crud.search_events,
+        user_id,
+        terms,
+        skip=skip,
+        limit=limit,
+        date_from=date_from,
+        date_to=date_to,
+    )
+
+
+# --- Free/busy ---
+async def get_busy_events(
+    db: AsyncSession,
+    user_ids: List[int],
+    date_from: date,
+    date_to: date,
+    exclude_event_id: Optional[int] = None,
+) -> List[Tuple[set, date, Optional[dict], int, int]]:
+    return await db.run_sync(
+        crud.get_busy_events, user_ids, date_from, date_to, exclude_event_id
+    )
+
+
+# --- Event counters ---
+async def get_events_version(db: AsyncSession, user_id: int) -> int:
+    return await db.run_sync(crud.get_events_version, user_id)
+
+
+async def get_event_stats(
+    db: AsyncSession,
+    user_id: int,
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    bucket: Optional[schemas.StatsBucket] = None,
+) -> schemas.EventStats:
+    return await db.run_sync(
+        crud.get_event_stats,
+        user_id=user_id,
+        date_from=date_from,
+        date_to=date_to,
+        bucket=bucket,
+    )
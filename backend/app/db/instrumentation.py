@@ -0,0 +1,106 @@
+"""Connection pool statistics and the slow-query log."""
+
+import logging
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+slow_query_logger = logging.getLogger("app.db.slow_query")
+
+# Longest statement text written to the slow-query log
+_MAX_LOGGED_STATEMENT = 2000
+
+
+class _CheckoutTimingMixin:
+    """Times every checkout: how long a request waited to get a connection.
+
+    `_do_get` is the pool's internal "take an idle connection, open an
+    overflow one, or wait" step, so the times include waiting for a free
+    connection when the pool is exhausted (plus connect time when it grows).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            waited = time.perf_counter() - started
+            with self._stats_lock:
+                self.checkouts += 1
+                self.wait_total += waited
+                self.wait_max = max(self.wait_max, waited)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            return {
+                "size": self.size(),
+                "checked_out": self.checkedout(),
+                "checked_in": self.checkedin(),
+                "overflow": self.overflow(),
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_mean_ms": (
+                    self.wait_total / self.checkouts * 1000 if self.checkouts else 0.0
+                ),
+                "wait_max_ms": self.wait_max * 1000,
+            }
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_stats(engine) -> Dict[str, Any]:
+    pool = getattr(engine, "sync_engine", engine).pool
+    if isinstance(pool, _CheckoutTimingMixin):
+        return pool.stats()
+    return {"pool": type(pool).__name__, "status": pool.status()}
+
+
+def install_slow_query_log(engine, threshold_ms: float) -> None:
+    """Log statements that take at least `threshold_ms` (parameters are omitted)."""
+    if threshold_ms <= 0:
+        return
+    engine = getattr(engine, "sync_engine", engine)
+    threshold = threshold_ms / 1000
+
+    # The start time rides on the execution context, so a failed statement
+    # (no after_cursor_execute) leaves nothing behind
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start_timer(conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._slow_query_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _log_if_slow(conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_slow_query_started", None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        if elapsed >= threshold:
+            slow_query_logger.warning(
+                "Slow query (%.1f ms%s): %s",
+                elapsed * 1000,
+                ", executemany" if executemany else "",
+                statement[:_MAX_LOGGED_STATEMENT],
+            )
@@ -0,0 +1,62 @@
+from contextlib import contextmanager
+from typing import List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.session import async_engine, engine as sync_engine
+
+
+class QueryCounter:
+    """Counts the SQL statements an engine executes while the block is active.
+
+    Usage::
+
+        with QueryCounter() as counter:
+            client.get("/events/")
+        assert counter.count <= 3, counter.statements
+    """
+
+    def __init__(self, engine: Optional[Engine] = None):
+        if engine is None:
+            # Count both the sync and the async application engines
+            self.engines = [sync_engine, async_engine.sync_engine]
+        else:
+            # Async engines are instrumented through their sync_engine
+            self.engines = [getattr(engine, "sync_engine", engine)]
+        self.statements: List[str] = []
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ):
+        self.statements.append(statement)
+
+    def __enter__(self) -> "QueryCounter":
+        self.statements = []
+        for engine in self.engines:
+            event.listen(engine, "before_cursor_execute", self._before_cursor_execute)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for engine in self.engines:
+            event.remove(engine, "before_cursor_execute", self._before_cursor_execute)
+        return False
+
+
+@contextmanager
+def assert_max_queries(budget: int, engine: Optional[Engine] = None):
+    """Fail if the wrapped block runs more than `budget` SQL statements."""
+    with QueryCounter(engine) as counter:
+        yield counter
+    if counter.count > budget:
+        executed = "\n".join(
+            f"{i}. {statement}" for i, statement in enumerate(counter.statements, 1)
+        )
+        raise AssertionError(
+            f"Expected at most {budget} queries, {counter.count} were executed:\n"
+            f"{executed}"
+        )
@@ -1,15 +1,70 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
-
-engine_args = {"echo": True, "pool_pre_ping": True}
+from app.db.instrumentation import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    install_slow_query_log,
+)
+from app.metrics import instrument_engine
 
 if settings.SQLALCHEMY_DATABASE_URL and settings.SQLALCHEMY_DATABASE_URL.startswith("postgres://"):
     settings.SQLALCHEMY_DATABASE_URL = settings.SQLALCHEMY_DATABASE_URL.replace("postgres://", "postgresql://", 1)
 
-engine = create_engine(settings.SQLALCHEMY_DATABASE_URL, **engine_args)
+
+def get_engine_args(url: str, pool_class) -> dict:
+    """Engine options from Settings; `pool_class` is the instrumented pool to use."""
+    args = {"echo": settings.DB_ECHO, "pool_pre_ping": settings.DB_POOL_PRE_PING}
+    url = make_url(url)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite keeps its default single-connection pool
+        return args
+    return dict(
+        args,
+        poolclass=pool_class,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+
+def get_async_database_url(url: str) -> str:
+    """Map a sync database URL onto its asyncio driver (asyncpg / aiosqlite)."""
+    url = make_url(url)
+    if url.get_backend_name() == "postgresql":
+        url = url.set(drivername="postgresql+asyncpg")
+        # asyncpg takes `ssl` where libpq takes `sslmode`
+        if "sslmode" in url.query:
+            query = dict(url.query)
+            query["ssl"] = query.pop("sslmode")
+            url = url.set(query=query)
+    elif url.get_backend_name() == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    return url.render_as_string(hide_password=False)
+
+
+engine = create_engine(
+    settings.SQLALCHEMY_DATABASE_URL,
+    **get_engine_args(settings.SQLALCHEMY_DATABASE_URL, InstrumentedQueuePool),
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_engine(
+    get_async_database_url(settings.SQLALCHEMY_DATABASE_URL),
+    **get_engine_args(settings.SQLALCHEMY_DATABASE_URL, InstrumentedAsyncQueuePool),
+)
+
+for _engine in (engine, async_engine):
+    install_slow_query_log(_engine, settings.DB_SLOW_QUERY_MS)
+    instrument_engine(_engine)
+# Objects outlive the commit so responses can be serialized without lazy IO
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 
 def get_db():
     db = SessionLocal()
@@ -17,3 +72,8 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
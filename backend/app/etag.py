@@ -0,0 +1,66 @@
+import hashlib
+from typing import List, Optional
+
+from fastapi import Request, Response
+
+# Browsers revalidate on every request, and shared caches never store the
+# per-user listings
+CACHE_CONTROL = "private, no-cache"
+
+
+def events_etag(user_id: int, version: int, request: Request) -> str:
+    """Weak ETag of a user's event listing at a given events_version.
+
+    The query string is folded in so different views (dates, cursors,
+    layout) of the same version never share a validator.
+    """
+    query = hashlib.blake2b(request.url.query.encode(), digest_size=8).hexdigest()
+    return f'W/"ev-{user_id}-{version}-{query}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison (RFC 9110, 13.1.2) against an If-None-Match header."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque
+        for candidate in if_none_match.split(",")
+    )
+
+
+def event_etag(event_id: int, version: int) -> str:
+    """Strong ETag of one event at a version, for If-Match on its writes."""
+    return f'"event-{event_id}-{version}"'
+
+
+def if_match_versions(if_match: str, event_id: int) -> Optional[List[int]]:
+    """Versions of the event an If-Match header accepts; None for "*".
+
+    If-Match uses strong comparison (RFC 9110, 13.1.1): weak tags, and tags
+    of other events or of listings, match no version.
+    """
+    if if_match.strip() == "*":
+        return None
+    prefix = f'"event-{event_id}-'
+    versions = []
+    for candidate in if_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith(prefix) and candidate.endswith('"'):
+            version = candidate[len(prefix) : -1]
+            if version.isdigit():
+                versions.append(int(version))
+    return versions
+
+
+def not_modified(etag: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
@@ -0,0 +1,317 @@
+"""Change feed: pushes event created/updated/deleted notices to connected clients.
+
+Write paths stage changes on their session with `publish`; nothing leaves the
+process until the transaction commits, and a rollback discards them. The
+configured backend then fans the committed changes out to every worker's
+Broadcaster, which hands them to the SSE streams of the users involved:
+
+- MemoryBackend delivers within the current process only, so it is used on
+  databases other than Postgres (or when set explicitly). It mirrors
+  NOTIFY semantics (JSON text payloads, delivered on commit, dropped on
+  rollback), so it doubles as the local stand-in for the Postgres backend.
+- PostgresNotifyBackend issues pg_notify inside the committing transaction
+  and LISTENs on a dedicated asyncpg connection, so every gunicorn worker
+  (and every app instance) sees every change. A dropped connection is
+  re-established, and since notices sent meanwhile are lost, every open
+  stream is then told to resync.
+
+EVENT_FEED_BACKEND=auto (the default) picks the Postgres backend whenever
+the database is Postgres.
+"""
+
+import asyncio
+import json
+import logging
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, func, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "event_changes"
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+
+# Session.info keys: staged changes, then their encoded payloads at commit
+_PENDING_KEY = "event_feed_pending"
+_PAYLOADS_KEY = "event_feed_payloads"
+
+
+def publish(
+    db: Session,
+    change: str,
+    event_id: Optional[int],
+    start_date: Optional[date],
+    user_ids: Iterable[int],
+) -> None:
+    """Stage a change notice for the users it concerns; sent on commit.
+
+    A "resync" notice (no event id) tells clients to refetch everything.
+    """
+    db.info.setdefault(_PENDING_KEY, []).append(
+        {
+            "type": change,
+            "id": event_id,
+            "start_date": start_date.isoformat() if start_date else None,
+            "users": sorted(set(user_ids)),
+        }
+    )
+
+
+def encode(changes: List[dict]) -> List[str]:
+    """Pack changes into as few JSON array payloads as the size limit allows."""
+    payloads, batch, size = [], [], 2
+    for change in changes:
+        item = json.dumps(change, separators=(",", ":"))
+        if batch and size + len(item) + 1 > MAX_PAYLOAD_BYTES:
+            payloads.append("[" + ",".join(batch) + "]")
+            batch, size = [], 2
+        batch.append(item)
+        size += len(item) + 1
+    if batch:
+        payloads.append("[" + ",".join(batch) + "]")
+    return payloads
+
+
+class MemoryBackend:
+    def __init__(self):
+        self._receive: Optional[Callable[[str], None]] = None
+
+    async def start(
+        self, receive: Callable[[str], None], resync: Callable[[], None]
+    ) -> None:
+        self._receive = receive
+
+    async def stop(self) -> None:
+        self._receive = None
+
+    def before_commit(self, db: Session, payloads: List[str]) -> None:
+        pass
+
+    def after_commit(self, payloads: List[str]) -> None:
+        if self._receive is not None:
+            for payload in payloads:
+                self._receive(payload)
+
+
+class PostgresNotifyBackend:
+    # Seconds between attempts to re-establish a lost LISTEN connection
+    RECONNECT_DELAYS = (0.5, 1, 2, 5, 10)
+    # A LISTEN connection that does not answer a ping within the timeout is
+    # presumed dead (e.g. dropped by a proxy without a FIN) and replaced
+    PING_INTERVAL_SECONDS = 30
+    PING_TIMEOUT_SECONDS = 10
+
+    def __init__(self, database_url: str):
+        # asyncpg takes a plain libpq-style DSN
+        self._dsn = (
+            make_url(database_url)
+            .set(drivername="postgresql")
+            .render_as_string(hide_password=False)
+        )
+        self._connection = None
+        self._receive: Optional[Callable[[str], None]] = None
+        self._resync: Optional[Callable[[], None]] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._stopping = False
+        self.reconnects = 0
+
+    async def start(
+        self, receive: Callable[[str], None], resync: Callable[[], None]
+    ) -> None:
+        self._receive, self._resync = receive, resync
+        self._stopping = False
+        await self._connect()
+        self._spawn(self._watch())
+
+    async def stop(self) -> None:
+        self._stopping = True
+        for task in list(self._tasks):
+            task.cancel()
+        if self._connection is not None:
+            await self._connection.close()
+            self._connection = None
+
+    def _spawn(self, coroutine) -> None:
+        task = asyncio.get_running_loop().create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _connect(self) -> None:
+        import asyncpg
+
+        connection = await asyncpg.connect(self._dsn)
+        await connection.add_listener(
+            CHANNEL, lambda _conn, _pid, _channel, payload: self._receive(payload)
+        )
+        connection.add_termination_listener(self._on_terminated)
+        self._connection = connection
+
+    def _on_terminated(self, connection) -> None:
+        if self._stopping or connection is not self._connection:
+            return
+        logger.warning("Event feed LISTEN connection lost; reconnecting")
+        self._connection = None
+        self._spawn(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        attempt = 0
+        while not self._stopping:
+            try:
+                await self._connect()
+            except Exception:
+                delay = self.RECONNECT_DELAYS[
+                    min(attempt, len(self.RECONNECT_DELAYS) - 1)
+                ]
+                attempt += 1
+                logger.warning(
+                    "Event feed reconnect failed; retrying in %ss", delay, exc_info=True
+                )
+                await asyncio.sleep(delay)
+                continue
+            self.reconnects += 1
+            logger.info("Event feed LISTEN connection re-established")
+            # Notices committed while disconnected never arrive
+            self._resync()
+            return
+
+    async def _watch(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.PING_INTERVAL_SECONDS)
+            connection = self._connection
+            if connection is None:  # Already reconnecting
+                continue
+            try:
+                await asyncio.wait_for(
+                    connection.fetchval("SELECT 1"), self.PING_TIMEOUT_SECONDS
+                )
+            except Exception:
+                # Runs the termination listener, which reconnects
+                connection.terminate()
+
+    def before_commit(self, db: Session, payloads: List[str]) -> None:
+        # Queued by Postgres and delivered to listeners only if this commits
+        for payload in payloads:
+            db.execute(select(func.pg_notify(CHANNEL, payload)))
+
+    def after_commit(self, payloads: List[str]) -> None:
+        pass
+
+
+class Broadcaster:
+    """Per-process registry of open streams, keyed by user id."""
+
+    def __init__(self, backend, queue_size: int = 100):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: Dict[int, Set[asyncio.Queue]] = defaultdict(set)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.delivered = 0
+        self.overflows = 0
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        await self.backend.start(self._receive, self.resync_all)
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+        self._loop = None
+
+    def _receive(self, payload: str) -> None:
+        # Commits may happen on worker threads; deliver on the event loop
+        loop = self._loop
+        if loop is not None and not loop.is_closed():
+            loop.call_soon_threadsafe(self._deliver, payload)
+
+    def _deliver(self, payload: str) -> None:
+        try:
+            changes = json.loads(payload)
+        except ValueError:
+            logger.warning("Dropping malformed event feed payload")
+            return
+        for change in changes:
+            message = {key: value for key, value in change.items() if key != "users"}
+            for user_id in change.get("users", ()):
+                for queue in self._subscribers.get(user_id, ()):
+                    self._put(queue, message)
+
+    def resync_all(self) -> None:
+        """Tell every open stream to refetch; called on the event loop."""
+        for queues in self._subscribers.values():
+            for queue in queues:
+                self._put(queue, {"type": "resync"})
+
+    def _put(self, queue: asyncio.Queue, message: dict) -> None:
+        try:
+            queue.put_nowait(message)
+            self.delivered += 1
+        except asyncio.QueueFull:
+            # A stalled client gets one "resync" instead of an unbounded backlog
+            while not queue.empty():
+                queue.get_nowait()
+            queue.put_nowait({"type": "resync"})
+            self.overflows += 1
+
+    @asynccontextmanager
+    async def subscribe(self, user_id: int) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[user_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[user_id].discard(queue)
+            if not self._subscribers[user_id]:
+                del self._subscribers[user_id]
+
+    def stats(self) -> dict:
+        return {
+            "backend": type(self.backend).__name__,
+            "reconnects": getattr(self.backend, "reconnects", 0),
+            "users": len(self._subscribers),
+            "streams": sum(len(queues) for queues in self._subscribers.values()),
+            "delivered": self.delivered,
+            "overflows": self.overflows,
+        }
+
+
+def _create_backend():
+    backend = settings.EVENT_FEED_BACKEND
+    if backend == "auto":
+        url = settings.SQLALCHEMY_DATABASE_URL
+        is_postgres = bool(url) and make_url(url).get_backend_name() == "postgresql"
+        backend = "postgres" if is_postgres else "memory"
+    if backend == "postgres":
+        return PostgresNotifyBackend(settings.SQLALCHEMY_DATABASE_URL)
+    return MemoryBackend()
+
+
+broadcaster = Broadcaster(_create_backend(), queue_size=settings.EVENT_FEED_QUEUE_SIZE)
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(db: Session) -> None:
+    pending = db.info.get(_PENDING_KEY)
+    if pending:
+        db.info[_PAYLOADS_KEY] = payloads = encode(pending)
+        broadcaster.backend.before_commit(db, payloads)
+
+
+@event.listens_for(Session, "after_commit")
+def _after_commit(db: Session) -> None:
+    db.info.pop(_PENDING_KEY, None)
+    payloads = db.info.pop(_PAYLOADS_KEY, None)
+    if payloads:
+        broadcaster.backend.after_commit(payloads)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _after_rollback(db: Session, previous_transaction) -> None:
+    db.info.pop(_PENDING_KEY, None)
+    db.info.pop(_PAYLOADS_KEY, None)
@@ -0,0 +1,103 @@
+"""Full-text search over event titles, descriptions and locations.
+
+Postgres keeps a generated `events.search_vector` (title weighted A,
+description B, location platform and address C) with a GIN index. SQLite
+keeps a contentless FTS5 table, `events_fts`, in step through triggers.
+Neither is part of the ORM models: create_all adds them through the DDL below
+and migration 0008 through its own copy.
+
+Both backends use plain word splitting without stemming (the 'simple'
+configuration and the unicode61 tokenizer) and match every word of the query
+as a prefix, so "plan meet" finds "Planning meeting" on either.
+"""
+
+import re
+from typing import List
+
+from sqlalchemy import DDL
+
+SEARCH_CONFIG = "simple"
+
+# Words after the first MAX_TERMS are ignored
+MAX_TERMS = 8
+
+_WORD = re.compile(r"\w+")
+
+# Schema objects maintained outside the models, skipped by autogenerate
+SEARCH_VECTOR_COLUMN = "search_vector"
+SEARCH_VECTOR_INDEX = "ix_events_search_vector"
+FTS_TABLE = "events_fts"
+
+_PG_LOCATION = "coalesce(location->>'platform', '') || ' ' || coalesce(location->>'address', '')"
+
+POSTGRES_DDL = [
+    DDL(
+        f"ALTER TABLE events ADD COLUMN IF NOT EXISTS {SEARCH_VECTOR_COLUMN} tsvector "
+        "GENERATED ALWAYS AS ("
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(title, '')), 'A') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B') || "
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', {_PG_LOCATION}), 'C')"
+        ") STORED"
+    ),
+    DDL(
+        f"CREATE INDEX IF NOT EXISTS {SEARCH_VECTOR_INDEX} "
+        f"ON events USING gin ({SEARCH_VECTOR_COLUMN})"
+    ),
+]
+
+
+def _sqlite_values(row: str) -> str:
+    location = (
+        f"coalesce(json_extract({row}.location, '$.platform'), '') || ' ' || "
+        f"coalesce(json_extract({row}.location, '$.address'), '')"
+    )
+    return (
+        f"{row}.id, coalesce({row}.title, ''), coalesce({row}.description, ''), {location}"
+    )
+
+
+# A contentless table stores only the index; removing a row takes the values
+# it was indexed with, which the triggers recompute from the old row
+SQLITE_DDL = [
+    DDL(
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+        "title, description, location, content='', tokenize='unicode61 remove_diacritics 2')"
+    ),
+    DDL(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON events BEGIN "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, description, location) "
+        f"VALUES ({_sqlite_values('new')}); END"
+    ),
+    DDL(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON events BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location) "
+        f"VALUES ('delete', {_sqlite_values('old')}); END"
+    ),
+    DDL(
+        f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update "
+        "AFTER UPDATE OF title, description, location ON events BEGIN "
+        f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description, location) "
+        f"VALUES ('delete', {_sqlite_values('old')}); "
+        f"INSERT INTO {FTS_TABLE}(rowid, title, description, location) "
+        f"VALUES ({_sqlite_values('new')}); END"
+    ),
+]
+
+
+# Dropping events removes its triggers but not the FTS table
+SQLITE_DROP_DDL = DDL(f"DROP TABLE IF EXISTS {FTS_TABLE}")
+
+
+def search_terms(q: str) -> List[str]:
+    """The words of a query, lowercased; punctuation never reaches a parser."""
+    return _WORD.findall(q.lower())[:MAX_TERMS]
+
+
+def tsquery(terms: List[str]) -> str:
+    """to_tsquery text: every term as a prefix, all required."""
+    return " & ".join(f"{term}:*" for term in terms)
+
+
+def fts5_query(terms: List[str]) -> str:
+    """FTS5 MATCH text: every term as a quoted prefix, all required."""
+    return " AND ".join(f'"{term}"*' for term in terms)
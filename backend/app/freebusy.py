@@ -0,0 +1,128 @@
+"""Free/busy computation on per-user, per-day minute bitmaps.
+
+A day is a 1440-bit integer where bit m is set when minute m is busy. Python
+ints give arbitrary-width bitwise OR/AND implemented in C, so merging the
+calendars of many users is one OR per user-day rather than pairwise interval
+comparisons, and free slots fall out of the inverted union.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from app.recurrence import iter_occurrences
+from app.schemas import RecurrenceRule
+
+MINUTES_PER_DAY = 24 * 60
+
+# {user_id: {date: bitmap}}
+BusyMaps = Dict[int, Dict[date, int]]
+
+
+def interval_mask(start_minute: int, end_minute: int) -> int:
+    """Bitmap with minutes [start_minute, end_minute) set, clipped to the day."""
+    start = max(0, min(MINUTES_PER_DAY, start_minute))
+    end = max(0, min(MINUTES_PER_DAY, end_minute))
+    if end <= start:
+        return 0
+    return ((1 << (end - start)) - 1) << start
+
+
+def iter_runs(bitmap: int) -> Iterator[Tuple[int, int]]:
+    """Yield (start, end) minute ranges of consecutive set bits."""
+    while bitmap:
+        start = (bitmap & -bitmap).bit_length() - 1
+        shifted = bitmap >> start
+        # Trailing ones of `shifted` = length of the run
+        length = (shifted ^ (shifted + 1)).bit_length() - 1
+        yield start, start + length
+        bitmap &= ~(((1 << length) - 1) << start)
+
+
+def event_dates(
+    start_date: date,
+    recurrence: Optional[dict],
+    date_from: date,
+    date_to: date,
+) -> Iterable[date]:
+    if recurrence is None:
+        return [start_date] if date_from <= start_date <= date_to else []
+    rule = RecurrenceRule.model_validate(recurrence)
+    return iter_occurrences(start_date, rule, date_from, date_to)
+
+
+def build_busy_maps(
+    busy_events: Iterable[Tuple[Set[int], date, Optional[dict], int, int]],
+    date_from: date,
+    date_to: date,
+) -> BusyMaps:
+    """OR every event's minutes into the bitmaps of the users it occupies.
+
+    `busy_events` yields (user_ids, start_date, recurrence, startMinute,
+    endMinute) tuples as returned by crud.get_busy_events.
+    """
+    busy: BusyMaps = defaultdict(lambda: defaultdict(int))
+    for user_ids, start_date, recurrence, start_minute, end_minute in busy_events:
+        mask = interval_mask(start_minute, end_minute)
+        if not mask:
+            continue
+        for day in event_dates(start_date, recurrence, date_from, date_to):
+            for user_id in user_ids:
+                busy[user_id][day] |= mask
+    return busy
+
+
+def iter_days(date_from: date, date_to: date) -> Iterator[date]:
+    day = date_from
+    while day <= date_to:
+        yield day
+        day += timedelta(days=1)
+
+
+def common_free_slots(
+    busy: BusyMaps,
+    user_ids: Iterable[int],
+    date_from: date,
+    date_to: date,
+    day_start: int = 0,
+    day_end: int = MINUTES_PER_DAY,
+    min_duration: int = 1,
+) -> List[Tuple[date, List[Tuple[int, int]]]]:
+    """Per day, the minute ranges inside [day_start, day_end) when nobody is busy."""
+    window = interval_mask(day_start, day_end)
+    user_maps = [busy.get(user_id, {}) for user_id in set(user_ids)]
+    days = []
+    for day in iter_days(date_from, date_to):
+        occupied = 0
+        for user_map in user_maps:
+            occupied |= user_map.get(day, 0)
+        free = window & ~occupied
+        days.append(
+            (
+                day,
+                [
+                    (start, end)
+                    for start, end in iter_runs(free)
+                    if end - start >= min_duration
+                ],
+            )
+        )
+    return days
+
+
+def find_conflicts(
+    busy: BusyMaps,
+    user_ids: Iterable[int],
+    dates: Iterable[date],
+    start_minute: int,
+    end_minute: int,
+) -> List[Tuple[int, date, List[Tuple[int, int]]]]:
+    """(user_id, date, overlapping minute ranges) for every clash with the slot."""
+    mask = interval_mask(start_minute, end_minute)
+    conflicts = []
+    for day in dates:
+        for user_id in sorted(set(user_ids)):
+            overlap = busy.get(user_id, {}).get(day, 0) & mask
+            if overlap:
+                conflicts.append((user_id, day, list(iter_runs(overlap))))
+    return conflicts
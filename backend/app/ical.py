@@ -0,0 +1,241 @@
+"""iCalendar (RFC 5545) conversion for events.
+
+Times are written as floating local times (no TZID), matching how events
+store minutes from midnight. Recurring events are exported once, with an
+RRULE/EXDATE, rather than expanded. Parsing is the streaming inverse: lines
+are unfolded and grouped into VEVENT property maps one event at a time.
+"""
+
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+PRODID = "-//Personal Calendar//Events Export//EN"
+UID_DOMAIN = "personal-calendar"
+CRLF = "\r\n"
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def unescape_text(value: str) -> str:
+    out, chars = [], iter(value)
+    for char in chars:
+        if char == "\\":
+            char = next(chars, "")
+            out.append("\n" if char in "nN" else char)
+        else:
+            out.append(char)
+    return "".join(out)
+
+
+def fold_line(line: str) -> str:
+    """Split a content line into 75-octet pieces without breaking UTF-8 characters."""
+    encoded = line.encode()
+    if len(encoded) <= 75:
+        return line + CRLF
+    pieces, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        # Back off to a character boundary (continuation bytes are 10xxxxxx)
+        while end < len(encoded) and encoded[end] & 0xC0 == 0x80:
+            end -= 1
+        pieces.append(encoded[start:end].decode())
+        start, limit = end, 74  # Continuation lines start with a space
+    return (CRLF + " ").join(pieces) + CRLF
+
+
+def _local_datetime(day: date, minute: int) -> str:
+    moment = datetime.combine(day, time()) + timedelta(minutes=minute)
+    return moment.strftime("%Y%m%dT%H%M%S")
+
+
+def _rrule(recurrence: dict) -> str:
+    parts = [f"FREQ={recurrence['freq'].upper()}"]
+    if recurrence.get("interval", 1) != 1:
+        parts.append(f"INTERVAL={recurrence['interval']}")
+    if recurrence.get("until"):
+        # UNTIL takes DTSTART's value type (RFC 5545 3.3.10): a local
+        # DATE-TIME, here the last second of the until day
+        parts.append(f"UNTIL={recurrence['until'].replace('-', '')}T235959")
+    if recurrence.get("count"):
+        parts.append(f"COUNT={recurrence['count']}")
+    return ";".join(parts)
+
+
+def _location_text(location: Optional[dict]) -> Optional[str]:
+    if not location:
+        return None
+    return location.get("address") or location.get("link") or location.get("platform")
+
+
+def event_to_vevent(event, dtstamp: str) -> str:
+    """One VEVENT block for a stored event (a DBEvent with participants loaded)."""
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:event-{event.id}@{UID_DOMAIN}",
+        f"DTSTAMP:{dtstamp}",
+        f"DTSTART:{_local_datetime(event.start_date, event.startMinute)}",
+        f"DTEND:{_local_datetime(event.start_date, event.endMinute)}",
+        f"SUMMARY:{escape_text(event.title)}",
+        f"CATEGORIES:{escape_text(event.type).upper()}",
+    ]
+    if event.description:
+        lines.append(f"DESCRIPTION:{escape_text(event.description)}")
+    location = _location_text(event.location)
+    if location:
+        lines.append(f"LOCATION:{escape_text(location)}")
+    if event.location and event.location.get("link"):
+        lines.append(f"URL:{event.location['link']}")
+    if event.recurrence:
+        lines.append(f"RRULE:{_rrule(event.recurrence)}")
+        minute = event.startMinute
+        for exception in event.recurrence.get("exceptions", []):
+            lines.append(
+                f"EXDATE:{_local_datetime(date.fromisoformat(exception), minute)}"
+            )
+    for participant in event.participants:
+        if participant.id != event.creator_id:
+            lines.append(
+                f"ATTENDEE;CN={escape_text(participant.username)}:mailto:{participant.email}"
+            )
+    lines.append("END:VEVENT")
+    return "".join(fold_line(line) for line in lines)
+
+
+def dtstamp_now() -> str:
+    return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def calendar_header(name: Optional[str] = None) -> str:
+    lines = ["BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}", "CALSCALE:GREGORIAN"]
+    if name:
+        lines.append(f"X-WR-CALNAME:{escape_text(name)}")
+    return "".join(fold_line(line) for line in lines)
+
+
+CALENDAR_FOOTER = fold_line("END:VCALENDAR")
+
+
+# --- Parsing ---
+# name -> [(params, value)], in file order
+VEventProperties = Dict[str, List[Tuple[Dict[str, str], str]]]
+
+
+def unfold_lines(lines: Iterable[str]) -> Iterator[Tuple[int, str]]:
+    """Logical content lines with their starting line numbers."""
+    current, start = None, 0
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if line[:1] in (" ", "\t") and current is not None:
+            current += line[1:]
+            continue
+        if current:
+            yield start, current
+        current, start = line, number
+    if current:
+        yield start, current
+
+
+def parse_content_line(line: str) -> Tuple[str, Dict[str, str], str]:
+    """NAME;PARAM=VALUE:value -> (NAME, {PARAM: VALUE}, value)."""
+    # The value starts at the first colon outside a quoted parameter value
+    quoted = False
+    for index, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            head, value = line[:index], line[index + 1 :]
+            break
+    else:
+        raise ValueError(f"Malformed content line: {line[:40]!r}")
+    name, *params = head.split(";")
+    parsed = {}
+    for param in params:
+        key, _, param_value = param.partition("=")
+        parsed[key.upper()] = param_value.strip('"')
+    return name.upper(), parsed, value
+
+
+def iter_vevents(
+    lines: Iterable[str],
+) -> Iterator[Tuple[int, VEventProperties, Optional[str]]]:
+    """(line number, properties, error) per VEVENT; nested components are skipped.
+
+    A malformed content line spoils only the event it is in: the event is
+    still read to its END and yielded with the first error found, so the rest
+    of the file imports. Malformed lines outside events are ignored.
+    """
+    props: Optional[VEventProperties] = None
+    error: Optional[str] = None
+    start, depth = 0, 0
+    for number, line in unfold_lines(lines):
+        if not line.strip():
+            continue
+        try:
+            name, params, value = parse_content_line(line)
+        except ValueError as e:
+            if props is not None and error is None:
+                error = f"Line {number}: {e}"
+            continue
+        if name == "BEGIN" and value.upper() == "VEVENT":
+            props, error, start, depth = {}, None, number, 0
+        elif props is None:
+            continue
+        elif name == "BEGIN":
+            depth += 1  # e.g. VALARM inside the event
+        elif name == "END" and depth:
+            depth -= 1
+        elif name == "END" and value.upper() == "VEVENT":
+            yield start, props, error
+            props = None
+        elif not depth:
+            props.setdefault(name, []).append((params, value))
+
+
+def parse_datetime(value: str, params: Dict[str, str]) -> Tuple[date, Optional[int]]:
+    """(date, minute of day) of a DATE or DATE-TIME; minute is None for a DATE.
+
+    UTC ("Z") and TZID times are taken as wall-clock times, like the rest of
+    the calendar, which has no time zones.
+    """
+    value = value.strip()
+    if params.get("VALUE") == "DATE" or len(value) == 8:
+        return datetime.strptime(value[:8], "%Y%m%d").date(), None
+    moment = datetime.strptime(value.rstrip("Z")[:15], "%Y%m%dT%H%M%S")
+    return moment.date(), moment.hour * 60 + moment.minute
+
+
+def parse_duration(value: str) -> int:
+    """RFC 5545 DURATION (e.g. PT1H30M, P1D) in minutes."""
+    sign = -1 if value.startswith("-") else 1
+    value = value.lstrip("+-")
+    if not value.startswith("P"):
+        raise ValueError(f"Malformed duration: {value!r}")
+    minutes, number = 0, ""
+    units = {"W": 7 * 24 * 60, "D": 24 * 60, "H": 60, "M": 1, "S": 1 / 60}
+    for char in value[1:]:
+        if char.isdigit():
+            number += char
+        elif char == "T":
+            continue
+        elif char in units and number:
+            minutes += int(number) * units[char]
+            number = ""
+        else:
+            raise ValueError(f"Malformed duration: {value!r}")
+    return sign * int(minutes)
+
+
+def parse_rrule(value: str) -> Dict[str, str]:
+    return {
+        key.upper(): part_value
+        for key, _, part_value in (part.partition("=") for part in value.split(";"))
+        if key
+    }
@@ -0,0 +1,275 @@
+"""Parsing of uploaded calendars (.ics or CSV) into EventCreate payloads.
+
+Files are read line by line and yield one validated event at a time, so an
+import never holds the whole upload or all parsed events in memory. Rows
+that cannot be imported are recorded on an ImportReport instead of failing
+the whole file.
+"""
+
+import csv
+import json
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pydantic import ValidationError
+
+import app.schemas as schemas
+from app.ical import (
+    iter_vevents,
+    parse_datetime,
+    parse_duration,
+    parse_rrule,
+    unescape_text,
+)
+
+MINUTES_PER_DAY = 24 * 60
+# Error details kept in the summary; the count covers all of them
+MAX_REPORTED_ERRORS = 100
+
+_WEEKDAYS = ["MO", "TU", "WE", "TH", "FR", "SA", "SU"]
+
+
+class ImportReport:
+    def __init__(self):
+        self.skipped = 0
+        self.errored = 0
+        self.errors: List[schemas.EventImportError] = []
+
+    def error(self, line: int, detail: str) -> None:
+        self.errored += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(schemas.EventImportError(line=line, detail=detail))
+
+
+def detect_format(
+    filename: Optional[str], content_type: Optional[str]
+) -> Optional[schemas.ImportFormat]:
+    name = (filename or "").lower()
+    if name.endswith((".ics", ".ical", ".ifb")) or content_type == "text/calendar":
+        return schemas.ImportFormat.ics
+    if name.endswith(".csv") or content_type in ("text/csv", "application/csv"):
+        return schemas.ImportFormat.csv
+    return None
+
+
+def _clock(minute: int) -> str:
+    return f"{minute // 60:02d}:{minute % 60:02d}"
+
+
+def _event(
+    title: str,
+    start_date: date,
+    start_minute: int,
+    end_minute: int,
+    **fields,
+) -> schemas.EventCreate:
+    """EventCreate with the `time`/`duration` labels the frontend writes."""
+    fields.setdefault("time", f"{_clock(start_minute)} - {_clock(end_minute)}")
+    fields.setdefault("duration", f"{end_minute - start_minute} minutes")
+    fields.setdefault("type", schemas.EventType.personal)
+    return schemas.EventCreate(
+        title=title,
+        start_date=start_date,
+        startMinute=start_minute,
+        endMinute=end_minute,
+        participants=[],
+        **fields,
+    )
+
+
+def _validation_detail(error: ValidationError) -> str:
+    first = error.errors()[0]
+    location = ".".join(str(part) for part in first["loc"])
+    return f"{location}: {first['msg']}" if location else first["msg"]
+
+
+# --- iCalendar ---
+def _first(props, name: str):
+    values = props.get(name)
+    return values[0] if values else (None, None)
+
+
+def _recurrence(props, start_date: date) -> Optional[dict]:
+    params, value = _first(props, "RRULE")
+    if value is None:
+        return None
+    rule = parse_rrule(value)
+    freq = rule.pop("FREQ", "").lower()
+    if freq not in schemas.RecurrenceFrequency.__members__:
+        raise ValueError(f"Unsupported recurrence frequency {freq.upper() or '?'}")
+    # BYDAY/BYMONTHDAY that only restate the start date are what most
+    # exporters write for simple rules; anything else cannot be represented
+    if rule.get("BYDAY") == _WEEKDAYS[start_date.weekday()]:
+        rule.pop("BYDAY")
+    if rule.get("BYMONTHDAY") == str(start_date.day):
+        rule.pop("BYMONTHDAY")
+    rule.pop("WKST", None)
+    recurrence = {"freq": freq, "interval": int(rule.pop("INTERVAL", 1))}
+    if "UNTIL" in rule:
+        recurrence["until"] = parse_datetime(rule.pop("UNTIL"), {})[0]
+    if "COUNT" in rule:
+        recurrence["count"] = int(rule.pop("COUNT"))
+    if rule:
+        raise ValueError(f"Unsupported recurrence rule part {sorted(rule)[0]}")
+    recurrence["exceptions"] = [
+        parse_datetime(part, params)[0]
+        for params, value in props.get("EXDATE", [])
+        for part in value.split(",")
+    ]
+    return recurrence
+
+
+def _location(props) -> Optional[dict]:
+    _, url = _first(props, "URL")
+    _, text = _first(props, "LOCATION")
+    text = unescape_text(text) if text else None
+    if url or (text and text.startswith(("http://", "https://"))):
+        return {"type": "online", "link": url or text, "address": None, "platform": None}
+    if text:
+        return {"type": "onsite", "address": text, "link": None, "platform": None}
+    return None
+
+
+def _type(categories: Optional[str]) -> schemas.EventType:
+    for category in (categories or "").split(","):
+        category = category.strip().lower()
+        if category in schemas.EventType.__members__:
+            return schemas.EventType(category)
+    return schemas.EventType.personal
+
+
+def vevent_to_event(props) -> Optional[schemas.EventCreate]:
+    """EventCreate for a VEVENT, or None when it should be skipped."""
+    _, status = _first(props, "STATUS")
+    if (status or "").upper() == "CANCELLED" or "RECURRENCE-ID" in props:
+        # Cancelled events and overrides of single occurrences are not imported
+        return None
+    params, value = _first(props, "DTSTART")
+    if value is None:
+        raise ValueError("Missing DTSTART")
+    start_date, start_minute = parse_datetime(value, params)
+    if start_minute is None:  # All-day event
+        start_minute, end_minute = 0, MINUTES_PER_DAY
+    else:
+        end_minute = start_minute + 60
+        end_params, end_value = _first(props, "DTEND")
+        _, duration = _first(props, "DURATION")
+        if end_value is not None:
+            end_date, end_of_day = parse_datetime(end_value, end_params)
+            days = (end_date - start_date).days
+            end_minute = days * MINUTES_PER_DAY + (end_of_day or 0)
+        elif duration is not None:
+            end_minute = start_minute + parse_duration(duration)
+        # Events are single-day; clip ones that run past midnight
+        end_minute = min(max(end_minute, start_minute), MINUTES_PER_DAY)
+    _, summary = _first(props, "SUMMARY")
+    _, description = _first(props, "DESCRIPTION")
+    _, categories = _first(props, "CATEGORIES")
+    return _event(
+        unescape_text(summary) if summary else "(No title)",
+        start_date,
+        start_minute,
+        end_minute,
+        type=_type(categories),
+        description=unescape_text(description) if description else None,
+        location=_location(props),
+        recurrence=_recurrence(props, start_date),
+    )
+
+
+def iter_ics_events(
+    lines: Iterable[str], report: ImportReport
+) -> Iterator[schemas.EventCreate]:
+    for line, props, error in iter_vevents(lines):
+        if error is not None:
+            report.error(line, error)
+            continue
+        try:
+            event = vevent_to_event(props)
+        except ValidationError as e:
+            report.error(line, _validation_detail(e))
+            continue
+        except ValueError as e:
+            report.error(line, str(e))
+            continue
+        if event is None:
+            report.skipped += 1
+        else:
+            yield event
+
+
+# --- CSV ---
+def _minutes(value: str) -> int:
+    """A startMinute/endMinute cell: minutes ("540") or a clock time ("09:00")."""
+    if ":" in value:
+        hours, minutes = value.split(":", 1)
+        return int(hours) * 60 + int(minutes)
+    return int(value)
+
+
+def csv_row_to_event(row: Dict[str, str]) -> Optional[schemas.EventCreate]:
+    """EventCreate for a CSV row with EventCreate field names as headers.
+
+    `location` and `recurrence` hold JSON; startMinute/endMinute may be
+    given as clock times, or as start_time/end_time columns instead.
+    """
+    row = {key.strip(): (value or "").strip() for key, value in row.items() if key}
+    if not any(row.values()):
+        return None
+    start = row.get("startMinute") or row.get("start_time")
+    end = row.get("endMinute") or row.get("end_time")
+    if not start or not end:
+        raise ValueError(
+            "startMinute and endMinute (or start_time/end_time) are required"
+        )
+    fields = {
+        key: row[key]
+        for key in ("time", "duration", "type", "description")
+        if row.get(key)
+    }
+    for key in ("location", "recurrence"):
+        if row.get(key):
+            fields[key] = json.loads(row[key])
+    return _event(
+        row.get("title", ""),
+        date.fromisoformat(row.get("start_date", "")),
+        _minutes(start),
+        _minutes(end),
+        **fields,
+    )
+
+
+def iter_csv_events(
+    lines: Iterable[str], report: ImportReport
+) -> Iterator[schemas.EventCreate]:
+    reader = csv.DictReader(lines)
+    reader.fieldnames  # A malformed header line raises csv.Error to the caller
+    rows = iter(reader)
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except csv.Error as e:  # E.g. a field over csv.field_size_limit()
+            report.error(reader.line_num, str(e))
+            continue
+        try:
+            event = csv_row_to_event(row)
+        except ValidationError as e:
+            report.error(reader.line_num, _validation_detail(e))
+            continue
+        except ValueError as e:  # Includes malformed JSON and dates
+            report.error(reader.line_num, str(e))
+            continue
+        if event is None:
+            report.skipped += 1
+        else:
+            yield event
+
+
+def iter_import_events(
+    lines: Iterable[str], import_format: schemas.ImportFormat, report: ImportReport
+) -> Iterator[schemas.EventCreate]:
+    if import_format == schemas.ImportFormat.ics:
+        return iter_ics_events(lines, report)
+    return iter_csv_events(lines, report)
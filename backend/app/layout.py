@@ -0,0 +1,70 @@
+"""Day-view layout: lane assignment for overlapping events.
+
+Events are swept in start order. Each event takes the lowest lane freed by an
+event that already ended, and every maximal group of transitively overlapping
+events (a cluster) shares one lane count, so widths are 1/lanes per cluster
+rather than per pairwise overlap. O(n log n) in the number of events.
+"""
+
+import heapq
+from typing import Dict, Iterable, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+# {event_id: (lane, lanes)}
+DayLayout = Dict[int, Tuple[int, int]]
+
+
+def compute_day_layout(events: Iterable) -> DayLayout:
+    ordered = sorted(events, key=lambda e: (e.startMinute, -e.endMinute, e.id))
+    layout: DayLayout = {}
+    active = []  # (endMinute, lane) of events still running
+    free_lanes = []  # lanes released inside the current cluster
+    cluster = []  # (event_id, lane) of the current cluster
+    cluster_lanes = 0
+
+    def close_cluster():
+        for event_id, lane in cluster:
+            layout[event_id] = (lane, cluster_lanes)
+
+    for event in ordered:
+        # Release lanes of events that ended by the time this one starts
+        while active and active[0][0] <= event.startMinute:
+            _, lane = heapq.heappop(active)
+            heapq.heappush(free_lanes, lane)
+        if not active and cluster:
+            close_cluster()
+            cluster, free_lanes, cluster_lanes = [], [], 0
+        if free_lanes:
+            lane = heapq.heappop(free_lanes)
+        else:
+            lane = cluster_lanes
+            cluster_lanes += 1
+        heapq.heappush(active, (max(event.endMinute, event.startMinute + 1), lane))
+        cluster.append((event.id, lane))
+    if cluster:
+        close_cluster()
+    return layout
+
+
+# Listing ETag -> DayLayout. The ETag folds in the user's events_version,
+# which every write to an event they see bumps, and the query string, so an
+# entry is only ever reused for the same events; superseded entries are never
+# hit again and age out.
+layout_cache = TTLCache(
+    maxsize=settings.LAYOUT_CACHE_MAX_SIZE, ttl=settings.LAYOUT_CACHE_TTL_SECONDS
+)
+
+
+def get_day_layout(view_key: str, events: list) -> DayLayout:
+    """Layout for one day listing, computed once per version of its events.
+
+    `view_key` is the listing's ETag: looking it up costs nothing per event,
+    and writes need no invalidation hook.
+    """
+    layout = layout_cache.get(view_key)
+    if layout is None:
+        layout = compute_day_layout(events)
+        layout_cache.set(view_key, layout)
+    return layout
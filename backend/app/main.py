@@ -1,27 +1,27 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from authlib.integrations.starlette_client import OAuth
 from app.db.base import Base
-from app.db.session import engine
-from app.routers import users, events, auth
+from app.db.session import engine, async_engine
+from app.routers import users, events, freebusy, auth, internal, metrics
+from app.event_feed import broadcaster
+from app.metrics import MetricsMiddleware
+from app.oauth import close_http_client
 from app.core.config import settings
-from starlette.config import Config
+from app.pagination import NEXT_CURSOR_HEADER
 
 
 def create_db_and_tables():
+    """Create the schema directly, for throwaway databases (benchmarks).
+
+    Deployed databases are managed by the migrations (`alembic upgrade head`),
+    run once before the workers start rather than by every worker.
+    """
     Base.metadata.create_all(bind=engine)
 
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
-
-# Load config for Authlib
-config = Config(".env")
-oauth = OAuth(config=config)
-auth.set_oauth_client(oauth)
-auth.register_oauth_clients()
-
 origins = [
     settings.FRONTEND_URL,
     f"{settings.FRONTEND_URL}/",
@@ -33,18 +33,31 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
 app.add_middleware(SessionMiddleware, secret_key=settings.SECRET_KEY)
+# Outermost, so the timings include the other middleware
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(users.router, tags=["users"])
 app.include_router(events.router, tags=["events"])
+app.include_router(freebusy.router, tags=["freebusy"])
 app.include_router(auth.router, tags=["auth"])
+app.include_router(internal.router, tags=["internal"])
+app.include_router(metrics.router, tags=["metrics"])
 
 
 @app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
+async def on_startup():
+    await broadcaster.start()
+
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    await broadcaster.stop()
+    await close_http_client()
+    await async_engine.dispose()
 
 
 @app.get("/")
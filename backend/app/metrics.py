@@ -0,0 +1,202 @@
+"""Per-route request metrics in Prometheus text format.
+
+MetricsMiddleware (plain ASGI, so streaming responses pass straight through)
+times each request and puts a RequestStats object in a context variable.
+Cursor hooks on the engines add every statement's count and duration to the
+current request's stats; the context is inherited by run_sync greenlets and
+threadpool routes, so queries are attributed wherever they run. Requests are
+labelled by route template (e.g. /events/{event_id}), never by raw path, to
+keep the number of series bounded.
+"""
+
+import bisect
+import threading
+import time
+from contextvars import ContextVar
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.db.instrumentation import pool_stats
+
+# Upper bounds (seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class RequestStats:
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar(
+    "request_stats", default=None
+)
+
+
+class _RouteMetrics:
+    __slots__ = ("buckets", "count", "seconds", "queries", "db_seconds", "statuses")
+
+    def __init__(self):
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)  # Last one is +Inf
+        self.count = 0
+        self.seconds = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.statuses: Dict[int, int] = {}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], _RouteMetrics] = {}
+
+    def observe(
+        self, method: str, route: str, status: int, seconds: float, stats: RequestStats
+    ) -> None:
+        bucket = bisect.bisect_left(LATENCY_BUCKETS, seconds)
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = _RouteMetrics()
+            metrics.buckets[bucket] += 1
+            metrics.count += 1
+            metrics.seconds += seconds
+            metrics.queries += stats.queries
+            metrics.db_seconds += stats.db_seconds
+            metrics.statuses[status] = metrics.statuses.get(status, 0) + 1
+
+    def snapshot(self) -> List[Tuple[str, str, _RouteMetrics]]:
+        with self._lock:
+            snapshot = []
+            for (method, route), metrics in sorted(self._routes.items()):
+                copy = _RouteMetrics()
+                copy.buckets = list(metrics.buckets)
+                copy.count, copy.seconds = metrics.count, metrics.seconds
+                copy.queries, copy.db_seconds = metrics.queries, metrics.db_seconds
+                copy.statuses = dict(metrics.statuses)
+                snapshot.append((method, route, copy))
+            return snapshot
+
+
+registry = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    def __init__(self, app, registry: MetricsRegistry = registry):
+        self.app = app
+        self.registry = registry
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            _request_stats.reset(token)
+            # The router stores the matched route in the (shared) scope
+            route = scope.get("route")
+            path = getattr(route, "path", None) or UNMATCHED_ROUTE
+            self.registry.observe(scope["method"], path, status, elapsed, stats)
+
+
+def instrument_engine(engine) -> None:
+    """Attribute the engine's statements to the request running them."""
+    engine = getattr(engine, "sync_engine", engine)
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _start(conn, cursor, statement, parameters, context, executemany):
+        if context is not None and _request_stats.get() is not None:
+            context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        stats = _request_stats.get()
+        started = getattr(context, "_metrics_started", None)
+        if stats is not None and started is not None:
+            stats.queries += 1
+            stats.db_seconds += time.perf_counter() - started
+
+
+# --- Exposition ---
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    pairs = ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+    return "{" + pairs + "}"
+
+
+def _header(name: str, kind: str, help_text: str) -> List[str]:
+    return [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+
+
+def render(registry: MetricsRegistry = registry, engines: Iterable = ()) -> str:
+    snapshot = registry.snapshot()
+    lines = _header(
+        "http_requests_total", "counter", "Requests by method, route and status."
+    )
+    for method, route, metrics in snapshot:
+        for status, count in sorted(metrics.statuses.items()):
+            lines.append(
+                f"http_requests_total{_labels(method=method, route=route, status=status)} {count}"
+            )
+
+    lines += _header(
+        "http_request_duration_seconds", "histogram", "Request latency by route."
+    )
+    for method, route, metrics in snapshot:
+        cumulative = 0
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), metrics.buckets):
+            cumulative += count
+            labels = _labels(method=method, route=route, le=bound)
+            lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+        labels = _labels(method=method, route=route)
+        lines.append(f"http_request_duration_seconds_sum{labels} {metrics.seconds}")
+        lines.append(f"http_request_duration_seconds_count{labels} {metrics.count}")
+
+    lines += _header(
+        "http_request_db_queries_total", "counter", "SQL statements run by route."
+    )
+    for method, route, metrics in snapshot:
+        labels = _labels(method=method, route=route)
+        lines.append(f"http_request_db_queries_total{labels} {metrics.queries}")
+
+    lines += _header(
+        "http_request_db_seconds_total",
+        "counter",
+        "Time spent executing SQL statements by route.",
+    )
+    for method, route, metrics in snapshot:
+        labels = _labels(method=method, route=route)
+        lines.append(f"http_request_db_seconds_total{labels} {metrics.db_seconds}")
+
+    pools = [(name, pool_stats(engine)) for name, engine in engines]
+    for key, name, kind, help_text in (
+        ("checked_out", "db_pool_checked_out", "gauge", "Connections in use."),
+        ("checkouts", "db_pool_checkouts_total", "counter", "Connection checkouts."),
+        ("timeouts", "db_pool_timeouts_total", "counter", "Checkouts that timed out."),
+    ):
+        lines += _header(name, kind, help_text)
+        for engine_name, stats in pools:
+            if key in stats:
+                lines.append(f"{name}{_labels(engine=engine_name)} {stats[key]}")
+    return "\n".join(lines) + "\n"
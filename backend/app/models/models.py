@@ -1,9 +1,21 @@
-from sqlalchemy import Column, Integer, String, Table, ForeignKey, Date
+from sqlalchemy import (
+    DDL,
+    Column,
+    Integer,
+    String,
+    Table,
+    ForeignKey,
+    Date,
+    Index,
+    event,
+    text,
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import JSONB as PG_JSONB
 from sqlalchemy.types import TypeDecorator
 import json
 from app.db.base import Base
+from app.event_search import POSTGRES_DDL, SQLITE_DDL, SQLITE_DROP_DDL
 
 
 class JSONBType(TypeDecorator):
@@ -26,7 +38,9 @@ class JSONBType(TypeDecorator):
 
     def load_dialect_impl(self, dialect):
         if dialect.name == "postgresql":
-            return dialect.type_descriptor(PG_JSONB())
+            # Python None is stored as SQL NULL, not JSON 'null', so
+            # IS NULL filters work on JSON columns
+            return dialect.type_descriptor(PG_JSONB(none_as_null=True))
         return dialect.type_descriptor(String())
 
     @property
@@ -40,11 +54,38 @@ event_participants = Table(
     Base.metadata,
     Column("event_id", ForeignKey("events.id"), primary_key=True),
     Column("user_id", ForeignKey("users.id"), primary_key=True),
+    # The primary key leads with event_id; this serves "events a user attends"
+    Index("ix_event_participants_user_event", "user_id", "event_id"),
 )
 
 
 class DBUser(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Matches the (username, id) keyset order of the user listing
+        Index("ix_users_username_id", "username", "id"),
+        # GET /users/search. Prefixes are ranges of lower(column) in byte
+        # order (COLLATE "C" on Postgres, the default on SQLite), read in index
+        # order; substrings use the pg_trgm GIN indexes (Postgres only)
+        Index(
+            "ix_users_username_lower", text('lower(username) COLLATE "C"'), "id"
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_email_lower", text('lower(email) COLLATE "C"'), "id"
+        ).ddl_if(dialect="postgresql"),
+        Index("ix_users_username_lower", text("lower(username)")).ddl_if(dialect="sqlite"),
+        Index("ix_users_email_lower", text("lower(email)")).ddl_if(dialect="sqlite"),
+        Index(
+            "ix_users_username_trgm",
+            text("lower(username) gin_trgm_ops"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_users_email_trgm",
+            text("lower(email) gin_trgm_ops"),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     username = Column(String, index=True)
@@ -54,6 +95,9 @@ class DBUser(Base):
     google_id = Column(String, unique=True, nullable=True)
     github_id = Column(String, unique=True, nullable=True)
     provider = Column(String, nullable=True)  # 'google', 'github', or 'local'
+    # Bumped by every write to an event the user creates or attends; drives
+    # the ETags of their event listings
+    events_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     events = relationship("DBEvent", back_populates="creator")
     participating_in = relationship(
@@ -64,8 +108,29 @@ class DBUser(Base):
         return f"<User(username='{self.username}', email='{self.email}')>"
 
 
+# The trigram indexes need the extension (the 0007 migration creates it too)
+event.listen(
+    DBUser.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
+
+
 class DBEvent(Base):
     __tablename__ = "events"
+    __table_args__ = (
+        # Serves per-user date-range listings (week/month views) as one range scan
+        Index("ix_events_creator_start", "creator_id", "start_date", "startMinute"),
+        # Recurring series are few per user; find the ones overlapping a range
+        # without walking the user's single events
+        Index(
+            "ix_events_creator_recurring",
+            "creator_id",
+            "recurrence_end",
+            postgresql_where=text("recurrence IS NOT NULL"),
+            sqlite_where=text("recurrence IS NOT NULL"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True)
@@ -77,7 +142,11 @@ class DBEvent(Base):
     endMinute = Column(Integer)
     description = Column(String, nullable=True)
     location = Column(JSONBType, nullable=True)
+    recurrence = Column(JSONBType, nullable=True)  # RecurrenceRule, None if single
+    recurrence_end = Column(Date, nullable=True)  # Last possible occurrence
     creator_id = Column(Integer, ForeignKey("users.id"))
+    # Bumped by every write; conditional writes and If-Match compare against it
+    version = Column(Integer, nullable=False, default=1, server_default="1")
 
     creator = relationship("DBUser", back_populates="events")
     participants = relationship(
@@ -86,3 +155,27 @@ class DBEvent(Base):
 
     def __repr__(self):
         return f"<Event(title='{self.title}')>"
+
+
+# Full-text search structures live outside the model; see app.event_search
+for ddl in POSTGRES_DDL:
+    event.listen(DBEvent.__table__, "after_create", ddl.execute_if(dialect="postgresql"))
+for ddl in SQLITE_DDL:
+    event.listen(DBEvent.__table__, "after_create", ddl.execute_if(dialect="sqlite"))
+event.listen(
+    DBEvent.__table__, "after_drop", SQLITE_DROP_DDL.execute_if(dialect="sqlite")
+)
+
+
+class DBEventCount(Base):
+    """Per-user event counts by day and type, kept in step by the event CRUD."""
+
+    __tablename__ = "event_counts"
+
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    start_date = Column(Date, primary_key=True)
+    type = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<EventCount(user_id={self.user_id}, start_date={self.start_date}, type='{self.type}', count={self.count})>"
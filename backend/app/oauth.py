@@ -0,0 +1,150 @@
+"""OAuth provider plumbing for the /auth routes.
+
+The Authlib registry is built on first use. Calls to provider APIs share one
+pooled httpx client per process instead of opening a client (and a TLS
+connection) per call. Authlib still opens a client for each token exchange,
+but with the process's SSL context: building a fresh one loads the CA bundle,
+tens of milliseconds of CPU on the event loop per client. Google's OpenID
+metadata and signing keys are fetched once per OIDC_METADATA_TTL_SECONDS and
+handed to Authlib, which then verifies ID tokens without any network round
+trip.
+"""
+
+import asyncio
+import ssl
+import time
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+_oauth_client = None
+_http_client: Optional["httpx.AsyncClient"] = None
+_ssl_context: Optional[ssl.SSLContext] = None
+# Created on first use so it belongs to the running event loop
+_metadata_lock: Optional[asyncio.Lock] = None
+
+
+def get_oauth_client():
+    """The Authlib OAuth registry, built the first time a provider is used.
+
+    Importing Authlib is a large share of the app's import time and most
+    workers never serve an OAuth login, so neither the import nor the client
+    registration happens at startup.
+    """
+    global _oauth_client
+    if _oauth_client is None:
+        from authlib.integrations.starlette_client import OAuth
+        from starlette.config import Config
+
+        oauth = OAuth(config=Config(".env"))
+        register_oauth_clients(oauth)
+        _oauth_client = oauth
+    return _oauth_client
+
+
+def get_ssl_context() -> ssl.SSLContext:
+    global _ssl_context
+    if _ssl_context is None:
+        import httpx
+
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+
+def register_oauth_clients(oauth):
+    # Google OAuth Configuration
+    oauth.register(
+        name="google",
+        client_id=settings.GOOGLE_CLIENT_ID,
+        client_secret=settings.GOOGLE_CLIENT_SECRET,
+        server_metadata_url=settings.GOOGLE_OIDC_METADATA_URL,
+        client_kwargs={"scope": "openid email profile", "verify": get_ssl_context()},
+    )
+
+    # GitHub OAuth Configuration
+    oauth.register(
+        name="github",
+        client_id=settings.GITHUB_CLIENT_ID,
+        client_secret=settings.GITHUB_CLIENT_SECRET,
+        access_token_url=f"{settings.GITHUB_OAUTH_URL}/login/oauth/access_token",
+        authorize_url=f"{settings.GITHUB_OAUTH_URL}/login/oauth/authorize",
+        api_base_url=f"{settings.GITHUB_API_URL}/",
+        client_kwargs={"scope": "user:email", "verify": get_ssl_context()},
+        redirect_uri=f"{settings.BACKEND_URL}/auth/github",
+    )
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    """The shared provider client; httpx is imported on first use, like Authlib."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+
+        limit = settings.OAUTH_HTTP_MAX_CONNECTIONS
+        _http_client = httpx.AsyncClient(
+            verify=get_ssl_context(),
+            timeout=settings.OAUTH_HTTP_TIMEOUT_SECONDS,
+            limits=httpx.Limits(max_connections=limit, max_keepalive_connections=limit),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _metadata_is_fresh(metadata: dict) -> bool:
+    loaded_at = metadata.get("_loaded_at")
+    return (
+        loaded_at is not None
+        and "jwks" in metadata
+        and time.time() - loaded_at < settings.OIDC_METADATA_TTL_SECONDS
+    )
+
+
+async def load_google_metadata(google) -> None:
+    """Make sure the Google client has current OpenID metadata and keys.
+
+    Concurrent logins wait for a single fetch. Authlib reads both from
+    `server_metadata` ("_loaded_at" marks it loaded) and still refetches the
+    keys by itself if a token is signed with a key id it does not know.
+    """
+    global _metadata_lock
+    if _metadata_is_fresh(google.server_metadata):
+        return
+    if _metadata_lock is None:
+        _metadata_lock = asyncio.Lock()
+    async with _metadata_lock:
+        if _metadata_is_fresh(google.server_metadata):
+            return
+        client = get_http_client()
+        response = await client.get(settings.GOOGLE_OIDC_METADATA_URL)
+        response.raise_for_status()
+        metadata = response.json()
+        response = await client.get(metadata["jwks_uri"])
+        response.raise_for_status()
+        google.server_metadata.update(
+            metadata, jwks=response.json(), _loaded_at=time.time()
+        )
+
+
+async def fetch_github_profile(access_token: str) -> Tuple[dict, List[dict]]:
+    """The GitHub user and their email addresses, requested concurrently."""
+    client = get_http_client()
+    headers = {
+        "Authorization": f"Bearer {access_token}",
+        "Accept": "application/vnd.github+json",
+    }
+    user, emails = await asyncio.gather(
+        client.get(f"{settings.GITHUB_API_URL}/user", headers=headers),
+        client.get(f"{settings.GITHUB_API_URL}/user/emails", headers=headers),
+    )
+    user.raise_for_status()
+    emails.raise_for_status()
+    return user.json(), emails.json()
@@ -0,0 +1,79 @@
+import base64
+import binascii
+import json
+from datetime import date
+from typing import Optional, Tuple
+
+# Header carrying the cursor for the next page of a keyset-paginated listing
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def _encode(kind: str, values: list) -> str:
+    raw = json.dumps({"k": kind, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode(kind: str, cursor: str) -> list:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        raise InvalidCursor("Cursor does not belong to this listing")
+    return payload.get("v")
+
+
+def _is_int(value) -> bool:
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+# --- Events: keyed on (start_date, startMinute, id) ---
+def encode_event_cursor(start_date: date, start_minute: int, event_id: int) -> str:
+    return _encode("events", [start_date.isoformat(), start_minute, event_id])
+
+
+def decode_event_cursor(cursor: str) -> Tuple[date, int, int]:
+    values = _decode("events", cursor)
+    try:
+        start_date, start_minute, event_id = values
+        if not (_is_int(start_minute) and _is_int(event_id)):
+            raise ValueError
+        return date.fromisoformat(start_date), start_minute, event_id
+    except (TypeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+
+
+# --- Users: keyed on (username, id) ---
+def encode_user_cursor(username: str, user_id: int) -> str:
+    return _encode("users", [username, user_id])
+
+
+def decode_user_cursor(cursor: str) -> Tuple[str, int]:
+    values = _decode("users", cursor)
+    try:
+        username, user_id = values
+        if not (isinstance(username, str) and _is_int(user_id)):
+            raise ValueError
+        return username, user_id
+    except (TypeError, ValueError):
+        raise InvalidCursor("Malformed cursor")
+
+
+def next_event_cursor(events: list, limit: int) -> Optional[str]:
+    """Cursor after the last event of a full page, or None on the last page."""
+    if not events or len(events) < limit:
+        return None
+    last = events[-1]
+    return encode_event_cursor(last.start_date, last.startMinute, last.id)
+
+
+def next_user_cursor(users: list, limit: int) -> Optional[str]:
+    if not users or len(users) < limit:
+        return None
+    last = users[-1]
+    return encode_user_cursor(last.username, last.id)
@@ -0,0 +1,136 @@
+import heapq
+from datetime import date, timedelta
+from typing import Iterable, Iterator, Optional, Tuple
+
+from app.schemas import RecurrenceFrequency, RecurrenceRule
+
+# Occurrences are produced lazily, so an unbounded series over an open range
+# is fine as long as the consumer stops; this only caps long runs of missing
+# monthly days (e.g. yearly on Feb 29) before the next valid one.
+_MAX_EMPTY_STEPS = 10_000
+
+
+def _add_months(start: date, months: int) -> Optional[date]:
+    """Same day-of-month `months` later, or None when that day does not exist."""
+    month_index = start.month - 1 + months
+    try:
+        return start.replace(
+            year=start.year + month_index // 12, month=month_index % 12 + 1
+        )
+    except ValueError:
+        # e.g. the 31st in a 30-day month: that occurrence is skipped (RFC 5545)
+        return None
+
+
+def _nth_occurrence(start: date, rule: RecurrenceRule, n: int) -> Optional[date]:
+    if rule.freq == RecurrenceFrequency.monthly:
+        return _add_months(start, n * rule.interval)
+    step = 7 if rule.freq == RecurrenceFrequency.weekly else 1
+    return start + timedelta(days=n * step * rule.interval)
+
+
+def _first_index_near(start: date, rule: RecurrenceRule, target: date) -> int:
+    """An occurrence index at or just before `target`, computed without iterating."""
+    if target <= start:
+        return 0
+    if rule.freq == RecurrenceFrequency.monthly:
+        months = (target.year - start.year) * 12 + target.month - start.month
+        return months // rule.interval
+    step = 7 if rule.freq == RecurrenceFrequency.weekly else 1
+    return (target - start).days // (step * rule.interval)
+
+
+def series_end(start: date, rule: RecurrenceRule) -> Optional[date]:
+    """Last date the series can occur on, or None for an unbounded series."""
+    candidates = []
+    if rule.until:
+        candidates.append(rule.until)
+    if rule.count:
+        if rule.freq == RecurrenceFrequency.monthly:
+            # The last step may fall on a missing day (the 31st in a 30-day
+            # month); the end of that month is still an upper bound.
+            steps = (rule.count - 1) * rule.interval
+            next_month = _add_months(start.replace(day=1), steps + 1)
+            candidates.append(next_month - timedelta(days=1))
+        else:
+            candidates.append(_nth_occurrence(start, rule, rule.count - 1))
+    return min(candidates) if candidates else None
+
+
+def iter_occurrences(
+    start: date,
+    rule: RecurrenceRule,
+    window_start: Optional[date] = None,
+    window_end: Optional[date] = None,
+) -> Iterator[date]:
+    """Yield the series' occurrence dates inside [window_start, window_end].
+
+    Jumps straight to the window instead of walking the series from its
+    start, so the cost depends on the window, not on the series length.
+    """
+    window_start = max(window_start or start, start)
+    exceptions = set(rule.exceptions)
+    n = _first_index_near(start, rule, window_start)
+    empty_steps = 0
+    while True:
+        if rule.count is not None and n >= rule.count:
+            return
+        occurrence = _nth_occurrence(start, rule, n)
+        n += 1
+        if occurrence is None:
+            empty_steps += 1
+            if empty_steps > _MAX_EMPTY_STEPS:
+                return
+            continue
+        empty_steps = 0
+        if rule.until and occurrence > rule.until:
+            return
+        if window_end and occurrence > window_end:
+            return
+        if occurrence >= window_start and occurrence not in exceptions:
+            yield occurrence
+
+
+class EventOccurrence:
+    """One instance of a recurring event; reads like the series' DBEvent."""
+
+    __slots__ = ("event", "start_date")
+
+    def __init__(self, event, start_date: date):
+        self.event = event
+        self.start_date = start_date
+
+    @property
+    def series_start_date(self) -> date:
+        return self.event.start_date
+
+    def __getattr__(self, name):
+        return getattr(self.event, name)
+
+
+def sort_key(event) -> Tuple[date, int, int]:
+    """Listing order shared by stored events and occurrences."""
+    return event.start_date, event.startMinute, event.id
+
+
+def iter_series_occurrences(
+    series, window_start: Optional[date], window_end: Optional[date]
+) -> Iterator[EventOccurrence]:
+    rule = RecurrenceRule.model_validate(series.recurrence)
+    occurrences = iter_occurrences(series.start_date, rule, window_start, window_end)
+    for occurrence in occurrences:
+        yield EventOccurrence(series, occurrence)
+
+
+def merge_occurrences(
+    single_events: Iterable,
+    series_list: Iterable,
+    window_start: Optional[date],
+    window_end: Optional[date],
+) -> Iterator:
+    """Merge time-ordered single events with every series' occurrences, lazily."""
+    streams = [iter(single_events)] + [
+        iter_series_occurrences(series, window_start, window_end)
+        for series in series_list
+    ]
+    return heapq.merge(*streams, key=sort_key)
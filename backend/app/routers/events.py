@@ -1,77 +1,431 @@
+import asyncio
+import csv
+import io
+import json
+import time
 from datetime import date
 from typing import List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 import app.crud as crud
+import app.crud_async as crud_async
 import app.schemas as schemas
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, get_async_db, get_db
+from app.etag import (
+    etag_matches,
+    event_etag,
+    events_etag,
+    if_match_versions,
+    not_modified,
+    set_etag,
+)
+from app.event_feed import broadcaster
+from app.event_search import search_terms
+from app.ical import CALENDAR_FOOTER, calendar_header, dtstamp_now, event_to_vevent
+from app.imports import ImportReport, detect_format, iter_import_events
+from app.layout import get_day_layout
 from app.models.models import DBUser
-from app.routers.users import get_current_user
+from app.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    decode_event_cursor,
+    next_event_cursor,
+)
+from app.routers.freebusy import ensure_no_conflicts
+from app.routers.users import get_current_user, get_stream_user
+from app.serialization import event_list_response
 
 router = APIRouter()
 
 
 @router.post("/events/", response_model=schemas.EventResponse)
-def create_event(
+async def create_event(
     event: schemas.EventCreate,
+    response: Response,
+    check_conflicts: bool = False,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: DBUser = Depends(get_current_user),
+):
+    if check_conflicts:
+        await ensure_no_conflicts(
+            db, event, [current_user.id, *(event.participants or [])]
+        )
+    db_event = await crud_async.create_event(
+        db=db, event=event, creator_id=current_user.id
+    )
+    set_etag(response, event_etag(db_event.id, db_event.version))
+    return db_event
+
+
+@router.post("/events/batch", response_model=schemas.EventBatchResponse)
+async def batch_events(
+    batch: schemas.EventBatchRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: DBUser = Depends(get_current_user),
+):
+    if len(batch.create) + len(batch.update) > settings.EVENT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {settings.EVENT_BATCH_MAX_ITEMS} items",
+        )
+    results = await crud_async.batch_events(
+        db, creator_id=current_user.id, create=batch.create, update_items=batch.update
+    )
+    return {"results": results}
+
+
+@router.post("/events/batch/delete", response_model=schemas.EventBatchResponse)
+async def batch_delete_events(
+    batch: schemas.EventBatchDelete,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: DBUser = Depends(get_current_user),
+):
+    if len(batch.ids) > settings.EVENT_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"A batch may contain at most {settings.EVENT_BATCH_MAX_ITEMS} items",
+        )
+    results = await crud_async.delete_events(
+        db, creator_id=current_user.id, event_ids=batch.ids
+    )
+    return {"results": results}
+
+
+async def _listing_etag(request: Request, db: AsyncSession, user_id: int) -> str:
+    # One primary-key lookup; answers unchanged polls without reading events
+    version = await crud_async.get_events_version(db, user_id)
+    return events_etag(user_id, version, request)
+
+
+@router.post("/events/import", response_model=schemas.EventImportSummary)
+def import_events(
+    file: UploadFile,
+    import_format: Optional[schemas.ImportFormat] = Query(None, alias="format"),
     db: Session = Depends(get_db),
     current_user: DBUser = Depends(get_current_user),
 ):
-    return crud.create_event(db=db, event=event, creator_id=current_user.id)
+    """Import an .ics or CSV file as new events of the current user.
+
+    A plain (threadpool) route: parsing and the batched inserts are CPU and
+    driver work on the sync engine, kept off the event loop. The upload is
+    parsed line by line as rows are inserted.
+    """
+    # Starlette has spooled the upload to a temporary file; refuse big ones
+    # before parsing any of it
+    if file.size is not None and file.size > settings.EVENT_IMPORT_MAX_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Uploads may be at most {settings.EVENT_IMPORT_MAX_BYTES} bytes",
+        )
+    import_format = import_format or detect_format(file.filename, file.content_type)
+    if import_format is None:
+        raise HTTPException(
+            status_code=400,
+            detail="Unknown file type; upload a .ics or .csv file or pass ?format=",
+        )
+    report = ImportReport()
+    started = time.perf_counter()
+    lines = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    try:
+        imported = crud.import_events(
+            db, current_user.id, iter_import_events(lines, import_format, report)
+        )
+    except (UnicodeDecodeError, csv.Error) as e:  # Not text, or no CSV header
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Could not read file: {e}")
+    finally:
+        lines.detach()  # Leave closing the upload to Starlette
+    elapsed = time.perf_counter() - started
+    return schemas.EventImportSummary(
+        imported=imported,
+        skipped=report.skipped,
+        errored=report.errored,
+        errors=report.errors,
+        elapsed_seconds=round(elapsed, 3),
+        rows_per_second=round(imported / elapsed, 1) if elapsed else 0.0,
+    )
 
 
 @router.get("/events/", response_model=List[schemas.EventResponse])
-def read_events(
+async def read_events(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     date: Optional[date] = None,
-    db: Session = Depends(get_db),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    layout: bool = False,
+    include_participating: bool = False,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: DBUser = Depends(get_current_user),
 ):
-    events = crud.get_events(
-        db, creator_id=current_user.id, skip=skip, limit=limit, event_date=date
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=400, detail="'from' must be on or before 'to'"
+        )
+    if layout and date is None:
+        raise HTTPException(
+            status_code=400, detail="layout=true requires a 'date'"
+        )
+    try:
+        after = decode_event_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    etag = await _listing_etag(request, db, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    events = await crud_async.get_events(
+        db,
+        creator_id=current_user.id,
+        skip=skip,
+        limit=limit,
+        event_date=date,
+        date_from=date_from,
+        date_to=date_to,
+        after=after,
+        include_participating=include_participating,
+    )
+    next_cursor = next_event_cursor(events, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    day_layout = get_day_layout(etag, events) if layout else None
+    # Built directly from the loaded rows; see app.serialization
+    return event_list_response(events, day_layout, headers=dict(response.headers))
+
+
+@router.get("/events/stats", response_model=schemas.EventStats)
+async def read_event_stats(
+    request: Request,
+    response: Response,
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    bucket: Optional[schemas.StatsBucket] = None,
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: DBUser = Depends(get_current_user),
+):
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=400, detail="'from' must be on or before 'to'"
+        )
+    etag = await _listing_etag(request, db, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return await crud_async.get_event_stats(
+        db,
+        user_id=current_user.id,
+        date_from=date_from,
+        date_to=date_to,
+        bucket=bucket,
+    )
+
+
+@router.get("/events/search", response_model=List[schemas.EventResponse])
+async def search_events(
+    request: Request,
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    if_none_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: DBUser = Depends(get_current_user),
+):
+    """Ranked full-text search over the events the user created or attends."""
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=400, detail="'from' must be on or before 'to'"
+        )
+    terms = search_terms(q)
+    if not terms:
+        raise HTTPException(status_code=400, detail="'q' has no words to search for")
+    # Results change only when an event the user sees does, like the listing
+    etag = await _listing_etag(request, db, current_user.id)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+
+    events = await crud_async.search_events(
+        db,
+        current_user.id,
+        terms,
+        skip=skip,
+        limit=limit,
+        date_from=date_from,
+        date_to=date_to,
+    )
+    return event_list_response(events, headers=dict(response.headers))
+
+
+# Bytes of VEVENT text collected before a chunk is sent
+EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+@router.get("/events/export.ics")
+async def export_events(current_user: DBUser = Depends(get_stream_user)):
+    """The user's whole calendar as iCalendar, streamed as it is read.
+
+    Accepts ?token= like the change stream, so it works as a plain download
+    link or calendar subscription URL.
+    """
+
+    async def calendar():
+        # A session of its own: it has to live as long as the stream
+        async with AsyncSessionLocal() as db:
+            yield calendar_header(f"{current_user.username}'s calendar")
+            dtstamp, buffer, size = dtstamp_now(), [], 0
+            async for event in crud_async.stream_export_events(db, current_user.id):
+                vevent = event_to_vevent(event, dtstamp)
+                buffer.append(vevent)
+                size += len(vevent)
+                if size >= EXPORT_CHUNK_BYTES:
+                    yield "".join(buffer)
+                    buffer, size = [], 0
+            buffer.append(CALENDAR_FOOTER)
+            yield "".join(buffer)
+
+    return StreamingResponse(
+        calendar(),
+        media_type="text/calendar; charset=utf-8",
+        headers={"Content-Disposition": 'attachment; filename="calendar.ics"'},
+    )
+
+
+@router.get("/events/stream")
+async def stream_event_changes(
+    request: Request, current_user: DBUser = Depends(get_stream_user)
+):
+    """Server-sent events for changes to events the user creates or attends.
+
+    Each message is `event: created|updated|deleted` with the event id and
+    start date as data; clients refetch what they show. `resync` means
+    notices were dropped for a slow client and everything should be
+    refetched. Comment lines are sent as heartbeats.
+    """
+
+    async def messages():
+        async with broadcaster.subscribe(current_user.id) as queue:
+            yield "retry: 5000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(
+                        queue.get(), timeout=settings.EVENT_FEED_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                # Messages are shared between streams; do not mutate them
+                data = {key: value for key, value in message.items() if key != "type"}
+                yield f"event: {message['type']}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        messages(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _expected_versions(
+    event_id: int, if_match: Optional[str], version: Optional[int] = None
+) -> Optional[List[int]]:
+    """Versions a write may apply to: from If-Match, else the body; None for any."""
+    if if_match is not None:
+        return if_match_versions(if_match, event_id)
+    return None if version is None else [version]
+
+
+def _write_rejected(
+    e: crud.EventWriteRejected, event_id: int, action: str, if_match: Optional[str]
+) -> HTTPException:
+    if e.reason == "not_found":
+        return HTTPException(status_code=404, detail="Event not found")
+    if e.reason == "forbidden":
+        return HTTPException(
+            status_code=403, detail=f"Not authorized to {action} this event"
+        )
+    # A failed If-Match precondition is a 412; a stale version in the body, 409
+    return HTTPException(
+        status_code=412 if if_match is not None else 409,
+        detail=f"Event was modified; it is now at version {e.version}",
+        headers={"ETag": event_etag(event_id, e.version)},
     )
-    return events
 
 
 @router.get("/events/{event_id}", response_model=schemas.EventResponse)
-def read_event(event_id: int, db: Session = Depends(get_db)):
-    db_event = crud.get_event(db, event_id=event_id)
+async def read_event(
+    event_id: int, response: Response, db: AsyncSession = Depends(get_async_db)
+):
+    db_event = await crud_async.get_event(db, event_id=event_id)
     if db_event is None:
         raise HTTPException(status_code=404, detail="Event not found")
+    set_etag(response, event_etag(db_event.id, db_event.version))
     return db_event
 
 
 @router.put("/events/{event_id}", response_model=schemas.EventResponse)
-def update_event(
+async def update_event(
     event_id: int,
     event: schemas.EventUpdate,
-    db: Session = Depends(get_db),
+    response: Response,
+    check_conflicts: bool = False,
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: DBUser = Depends(get_current_user),
 ):
-    db_event = crud.get_event(db, event_id=event_id)
-    if db_event is None:
-        raise HTTPException(status_code=404, detail="Event not found")
-    if db_event.creator_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to update this event"
+    """Update an event the user created.
+
+    Pass the event's ETag as If-Match, or its version in the body, to have
+    the write refused (412 or 409) when someone else updated it first.
+    """
+    if check_conflicts:
+        participant_ids = [current_user.id, *(event.participants or [])]
+        await ensure_no_conflicts(db, event, participant_ids, exclude_event_id=event_id)
+    try:
+        db_event = await crud_async.update_event(
+            db,
+            event,
+            event_id,
+            current_user.id,
+            _expected_versions(event_id, if_match, event.version),
         )
-    return crud.update_event(db=db, event=event, event_id=event_id)
+    except crud.EventWriteRejected as e:
+        raise _write_rejected(e, event_id, "update", if_match)
+    set_etag(response, event_etag(db_event.id, db_event.version))
+    return db_event
 
 
 @router.delete("/events/{event_id}", response_model=schemas.EventResponse)
-def delete_event(
+async def delete_event(
     event_id: int,
-    db: Session = Depends(get_db),
+    if_match: Optional[str] = Header(None),
+    db: AsyncSession = Depends(get_async_db),
     current_user: DBUser = Depends(get_current_user),
 ):
-    db_event = crud.get_event(db, event_id=event_id)
-    if db_event is None:
-        raise HTTPException(status_code=404, detail="Event not found")
-    if db_event.creator_id != current_user.id:
-        raise HTTPException(
-            status_code=403, detail="Not authorized to delete this event"
+    try:
+        return await crud_async.delete_event(
+            db, event_id, current_user.id, _expected_versions(event_id, if_match)
         )
-    return crud.delete_event(db=db, event_id=event_id)
+    except crud.EventWriteRejected as e:
+        raise _write_rejected(e, event_id, "delete", if_match)
@@ -0,0 +1,113 @@
+from datetime import date, timedelta
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.crud_async as crud_async
+import app.schemas as schemas
+from app.core.config import settings
+from app.db.session import get_async_db
+from app.freebusy import (
+    MINUTES_PER_DAY,
+    build_busy_maps,
+    common_free_slots,
+    event_dates,
+    find_conflicts,
+)
+from app.models.models import DBUser
+from app.routers.users import get_current_user
+
+router = APIRouter()
+
+
+@router.get("/freebusy", response_model=schemas.FreeBusyResponse)
+async def read_free_busy(
+    user_ids: List[int] = Query(...),
+    date_from: date = Query(..., alias="from"),
+    date_to: date = Query(..., alias="to"),
+    day_start: int = Query(0, ge=0, le=MINUTES_PER_DAY),
+    day_end: int = Query(MINUTES_PER_DAY, ge=0, le=MINUTES_PER_DAY),
+    min_duration: int = Query(1, ge=1),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: DBUser = Depends(get_current_user),
+):
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=400, detail="'from' must be on or before 'to'"
+        )
+    if day_start >= day_end:
+        raise HTTPException(
+            status_code=400, detail="'day_start' must be before 'day_end'"
+        )
+    if (date_to - date_from).days + 1 > settings.FREEBUSY_MAX_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Range may span at most {settings.FREEBUSY_MAX_DAYS} days",
+        )
+    if len(set(user_ids)) > settings.FREEBUSY_MAX_USERS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.FREEBUSY_MAX_USERS} users per request",
+        )
+
+    busy_events = await crud_async.get_busy_events(db, user_ids, date_from, date_to)
+    busy = build_busy_maps(busy_events, date_from, date_to)
+    days = common_free_slots(
+        busy, user_ids, date_from, date_to, day_start, day_end, min_duration
+    )
+    return {
+        "user_ids": sorted(set(user_ids)),
+        "days": [
+            {
+                "date": day,
+                "free": [
+                    {"start_minute": start, "end_minute": end} for start, end in slots
+                ],
+            }
+            for day, slots in days
+        ],
+    }
+
+
+async def ensure_no_conflicts(
+    db: AsyncSession,
+    event: schemas.EventBase,
+    participant_ids: List[int],
+    exclude_event_id: Optional[int] = None,
+) -> None:
+    """Raise 409 if any participant is already busy during the event.
+
+    Recurring events are checked over their first FREEBUSY_MAX_DAYS days.
+    """
+    date_from = event.start_date
+    date_to = date_from + timedelta(days=settings.FREEBUSY_MAX_DAYS - 1)
+    recurrence = event.recurrence.model_dump() if event.recurrence else None
+    dates = list(event_dates(event.start_date, recurrence, date_from, date_to))
+    if not dates:
+        return
+    busy_events = await crud_async.get_busy_events(
+        db, participant_ids, dates[0], dates[-1], exclude_event_id=exclude_event_id
+    )
+    busy = build_busy_maps(busy_events, dates[0], dates[-1])
+    conflicts = find_conflicts(
+        busy, participant_ids, dates, event.startMinute, event.endMinute
+    )
+    if conflicts:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "Participants are busy during this event",
+                "conflicts": [
+                    schemas.EventConflict(
+                        user_id=user_id,
+                        date=day,
+                        busy=[
+                            schemas.TimeSlot(start_minute=start, end_minute=end)
+                            for start, end in runs
+                        ],
+                    ).model_dump(mode="json")
+                    for user_id, day, runs in conflicts
+                ],
+            },
+        )
@@ -0,0 +1,24 @@
+from fastapi import APIRouter, Depends
+
+from app.core.cache import user_cache
+from app.core.security import password_hasher, require_internal_token
+from app.db.instrumentation import pool_stats
+from app.db.session import async_engine, engine
+from app.event_feed import broadcaster
+from app.layout import layout_cache
+from app.user_search import user_search_cache
+
+# Process internals; only for operators holding INTERNAL_API_TOKEN
+router = APIRouter(prefix="/internal", dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/stats")
+async def read_internal_stats():
+    return {
+        "user_cache": user_cache.stats(),
+        "password_hasher": password_hasher.stats(),
+        "layout_cache": layout_cache.stats(),
+        "user_search_cache": user_search_cache.stats(),
+        "event_feed": broadcaster.stats(),
+        "db_pool": {"sync": pool_stats(engine), "async": pool_stats(async_engine)},
+    }
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+
+from app.core.security import require_internal_token
+from app.db.session import async_engine, engine
+from app.metrics import CONTENT_TYPE, render
+
+# Scraped with INTERNAL_API_TOKEN as the bearer token
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+async def read_metrics():
+    return PlainTextResponse(
+        render(engines=[("sync", engine), ("async", async_engine)]),
+        media_type=CONTENT_TYPE,
+    )
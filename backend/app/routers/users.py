@@ -1,19 +1,30 @@
 from datetime import timedelta
+from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-import app.crud as crud
+import app.crud_async as crud_async
 import app.schemas as schemas
-from app.db.session import get_db
+from app.core.cache import user_cache
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal, get_async_db
 from app.models.models import DBUser
+from app.user_search import cache_results, get_cached_results, normalize_query
+from app.pagination import (
+    NEXT_CURSOR_HEADER,
+    InvalidCursor,
+    decode_user_cursor,
+    next_user_cursor,
+)
 from app.core.security import (
     ACCESS_TOKEN_EXPIRE_MINUTES,
     create_access_token,
-    get_password_hash,
-    verify_password,
+    PasswordHashingBusy,
+    password_hasher,
     oauth2_scheme,
+    optional_oauth2_scheme,
     decode_access_token,
 )
 
@@ -21,47 +32,95 @@ from app.core.security import (
 router = APIRouter()
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-) -> DBUser:
+async def _user_from_token(token: Optional[str], db: AsyncSession) -> DBUser:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    token_data = decode_access_token(token)
+    token_data = decode_access_token(token) if token else None
     if token_data is None:
         raise credentials_exception
-    user = crud.get_user(db, token_data.id)
+    user = user_cache.get(token_data.id)
     if user is None:
-        raise credentials_exception
+        user = await crud_async.get_user(db, token_data.id)
+        if user is None:
+            raise credentials_exception
+        # Cache a detached instance so it is never tied to another request's session
+        db.expunge(user)
+        user_cache.set(user.id, user)
     return user
 
 
+async def get_current_user(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> DBUser:
+    return await _user_from_token(token, db)
+
+
+async def get_stream_user(
+    header_token: Optional[str] = Depends(optional_oauth2_scheme),
+    token: Optional[str] = Query(None),
+) -> DBUser:
+    """get_current_user for long-lived streaming responses.
+
+    EventSource cannot send headers, so the token may also come as ?token=.
+    The session is closed before returning, so an open stream never pins a
+    pooled connection.
+    """
+    async with AsyncSessionLocal() as db:
+        return await _user_from_token(header_token or token, db)
+
+
+def hashing_busy_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many login attempts in progress, please retry",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/register", response_model=schemas.UserResponse)
-def register_user(user: schemas.UserCreate, db: Session = Depends(get_db)):
-    if crud.get_user_by_email(db, user.email):
+async def register_user(
+    user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)
+):
+    if await crud_async.get_user_by_email(db, user.email):
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered"
         )
 
-    hashed_password = get_password_hash(user.password)
+    try:
+        hashed_password = await password_hasher.hash(user.password)
+    except PasswordHashingBusy:
+        raise hashing_busy_exception()
     db_user_in = schemas.UserInDB(**user.dict(), hashed_password=hashed_password)
-    created_user = crud.create_user(db, db_user_in)
+    created_user = await crud_async.create_user(db, db_user_in)
     return created_user
 
 
 @router.post("/token", response_model=schemas.Token)
-def login_for_access_token(
-    form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
+async def login_for_access_token(
+    form_data: OAuth2PasswordRequestForm = Depends(),
+    db: AsyncSession = Depends(get_async_db),
 ):
-    user = crud.get_user_by_email(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    user = await crud_async.get_user_by_email(db, form_data.username)
+    verified, new_hash = False, None
+    if user:
+        try:
+            verified, new_hash = await password_hasher.verify_and_update(
+                form_data.password, user.hashed_password
+            )
+        except PasswordHashingBusy:
+            raise hashing_busy_exception()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    if new_hash:
+        # Stored hash predates the current scheme/cost factor; upgrade it
+        user = await crud_async.update_user_password(db, user, new_hash)
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
         data={
@@ -76,11 +135,48 @@ def login_for_access_token(
 
 
 @router.get("/users/me/", response_model=schemas.UserResponse)
-def read_users_me(current_user: DBUser = Depends(get_current_user)):
+async def read_users_me(current_user: DBUser = Depends(get_current_user)):
     return current_user
 
 
+@router.get("/users/search", response_model=list[schemas.UserResponse])
+async def search_users(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(
+        settings.USER_SEARCH_MAX_RESULTS, ge=1, le=settings.USER_SEARCH_MAX_RESULTS
+    ),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: DBUser = Depends(get_current_user),
+):
+    """Typeahead for guest selection: ranked username/email matches."""
+    query = normalize_query(q)
+    if not query:
+        return []
+    results = get_cached_results(query)
+    if results is None:
+        # Always fetch the full cap so the cached result serves any limit
+        rows, complete = await crud_async.search_users(
+            db, query, settings.USER_SEARCH_MAX_RESULTS
+        )
+        results = cache_results(query, rows, complete)
+    return results[:limit]
+
+
 @router.get("/users/", response_model=list[schemas.UserResponse])
-def read_users(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    users = crud.get_users(db, skip=skip, limit=limit)
+async def read_users(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    try:
+        after = decode_user_cursor(cursor) if cursor else None
+    except InvalidCursor as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    users = await crud_async.get_users(db, skip=skip, limit=limit, after=after)
+    next_cursor = next_user_cursor(users, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return users
@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel, EmailStr, Field
 from enum import Enum
 
@@ -60,6 +60,22 @@ class LocationType(BaseModel):
     address: Optional[str] = None
 
 
+class RecurrenceFrequency(str, Enum):
+    daily = "daily"
+    weekly = "weekly"
+    monthly = "monthly"
+
+
+class RecurrenceRule(BaseModel):
+    freq: RecurrenceFrequency
+    interval: int = Field(1, ge=1)
+    until: Optional[date] = None  # Inclusive last date
+    # Number of steps in the series; monthly steps that land on a missing
+    # day (e.g. the 31st) and exception dates still use up a step
+    count: Optional[int] = Field(None, ge=1)
+    exceptions: List[date] = []  # Occurrence dates that are skipped
+
+
 class EventBase(BaseModel):
     title: str
     start_date: date
@@ -70,6 +86,7 @@ class EventBase(BaseModel):
     endMinute: int
     description: Optional[str] = None
     location: Optional[LocationType] = None
+    recurrence: Optional[RecurrenceRule] = None
 
 
 class EventCreate(EventBase):
@@ -78,12 +95,120 @@ class EventCreate(EventBase):
 
 class EventUpdate(EventBase):
     participants: Optional[List[int]] = []  # List of user IDs
+    # Version the client last saw; the write is refused if it has moved on
+    version: Optional[int] = None
+
+
+class EventBatchUpdate(EventUpdate):
+    id: int
+
+
+class EventBatchRequest(BaseModel):
+    create: List[EventCreate] = []
+    update: List[EventBatchUpdate] = []
+
+
+class EventBatchDelete(BaseModel):
+    ids: List[int]
+
+
+class BatchOperation(str, Enum):
+    create = "create"
+    update = "update"
+    delete = "delete"
+
+
+class BatchItemStatus(str, Enum):
+    ok = "ok"
+    error = "error"
+    conflict = "conflict"  # The event was at another version (a 409 on its own)
+
+
+class EventBatchItemResult(BaseModel):
+    op: BatchOperation
+    index: int  # Position of the item in its request list
+    status: BatchItemStatus
+    id: Optional[int] = None
+    detail: Optional[str] = None
+
+
+class EventBatchResponse(BaseModel):
+    results: List[EventBatchItemResult]
+
+
+# --- Event Import Schemas ---
+class ImportFormat(str, Enum):
+    ics = "ics"
+    csv = "csv"
+
+
+class EventImportError(BaseModel):
+    line: int  # Line the row (or VEVENT) starts on
+    detail: str
+
+
+class EventImportSummary(BaseModel):
+    imported: int
+    skipped: int  # Blank rows, cancelled events, single-occurrence overrides
+    errored: int
+    errors: List[EventImportError]  # The first MAX_REPORTED_ERRORS of them
+    elapsed_seconds: float
+    rows_per_second: float
+
+
+class EventLayout(BaseModel):
+    lane: int  # 0-based column within the overlap cluster
+    lanes: int  # Columns in the cluster; width is 1/lanes
 
 
 class EventResponse(EventBase):
     id: int
+    version: int
+    # Set on occurrences of a recurring event, whose start_date is the
+    # occurrence date
+    series_start_date: Optional[date] = None
+    layout: Optional[EventLayout] = None  # Only with ?layout=true
     creator: UserResponse
     participants: List[UserResponse] = []
 
     class Config:
         from_attributes = True
+
+
+# --- Event Stats Schemas ---
+class StatsBucket(str, Enum):
+    day = "day"
+    month = "month"
+
+
+class EventStatsBucket(BaseModel):
+    date: date
+    counts: Dict[str, int]
+
+
+class EventStats(BaseModel):
+    total: int
+    by_type: Dict[str, int]
+    buckets: List[EventStatsBucket] = []
+
+
+# --- Free/Busy Schemas ---
+class TimeSlot(BaseModel):
+    start_minute: int
+    end_minute: int
+
+
+class FreeBusyDay(BaseModel):
+    date: date
+    free: List[TimeSlot]
+
+
+class FreeBusyResponse(BaseModel):
+    user_ids: List[int]
+    days: List[FreeBusyDay]
+
+
+class EventConflict(BaseModel):
+    user_id: int
+    date: date
+    busy: List[TimeSlot]
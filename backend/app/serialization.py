@@ -0,0 +1,115 @@
+"""Fast JSON for event listings.
+
+Returning ORM objects makes FastAPI validate every event through
+EventResponse (and the nested UserResponse/LocationType models) before
+encoding it. Stored events were validated on the way in, so listings build
+the EventResponse JSON shape straight from the loaded objects and encode it
+with orjson. Users are converted once per response however many events they
+appear in.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import orjson
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+
+from app.core.config import settings
+
+JSON_MEDIA_TYPE = "application/json"
+_LOCATION_KEYS = ("type", "platform", "link", "address")
+
+
+def user_dict(user) -> dict:
+    return {
+        "id": user.id,
+        "username": user.username,
+        "email": user.email,
+        "image": user.image,
+    }
+
+
+def event_dict(
+    event,
+    users: Dict[int, dict],
+    layout: Optional[Tuple[int, int]] = None,
+) -> dict:
+    """EventResponse-shaped dict; `users` memoizes user dicts by id."""
+    creator = users.get(event.creator_id)
+    if creator is None:
+        creator = users[event.creator_id] = user_dict(event.creator)
+    participants = []
+    for participant in event.participants:
+        data = users.get(participant.id)
+        if data is None:
+            data = users[participant.id] = user_dict(participant)
+        participants.append(data)
+    location = event.location
+    if location is not None:
+        location = {key: location.get(key) for key in _LOCATION_KEYS}
+    return {
+        "title": event.title,
+        "start_date": event.start_date,
+        "time": event.time,
+        "duration": event.duration,
+        "type": event.type,
+        "startMinute": event.startMinute,
+        "endMinute": event.endMinute,
+        "description": event.description,
+        "location": location,
+        "recurrence": event.recurrence,
+        "id": event.id,
+        "version": event.version,
+        "series_start_date": getattr(event, "series_start_date", None),
+        "layout": {"lane": layout[0], "lanes": layout[1]} if layout else None,
+        "creator": creator,
+        "participants": participants,
+    }
+
+
+def _dicts(events: Iterable, layouts: Optional[Dict[int, Tuple[int, int]]]):
+    users: Dict[int, dict] = {}
+    for event in events:
+        yield event_dict(event, users, layouts.get(event.id) if layouts else None)
+
+
+def dump_events(
+    events: Iterable, layouts: Optional[Dict[int, Tuple[int, int]]] = None
+) -> bytes:
+    return orjson.dumps(list(_dicts(events, layouts)))
+
+
+def iter_event_chunks(
+    events: Iterable,
+    layouts: Optional[Dict[int, Tuple[int, int]]] = None,
+    chunk_size: int = 200,
+) -> Iterator[bytes]:
+    """The same JSON array as dump_events, encoded and sent chunk_size events at a time."""
+    yield b"["
+    chunk: List[dict] = []
+    first = True
+    for data in _dicts(events, layouts):
+        chunk.append(data)
+        if len(chunk) == chunk_size:
+            yield (b"" if first else b",") + orjson.dumps(chunk)[1:-1]
+            chunk, first = [], False
+    if chunk:
+        yield (b"" if first else b",") + orjson.dumps(chunk)[1:-1]
+    yield b"]"
+
+
+def event_list_response(
+    events: List,
+    layouts: Optional[Dict[int, Tuple[int, int]]] = None,
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """Encoded listing; large ones stream as a chunked JSON array."""
+    if len(events) >= settings.EVENT_STREAM_MIN_ITEMS:
+        return StreamingResponse(
+            iter_event_chunks(events, layouts, settings.EVENT_STREAM_CHUNK_SIZE),
+            media_type=JSON_MEDIA_TYPE,
+            headers=headers,
+        )
+    return Response(
+        dump_events(events, layouts), media_type=JSON_MEDIA_TYPE, headers=headers
+    )
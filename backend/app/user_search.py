@@ -0,0 +1,104 @@
+"""Typeahead search over the user directory (GET /users/search).
+
+Matching is case-insensitive on username and email. Queries shorter than
+SUBSTRING_MIN_LENGTH match prefixes only: one or two characters occur inside
+most names and trigram indexes cannot serve them. Longer queries also match
+substrings. Results are ranked exact match, username prefix (by username),
+email prefix (by email), then substring (by username).
+
+Results are cached per query. A complete result (no branch of
+crud.search_users was cut off) holds every match of its query, and when the
+query grows ("ali", "alic", "alice") each longer query's matches are a subset
+of it, so typing on is answered by filtering the cached result instead of
+querying again.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+SUBSTRING_MIN_LENGTH = 3
+
+SearchResults = Tuple[dict, ...]
+
+# query -> (complete, results); results may exceed the cap, callers slice
+user_search_cache = TTLCache(
+    maxsize=settings.USER_SEARCH_CACHE_MAX_SIZE,
+    ttl=settings.USER_SEARCH_CACHE_TTL_SECONDS,
+)
+
+
+def normalize_query(q: str) -> str:
+    return q.strip().lower()
+
+
+def like_escape(query: str) -> str:
+    """The query as a literal LIKE pattern with "/" as the escape character."""
+    return query.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+def match_rank(query: str, username: str, email: str) -> Optional[int]:
+    """Rank of a user for a normalized query (lower is better), or None.
+
+    Also filters: crud.search_users only narrows the directory down to
+    candidates.
+    """
+    username, email = username.lower(), email.lower()
+    if query == username or query == email:
+        return 0
+    if username.startswith(query):
+        return 1
+    if email.startswith(query):
+        return 2
+    if len(query) >= SUBSTRING_MIN_LENGTH and (query in username or query in email):
+        return 3
+    return None
+
+
+def _ranked(query: str, users: Iterable[dict]) -> SearchResults:
+    ranked = {}
+    for user in users:
+        rank = match_rank(query, user["username"], user["email"])
+        if rank is not None:
+            order = (user["email"] if rank == 2 else user["username"]).lower()
+            ranked[user["id"]] = (rank, order, user["id"], user)
+    entries = sorted(ranked.values(), key=lambda entry: entry[:3])
+    return tuple(entry[3] for entry in entries)
+
+
+def _narrowed_from_prefix(query: str) -> Optional[SearchResults]:
+    # A prefix-only result is no superset of a substring search, so the
+    # shorter queries reused must be in the same mode as this one
+    shortest = SUBSTRING_MIN_LENGTH if len(query) >= SUBSTRING_MIN_LENGTH else 1
+    for length in range(len(query) - 1, shortest - 1, -1):
+        cached = user_search_cache.get(query[:length])
+        if cached is not None and cached[0]:
+            results = _ranked(query, cached[1])
+            user_search_cache.set(query, (True, results))
+            return results
+    return None
+
+
+def get_cached_results(query: str) -> Optional[SearchResults]:
+    """Results for a normalized query from the cache, or None on a miss."""
+    cached = user_search_cache.get(query)
+    if cached is not None:
+        return cached[1]
+    return _narrowed_from_prefix(query)
+
+
+def cache_results(query: str, rows: Iterable, complete: bool) -> SearchResults:
+    """Rank and cache what crud.search_users returned for a query."""
+    users: List[Dict] = [
+        {"id": row.id, "username": row.username, "email": row.email, "image": row.image}
+        for row in rows
+    ]
+    results = _ranked(query, users)
+    user_search_cache.set(query, (complete, results))
+    return results
+
+
+def invalidate_user_search() -> None:
+    """Forget all cached results, e.g. after a user was added."""
+    user_search_cache.clear()
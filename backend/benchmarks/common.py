@@ -0,0 +1,56 @@
+"""Helpers shared by the benchmark scripts.
+
+Benchmarks drive the real app in-process through httpx's ASGI transport.
+Unless DATABASE_URL is already set they run against a throwaway SQLite file.
+"""
+
+import os
+import statistics
+import tempfile
+from typing import Dict, List
+
+
+def configure_environment(db_name: str = "benchmark.db", keep: bool = False) -> str:
+    """Point the app at a benchmark database; must run before importing app.*
+
+    The SQLite file is recreated unless `keep` is set (to reuse a seeded one).
+    """
+    if not os.getenv("DATABASE_URL"):
+        path = os.path.join(tempfile.gettempdir(), db_name)
+        if os.path.exists(path) and not keep:
+            os.remove(path)
+        os.environ["DATABASE_URL"] = f"sqlite:///{path}"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    # Under load most statements cross the threshold; the log would drown the output
+    os.environ.setdefault("DB_SLOW_QUERY_MS", "0")
+    return os.environ["DATABASE_URL"]
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float], elapsed: float) -> Dict[str, float]:
+    """Latency percentiles in milliseconds plus throughput in requests/second."""
+    return {
+        "count": len(samples),
+        "mean_ms": statistics.fmean(samples) * 1000 if samples else 0.0,
+        "p50_ms": percentile(samples, 50) * 1000,
+        "p95_ms": percentile(samples, 95) * 1000,
+        "p99_ms": percentile(samples, 99) * 1000,
+        "rps": len(samples) / elapsed if elapsed else 0.0,
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    print(f"\n{title}")
+    print(f"{'':<24}{'count':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}")
+    for name, row in rows.items():
+        print(
+            f"{name:<24}{row['count']:>8}{row['p50_ms']:>10.1f}"
+            f"{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}{row['rps']:>10.1f}"
+        )
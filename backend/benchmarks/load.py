@@ -0,0 +1,302 @@
+"""Load harness for the main read and write paths.
+
+Drives app.main:app in-process (httpx's ASGI transport) against the database
+from benchmarks.seed, seeding it first when it is empty. Each scenario runs
+on its own with --concurrency requests in flight:
+
+- POST /token                 logins (bcrypt-bound)
+- GET /events/?date=          one day of a random user's calendar
+- GET /events/?limit=1000     a large listing for the busiest user
+- GET /events/ +attending     a week of events created or attended
+- GET /users/                 a page of the user directory
+- GET /users/search           guest-selection typeahead on random substrings
+- GET /events/search          full-text search of a random user's events
+- POST/PUT/DELETE /events/    creating, moving and deleting events
+
+p50/p95/p99 latency and throughput per scenario are printed and saved as
+JSON under benchmarks/results/, tagged with the git commit, database backend
+and dataset size. --compare diffs the run against the previous saved run on
+the same database and dataset (or against a given results file).
+
+    python -m benchmarks.load --compare
+    DATABASE_URL=postgresql://localhost/calendar_bench python -m benchmarks.load --reset --users 1000 --events 100000
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from benchmarks.common import print_table, summarize
+from benchmarks.seed import (
+    SEED_DAYS,
+    SEED_PASSWORD,
+    SEED_START,
+    reset_database,
+    seed_dataset,
+    seed_email,
+    user_count,
+)
+
+import httpx  # noqa: E402
+from sqlalchemy import func, select  # noqa: E402
+
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app, create_db_and_tables  # noqa: E402
+from app.models.models import DBEvent  # noqa: E402
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+async def run_scenario(
+    requests: int, concurrency: int, send: Callable[[int], Awaitable[httpx.Response]]
+) -> Dict:
+    samples: List[float] = []
+    statuses: Dict[str, int] = {}
+    numbers = iter(range(requests))
+
+    async def worker():
+        for number in numbers:
+            start = time.perf_counter()
+            response = await send(number)
+            samples.append(time.perf_counter() - start)
+            key = str(response.status_code)
+            statuses[key] = statuses.get(key, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return dict(summarize(samples, time.perf_counter() - started), statuses=statuses)
+
+
+async def run(args) -> Dict[str, Dict]:
+    rng = random.Random(args.seed)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+        async def login(index: int) -> httpx.Response:
+            return await client.post(
+                "/token", data={"username": seed_email(index), "password": SEED_PASSWORD}
+            )
+
+        # Tokens for a sample of users; user 0 owns the most events
+        sessions = [0] + rng.sample(range(1, args.users), min(args.sessions, args.users - 1))
+        headers = []
+        for index in sessions:
+            token = (await login(index)).json()["access_token"]
+            headers.append({"Authorization": f"Bearer {token}"})
+        busiest = headers[0]
+        last_day = SEED_START + timedelta(days=SEED_DAYS - 1)
+
+        def random_day() -> str:
+            return (SEED_START + timedelta(days=rng.randrange(SEED_DAYS))).isoformat()
+
+        def read_day(_):
+            return client.get(f"/events/?date={random_day()}", headers=rng.choice(headers))
+
+        def read_week_attending(_):
+            start = SEED_START + timedelta(days=rng.randrange(SEED_DAYS - 6))
+            params = {
+                "from": start.isoformat(),
+                "to": (start + timedelta(days=6)).isoformat(),
+                "include_participating": "true",
+            }
+            return client.get("/events/", params=params, headers=rng.choice(headers))
+
+        def read_large(_):
+            return client.get(
+                f"/events/?limit=1000&from={SEED_START}&to={last_day}", headers=busiest
+            )
+
+        def read_users(_):
+            return client.get(
+                f"/users/?limit=100&skip={rng.randrange(args.users)}",
+                headers=rng.choice(headers),
+            )
+
+        def search_users(_):
+            name = f"seed user {rng.randrange(args.users)}"
+            start = rng.randrange(len(name) - 2)
+            query = name[start:start + rng.randint(3, 8)]
+            return client.get("/users/search", params={"q": query}, headers=rng.choice(headers))
+
+        def search_events(_):
+            # Seeded titles are "Event <n>": a number is a selective prefix
+            query = str(rng.randrange(args.events))
+            return client.get("/events/search", params={"q": query}, headers=rng.choice(headers))
+
+        created: List[tuple] = []
+
+        async def create(number):
+            start = rng.randrange(7 * 60, 19 * 60, 30)
+            auth = rng.choice(headers)
+            body = {
+                "title": f"Load event {number}",
+                "start_date": random_day(),
+                "time": "load",
+                "duration": "60 minutes",
+                "type": "work",
+                "startMinute": start,
+                "endMinute": start + 60,
+                "participants": [],
+            }
+            response = await client.post("/events/", headers=auth, json=body)
+            if response.status_code == 200:
+                created.append((response.json()["id"], auth, body))
+            return response
+
+        def update(number):
+            event_id, auth, body = created[number % len(created)]
+            # Move the event to another day
+            return client.put(
+                f"/events/{event_id}", headers=auth, json=dict(body, start_date=random_day())
+            )
+
+        def delete(number):
+            event_id, auth, _ = created[number]
+            return client.delete(f"/events/{event_id}", headers=auth)
+
+        scenarios = [
+            ("POST /token", args.logins, lambda number: login(rng.randrange(args.users))),
+            ("GET /events/?date=", args.requests, read_day),
+            ("GET /events/?limit=1000", args.large_requests, read_large),
+            ("GET /events/ +attending", args.requests, read_week_attending),
+            ("GET /users/", args.requests, read_users),
+            ("GET /users/search", args.requests, search_users),
+            ("GET /events/search", args.requests, search_events),
+            ("POST /events/", args.writes, create),
+            ("PUT /events/{id}", args.writes, update),
+            ("DELETE /events/{id}", args.writes, delete),
+        ]
+        results = {}
+        for name, requests, send in scenarios:
+            if name.startswith("GET"):
+                await run_scenario(min(requests, 20), args.concurrency, send)  # Warm up
+            if name == "DELETE /events/{id}":
+                requests = min(requests, len(created))
+            results[name] = await run_scenario(requests, args.concurrency, send)
+    return results
+
+
+def save_results(path: str, run_info: Dict, results: Dict[str, Dict]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(dict(run_info, results=results), f, indent=2)
+
+
+def find_baseline(run_info: Dict, exclude: str) -> Optional[str]:
+    """The newest saved run on the same database backend and dataset."""
+    paths = sorted(glob.glob(os.path.join(RESULTS_DIR, "*.json")), reverse=True)
+    for path in paths:
+        if os.path.abspath(path) == os.path.abspath(exclude):
+            continue
+        with open(path) as f:
+            saved = json.load(f)
+        if all(saved.get(key) == run_info[key] for key in ("database", "dataset")):
+            return path
+    return None
+
+
+def print_comparison(baseline_path: str, results: Dict[str, Dict]) -> None:
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline.get('commit') or '?'} ({baseline_path})")
+    print(f"{'':<24}{'p50':>10}{'p95':>10}{'p99':>10}{'req/s':>10}")
+    for name, row in results.items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms", "rps"):
+            change = (row[key] - before[key]) / before[key] * 100 if before[key] else 0.0
+            cells.append(f"{change:>+9.1f}%")
+        print(f"{name:<24}{''.join(cells)}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200, help="users to seed")
+    parser.add_argument("--events", type=int, default=20000, help="events to seed")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reset", action="store_true", help="drop and reseed the database")
+    parser.add_argument("--requests", type=int, default=500, help="requests per read scenario")
+    parser.add_argument("--large-requests", type=int, default=50)
+    parser.add_argument("--logins", type=int, default=40)
+    parser.add_argument("--writes", type=int, default=200)
+    parser.add_argument("--sessions", type=int, default=20, help="users logged in for reads")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--output", help="results file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument(
+        "--compare",
+        nargs="?",
+        const="previous",
+        help="compare with a results file, or with the previous matching run",
+    )
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_database()
+    else:
+        create_db_and_tables()
+    with SessionLocal() as db:
+        if not user_count(db):
+            print(f"Seeding {args.users} users and {args.events} events...")
+            seed_dataset(db, args.users, args.events, args.seed)
+        args.users = user_count(db)
+        dataset = {
+            "users": args.users,
+            "events": db.scalar(select(func.count()).select_from(DBEvent)),
+        }
+
+    results = asyncio.run(run(args))
+
+    commit = _git("rev-parse", "--short", "HEAD")
+    run_info = {
+        "commit": commit,
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "database": engine.dialect.name,
+        "dataset": dataset,
+        "concurrency": args.concurrency,
+    }
+    print_table(
+        f"{run_info['database']}: {dataset['users']} users, {dataset['events']} events, "
+        f"concurrency {args.concurrency}",
+        results,
+    )
+    for name, row in results.items():
+        if set(row["statuses"]) - {"200"}:
+            print(f"{name} statuses: {row['statuses']}")
+
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+    path = args.output or os.path.join(RESULTS_DIR, f"{stamp}-{commit or 'nogit'}.json")
+    save_results(path, run_info, results)
+    print(f"\nSaved {path}")
+    if args.compare:
+        baseline = (
+            find_baseline(run_info, exclude=path)
+            if args.compare == "previous"
+            else args.compare
+        )
+        if baseline:
+            print_comparison(baseline, results)
+        else:
+            print("No earlier run on this database and dataset to compare with")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Mixed login + event-read benchmark.
+
+Fires bursts of /token logins while a steady stream of /events/?date= reads
+runs against the same app, and reports latency for both. With hashing on the
+bounded password executor the event reads should stay fast during a login
+burst, and logins beyond PASSWORD_HASH_MAX_PENDING should fail fast with 503.
+
+    python -m benchmarks.login_mixed --logins 200 --reads 400
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import configure_environment, print_table, summarize
+
+configure_environment("login_mixed.db")
+
+import httpx  # noqa: E402
+
+from app.main import app, create_db_and_tables  # noqa: E402
+
+PASSWORD = "benchmark-password"
+
+
+async def _timed(samples, statuses, coro):
+    start = time.perf_counter()
+    response = await coro
+    samples.append(time.perf_counter() - start)
+    statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+
+async def run(logins: int, reads: int, users: int) -> None:
+    create_db_and_tables()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for i in range(users):
+            await client.post(
+                "/register",
+                json={"username": f"user{i}", "email": f"user{i}@example.com", "password": PASSWORD},
+            )
+        token = (
+            await client.post("/token", data={"username": "user0@example.com", "password": PASSWORD})
+        ).json()["access_token"]
+        headers = {"Authorization": f"Bearer {token}"}
+        for minute in range(0, 600, 30):
+            await client.post(
+                "/events/",
+                headers=headers,
+                json={
+                    "title": f"Event {minute}",
+                    "start_date": "2030-01-01",
+                    "time": "09:00",
+                    "duration": "30m",
+                    "type": "work",
+                    "startMinute": minute,
+                    "endMinute": minute + 30,
+                },
+            )
+
+        login_samples, login_statuses = [], {}
+        read_samples, read_statuses = [], {}
+
+        async def login(i: int):
+            await _timed(
+                login_samples,
+                login_statuses,
+                client.post(
+                    "/token",
+                    data={"username": f"user{i % users}@example.com", "password": PASSWORD},
+                ),
+            )
+
+        async def read():
+            await _timed(
+                read_samples,
+                read_statuses,
+                client.get("/events/?date=2030-01-01", headers=headers),
+            )
+
+        started = time.perf_counter()
+        await asyncio.gather(*(login(i) for i in range(logins)), *(read() for _ in range(reads)))
+        elapsed = time.perf_counter() - started
+
+    print_table(
+        f"{logins} logins + {reads} event reads in {elapsed:.2f}s",
+        {"POST /token": summarize(login_samples, elapsed), "GET /events/?date=": summarize(read_samples, elapsed)},
+    )
+    print(f"\n/token statuses: {login_statuses}")
+    print(f"/events/ statuses: {read_statuses}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=100)
+    parser.add_argument("--reads", type=int, default=300)
+    parser.add_argument("--users", type=int, default=10)
+    args = parser.parse_args()
+    asyncio.run(run(args.logins, args.reads, args.users))
+
+
+if __name__ == "__main__":
+    main()
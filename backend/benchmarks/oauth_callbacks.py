@@ -0,0 +1,244 @@
+"""OAuth login benchmark against a local stand-in provider.
+
+A small Starlette app on a real local port plays GitHub (token endpoint,
+/user, /user/emails) and Google (OpenID metadata, JWKS, token endpoint
+issuing RS256 ID tokens), each call delayed by --provider-latency-ms. The
+app is pointed at it through the *_URL settings and driven in-process: every
+login is GET /auth/login/<provider> followed by the callback with the state
+(and nonce) from the redirect.
+
+While logins run, GET / is probed every 10 ms: its latency shows whether
+the callbacks keep the event loop free. The provider counts the calls and
+the TCP connections it served, to show pooling and metadata caching.
+
+With a latency L, a GitHub callback needs about 2L (token, then /user and
+/user/emails together) and a Google callback about L (the token request;
+metadata and keys are cached).
+
+    python -m benchmarks.oauth_callbacks --logins 200 --concurrency 20
+"""
+
+import argparse
+import asyncio
+import base64
+import os
+import socket
+import time
+from collections import Counter
+from urllib.parse import parse_qs, urlparse
+
+from benchmarks.common import configure_environment, print_table, summarize
+
+configure_environment("oauth_callbacks.db")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+PORT = _free_port()
+PROVIDER = f"http://127.0.0.1:{PORT}"
+CLIENT_ID = "benchmark-client"
+os.environ.update(
+    GITHUB_OAUTH_URL=f"{PROVIDER}/github",
+    GITHUB_API_URL=f"{PROVIDER}/github-api",
+    GOOGLE_OIDC_METADATA_URL=f"{PROVIDER}/google/.well-known/openid-configuration",
+    GITHUB_CLIENT_ID=CLIENT_ID,
+    GITHUB_CLIENT_SECRET="secret",
+    GOOGLE_CLIENT_ID=CLIENT_ID,
+    GOOGLE_CLIENT_SECRET="secret",
+)
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from jose import jwk, jwt  # noqa: E402
+from starlette.applications import Starlette  # noqa: E402
+from starlette.responses import JSONResponse  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from app.main import app, create_db_and_tables  # noqa: E402
+from app.oauth import close_http_client  # noqa: E402
+
+
+def build_provider(latency: float):
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+    # Parsed once: loading the PEM costs tens of milliseconds per token
+    signing_key = jwk.construct(private_pem, "RS256")
+    public_jwk = dict(jwk.construct(public_pem, "RS256").to_dict(), kid="bench")
+    public_jwk = {k: v.decode() if isinstance(v, bytes) else v for k, v in public_jwk.items()}
+    calls: Counter = Counter()
+    connections = set()
+
+    async def delayed(request):
+        calls[request.url.path] += 1
+        connections.add(request.client)
+        await asyncio.sleep(latency)
+
+    async def github_token(request):
+        await delayed(request)
+        form = await request.form()
+        return JSONResponse({"access_token": f"gho_{form['code']}", "token_type": "bearer"})
+
+    def github_login(request) -> str:
+        return request.headers["authorization"].split("gho_", 1)[1]
+
+    async def github_user(request):
+        await delayed(request)
+        login = github_login(request)
+        return JSONResponse({"id": abs(hash(login)) % 10**9, "login": login, "avatar_url": None})
+
+    async def github_emails(request):
+        await delayed(request)
+        email = f"{github_login(request)}@example.com"
+        return JSONResponse([{"email": email, "primary": True, "verified": True}])
+
+    async def google_metadata(request):
+        await delayed(request)
+        return JSONResponse(
+            {
+                "issuer": f"{PROVIDER}/google",
+                "authorization_endpoint": f"{PROVIDER}/google/authorize",
+                "token_endpoint": f"{PROVIDER}/google/token",
+                "jwks_uri": f"{PROVIDER}/google/jwks",
+                "id_token_signing_alg_values_supported": ["RS256"],
+            }
+        )
+
+    async def google_jwks(request):
+        await delayed(request)
+        return JSONResponse({"keys": [public_jwk]})
+
+    async def google_token(request):
+        await delayed(request)
+        form = await request.form()
+        # The benchmark packs the user and the nonce into the code
+        user, nonce = base64.urlsafe_b64decode(form["code"]).decode().split(":", 1)
+        now = int(time.time())
+        claims = {
+            "iss": f"{PROVIDER}/google",
+            "aud": CLIENT_ID,
+            "sub": user,
+            "email": f"{user}@example.com",
+            "name": user,
+            "nonce": nonce,
+            "iat": now,
+            "exp": now + 300,
+        }
+        id_token = jwt.encode(claims, signing_key, algorithm="RS256", headers={"kid": "bench"})
+        return JSONResponse(
+            {"access_token": "ya29", "token_type": "Bearer", "expires_in": 300, "id_token": id_token}
+        )
+
+    provider = Starlette(
+        routes=[
+            Route("/github/login/oauth/access_token", github_token, methods=["POST"]),
+            Route("/github-api/user", github_user),
+            Route("/github-api/user/emails", github_emails),
+            Route("/google/.well-known/openid-configuration", google_metadata),
+            Route("/google/jwks", google_jwks),
+            Route("/google/token", google_token, methods=["POST"]),
+        ]
+    )
+    return provider, calls, connections
+
+
+async def login(transport, provider: str, user: str) -> float:
+    """One full login; returns the callback's latency."""
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        response = await client.get(f"/auth/login/{provider}")
+        query = parse_qs(urlparse(response.headers["location"]).query)
+        state = query["state"][0]
+        if provider == "google":
+            code = base64.urlsafe_b64encode(f"{user}:{query['nonce'][0]}".encode()).decode()
+            callback = "/auth/google/callback"
+        else:
+            code, callback = user, "/auth/github/callback"
+        started = time.perf_counter()
+        response = await client.get(callback, params={"code": code, "state": state})
+        elapsed = time.perf_counter() - started
+        if response.status_code != 307 or "access_token=" not in response.headers["location"]:
+            raise RuntimeError(f"{provider} login failed: {response.status_code} {response.text}")
+        return elapsed
+
+
+async def run(args) -> None:
+    create_db_and_tables()
+    provider_app, calls, connections = build_provider(args.provider_latency_ms / 1000)
+    server = uvicorn.Server(
+        uvicorn.Config(provider_app, host="127.0.0.1", port=PORT, log_level="warning", lifespan="off")
+    )
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    transport = httpx.ASGITransport(app=app)
+    rows = {}
+    try:
+        for provider in ("github", "google"):
+            calls.clear()
+            connections.clear()
+            samples, probes = [], []
+            pending = iter(range(args.logins))
+            done = asyncio.Event()
+
+            async def worker():
+                for number in pending:
+                    # Half the logins are returning users (lookups), half new (inserts)
+                    samples.append(await login(transport, provider, f"{provider}{number % (args.logins // 2 or 1)}"))
+
+            async def probe():
+                async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                    while not done.is_set():
+                        started = time.perf_counter()
+                        await client.get("/")
+                        probes.append(time.perf_counter() - started)
+                        await asyncio.sleep(0.01)
+
+            probe_task = asyncio.create_task(probe())
+            started = time.perf_counter()
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - started
+            done.set()
+            await probe_task
+
+            rows[f"{provider} callback"] = summarize(samples, elapsed)
+            rows[f"GET / during {provider}"] = summarize(probes, elapsed)
+            print(
+                f"{provider}: {sum(calls.values())} provider calls, "
+                f"{len(connections)} TCP connections for {args.logins} logins: {dict(calls)}"
+            )
+    finally:
+        await close_http_client()
+        server.should_exit = True
+        await server_task
+
+    print_table(
+        f"{args.logins} logins per provider, concurrency {args.concurrency}, "
+        f"provider latency {args.provider_latency_ms:.0f} ms",
+        rows,
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--provider-latency-ms", type=float, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
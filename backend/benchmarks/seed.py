@@ -0,0 +1,184 @@
+"""Seed a benchmark database with users and events.
+
+Generates N users and M events through the app's models, deterministically
+for a given --seed. Event ownership is skewed (a few users own most events,
+user 0 the most), participant fan-out is mostly 0-3 with a tail of large
+meetings, days favour weekdays and a few events are weekly series. Every
+user's password is SEED_PASSWORD and emails are seed<i>@example.com.
+
+    python -m benchmarks.seed --users 1000 --events 100000
+    DATABASE_URL=postgresql://localhost/calendar_bench python -m benchmarks.seed --reset
+
+Without DATABASE_URL the data goes to a SQLite file in the temp directory,
+which benchmarks.load reuses. A database that already has users is left
+alone unless --reset is given (which drops and recreates every table).
+"""
+
+import argparse
+import random
+import time
+from datetime import date, timedelta
+from itertools import accumulate
+from typing import Dict, List
+
+from benchmarks.common import configure_environment
+
+configure_environment("load.db", keep=True)
+
+from sqlalchemy import func, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+import app.crud as crud  # noqa: E402
+import app.schemas as schemas  # noqa: E402
+from app.core.security import get_password_hash  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import create_db_and_tables  # noqa: E402
+from app.models.models import DBEvent, DBUser, event_participants  # noqa: E402
+from app.recurrence import series_end  # noqa: E402
+
+SEED_PASSWORD = "benchmark-password"
+SEED_START = date(2030, 1, 7)  # A Monday
+SEED_DAYS = 365
+BATCH_SIZE = 2000
+
+_EVENT_TYPES = [event_type.value for event_type in schemas.EventType]
+_DURATIONS = [30, 30, 60, 60, 60, 90, 120]
+
+
+def seed_email(index: int) -> str:
+    return f"seed{index}@example.com"
+
+
+def user_count(db: Session) -> int:
+    return db.scalar(select(func.count()).select_from(DBUser))
+
+
+def reset_database() -> None:
+    Base.metadata.drop_all(bind=engine)
+    create_db_and_tables()
+
+
+def _participant_count(rng: random.Random) -> int:
+    roll = rng.random()
+    if roll < 0.55:
+        return 0
+    if roll < 0.85:
+        return rng.randint(1, 3)
+    if roll < 0.97:
+        return rng.randint(4, 10)
+    return rng.randint(11, 40)  # Team meetings and all-hands
+
+
+def _event_day(rng: random.Random) -> date:
+    day = SEED_START + timedelta(days=rng.randrange(SEED_DAYS))
+    if day.weekday() >= 5 and rng.random() < 0.7:
+        day -= timedelta(days=day.weekday() - 4)  # Most weekend picks move to Friday
+    return day
+
+
+def _event_row(rng: random.Random, number: int, creator_id: int) -> dict:
+    start_date = _event_day(rng)
+    start = rng.randrange(7 * 60, 19 * 60, 30)
+    minutes = rng.choice(_DURATIONS)
+    row = {
+        "title": f"Event {number}",
+        "start_date": start_date,
+        "time": f"{start // 60:02d}:{start % 60:02d}",
+        "duration": f"{minutes} minutes",
+        "type": rng.choice(_EVENT_TYPES),
+        "startMinute": start,
+        "endMinute": start + minutes,
+        "description": "Seeded event" if rng.random() < 0.5 else None,
+        "location": (
+            {"type": "online", "platform": "Zoom", "link": "https://example.com/meet"}
+            if rng.random() < 0.3
+            else None
+        ),
+        "recurrence": None,
+        "recurrence_end": None,
+        "creator_id": creator_id,
+    }
+    if rng.random() < 0.04:
+        rule = schemas.RecurrenceRule(freq="weekly", count=rng.randint(5, 20))
+        row["recurrence"] = rule.model_dump(mode="json")
+        row["recurrence_end"] = series_end(start_date, rule)
+    return row
+
+
+def seed_dataset(db: Session, users: int, events: int, seed: int = 0) -> Dict[str, int]:
+    """Insert the users and events in batches; returns what was created."""
+    rng = random.Random(seed)
+    # One hash for everyone: bcrypt per user would dominate the seeding time
+    hashed_password = get_password_hash(SEED_PASSWORD)
+    user_ids: List[int] = []
+    for offset in range(0, users, BATCH_SIZE):
+        rows = [
+            {
+                "username": f"seed user {index}",
+                "email": seed_email(index),
+                "hashed_password": hashed_password,
+                "provider": "local",
+            }
+            for index in range(offset, min(offset + BATCH_SIZE, users))
+        ]
+        user_ids += db.scalars(
+            insert(DBUser).returning(DBUser.id, sort_by_parameter_order=True), rows
+        ).all()
+
+    # Zipf-like ownership: the user at rank k owns ~1/k**0.7 of the events
+    cum_weights = list(accumulate(1 / (rank + 1) ** 0.7 for rank in range(users)))
+    participants = 0
+    for offset in range(0, events, BATCH_SIZE):
+        size = min(BATCH_SIZE, events - offset)
+        creators = rng.choices(user_ids, cum_weights=cum_weights, k=size)
+        rows = [
+            _event_row(rng, offset + index, creator_id)
+            for index, creator_id in enumerate(creators)
+        ]
+        event_ids = db.scalars(
+            insert(DBEvent).returning(DBEvent.id, sort_by_parameter_order=True), rows
+        ).all()
+        links = []
+        for event_id, creator_id in zip(event_ids, creators):
+            # The creator is a participant of their own events, as in crud
+            attendees = {creator_id}
+            attendees.update(
+                rng.sample(user_ids, min(_participant_count(rng), len(user_ids)))
+            )
+            links += [{"event_id": event_id, "user_id": user_id} for user_id in attendees]
+        db.execute(insert(event_participants), links)
+        participants += len(links)
+    db.commit()
+    crud.rebuild_event_counts(db)
+    return {"users": users, "events": events, "participants": participants}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--events", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--reset", action="store_true", help="drop and recreate all tables first"
+    )
+    args = parser.parse_args()
+
+    if args.reset:
+        reset_database()
+    else:
+        create_db_and_tables()
+    with SessionLocal() as db:
+        if user_count(db):
+            parser.exit(1, "Database already has users; pass --reset to reseed it\n")
+        started = time.perf_counter()
+        created = seed_dataset(db, args.users, args.events, args.seed)
+    elapsed = time.perf_counter() - started
+    print(
+        f"Seeded {created['users']} users, {created['events']} events and "
+        f"{created['participants']} participant rows in {elapsed:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
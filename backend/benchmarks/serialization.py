@@ -0,0 +1,124 @@
+"""Event listing serialization micro-benchmark.
+
+Loads a listing through crud.get_events once, then times only turning it
+into JSON bytes:
+
+- pydantic: what read_events did before, i.e. FastAPI validating the ORM
+  objects through List[EventResponse] and dumping the result
+- orjson: app.serialization.dump_events (dicts from rows + orjson)
+- orjson chunked: the streamed variant, joined
+
+The outputs are checked to decode to the same JSON first.
+
+    python -m benchmarks.serialization --events 1000 --participants 3
+"""
+
+import argparse
+import json
+import time
+from datetime import date, timedelta
+from typing import List
+
+from benchmarks.common import configure_environment, print_table, summarize
+
+configure_environment("serialization.db")
+
+from pydantic import TypeAdapter  # noqa: E402
+
+import app.crud as crud  # noqa: E402
+import app.schemas as schemas  # noqa: E402
+from app.db.session import SessionLocal  # noqa: E402
+from app.main import create_db_and_tables  # noqa: E402
+from app.serialization import dump_events, iter_event_chunks  # noqa: E402
+
+
+def seed(events: int, participants: int) -> int:
+    with SessionLocal() as db:
+        users = [
+            crud.create_user(
+                db,
+                schemas.UserCreate(
+                    username=f"user{i}", email=f"user{i}@example.com", password="x"
+                ),
+            )
+            for i in range(participants + 1)
+        ]
+        start = date(2026, 1, 5)
+        crud.batch_events(
+            db,
+            creator_id=users[0].id,
+            create=[
+                schemas.EventCreate(
+                    title=f"Event {i}",
+                    start_date=start + timedelta(days=i % 2),
+                    time="09:00",
+                    duration="1h",
+                    type="work",
+                    startMinute=(i * 7) % 1380,
+                    endMinute=(i * 7) % 1380 + 60,
+                    description="Benchmark event",
+                    location={"type": "online", "platform": "Zoom", "link": "https://example.com"},
+                    participants=[user.id for user in users[1:]],
+                )
+                for i in range(events)
+            ],
+            update_items=[],
+        )
+        return users[0].id
+
+
+def _time(fn, rounds: int):
+    samples = []
+    started = time.perf_counter()
+    for _ in range(rounds):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return summarize(samples, time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000)
+    parser.add_argument("--participants", type=int, default=3)
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    create_db_and_tables()
+    creator_id = seed(args.events, args.participants)
+    with SessionLocal() as db:
+        events = crud.get_events(
+            db,
+            creator_id,
+            limit=args.events,
+            date_from=date(2026, 1, 5),
+            date_to=date(2026, 1, 6),
+        )
+
+    adapter = TypeAdapter(List[schemas.EventResponse])
+
+    def pydantic_path() -> bytes:
+        return adapter.dump_json(adapter.validate_python(events, from_attributes=True))
+
+    def orjson_path() -> bytes:
+        return dump_events(events)
+
+    def chunked_path() -> bytes:
+        return b"".join(iter_event_chunks(events))
+
+    expected = json.loads(pydantic_path())
+    assert json.loads(orjson_path()) == expected, "orjson output differs"
+    assert json.loads(chunked_path()) == expected, "chunked output differs"
+
+    print_table(
+        f"Serializing {len(events)} events x {args.rounds} rounds",
+        {
+            "pydantic": _time(pydantic_path, args.rounds),
+            "orjson": _time(orjson_path, args.rounds),
+            "orjson chunked": _time(chunked_path, args.rounds),
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
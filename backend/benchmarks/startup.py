@@ -0,0 +1,132 @@
+"""Cold-start benchmark: import time, time to first response and migrations.
+
+Every sample is a fresh Python process, as a newly forked or autoscaled
+worker would be:
+
+- import: `import app.main` inside the process
+- first response: spawning `uvicorn app.main:app` until GET / answers 200
+- migrations: `alembic upgrade head` on an empty database, then again on
+  the migrated one (the no-op every deploy pays)
+
+The medians are checked against budgets; the exit status is 1 when one is
+exceeded, so the script can gate CI.
+
+    python -m benchmarks.startup --runs 5 --import-budget-ms 1500
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+from typing import Callable, Dict, List, Optional
+
+from benchmarks.common import configure_environment
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def _run(args: List[str]) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        args, cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+    )
+
+
+def measure_import() -> float:
+    return float(_run([sys.executable, "-c", IMPORT_SNIPPET]).stdout.strip())
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def measure_first_response(timeout: float = 30.0) -> float:
+    port = _free_port()
+    started = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port)],
+        cwd=BACKEND_DIR,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"Server did not answer within {timeout}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def measure_migrations(database_path: Optional[str]) -> Dict[str, float]:
+    def upgrade() -> float:
+        started = time.perf_counter()
+        _run([sys.executable, "-m", "alembic", "upgrade", "head"])
+        return time.perf_counter() - started
+
+    if database_path and os.path.exists(database_path):
+        os.remove(database_path)
+    return {"migrate (empty db)": upgrade(), "migrate (up to date)": upgrade()}
+
+
+def _median_ms(measure: Callable[[], float], runs: int) -> Dict[str, float]:
+    samples = [measure() * 1000 for _ in range(runs)]
+    return {"runs": runs, "median_ms": statistics.median(samples), "max_ms": max(samples)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--startup-budget-ms", type=float, default=3000)
+    parser.add_argument("--skip-migrations", action="store_true")
+    args = parser.parse_args()
+
+    url = configure_environment("startup.db")
+    # SQLite files are recreated for the migration timings; other databases
+    # are only migrated, never dropped
+    database_path = url[len("sqlite:///"):] if url.startswith("sqlite:///") else None
+
+    rows = {}
+    if not args.skip_migrations:
+        for name, seconds in measure_migrations(database_path).items():
+            rows[name] = {"runs": 1, "median_ms": seconds * 1000, "max_ms": seconds * 1000}
+    rows["import app.main"] = _median_ms(measure_import, args.runs)
+    rows["first response"] = _median_ms(measure_first_response, args.runs)
+
+    budgets = {
+        "import app.main": args.import_budget_ms,
+        "first response": args.startup_budget_ms,
+    }
+    print(f"\n{'':<24}{'runs':>6}{'median ms':>12}{'max ms':>10}{'budget':>10}")
+    over = []
+    for name, row in rows.items():
+        budget = budgets.get(name)
+        if budget is not None and row["median_ms"] > budget:
+            over.append(name)
+        print(
+            f"{name:<24}{row['runs']:>6}{row['median_ms']:>12.1f}{row['max_ms']:>10.1f}"
+            f"{'' if budget is None else f'{budget:.0f}':>10}"
+            f"{'  OVER BUDGET' if name in over else ''}"
+        )
+    if over:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
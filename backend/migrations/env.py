@@ -0,0 +1,75 @@
+from logging.config import fileConfig
+
+from alembic import context
+from sqlalchemy import create_engine, text
+
+from app.core.config import settings
+from app.db.base import Base
+from app.event_search import FTS_TABLE, SEARCH_VECTOR_COLUMN, SEARCH_VECTOR_INDEX
+import app.models.models  # noqa: F401  (registers the tables on Base.metadata)
+
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+target_metadata = Base.metadata
+
+# pg_advisory_xact_lock key: containers starting together run the upgrade
+# one after another instead of racing on the DDL
+MIGRATION_LOCK_KEY = 4_815_162_342
+
+
+def include_object(obj, name, type_, reflected, compare_to) -> bool:
+    """Leave out the full-text search objects, which are not in the models."""
+    if type_ == "table" and name.startswith(FTS_TABLE):
+        return False
+    if type_ == "column" and name == SEARCH_VECTOR_COLUMN:
+        return False
+    if type_ == "index" and name == SEARCH_VECTOR_INDEX:
+        return False
+    return True
+
+
+def database_url() -> str:
+    url = settings.SQLALCHEMY_DATABASE_URL
+    if url and url.startswith("postgres://"):
+        url = url.replace("postgres://", "postgresql://", 1)
+    return url
+
+
+def run_migrations_offline() -> None:
+    context.configure(
+        url=database_url(),
+        target_metadata=target_metadata,
+        include_object=include_object,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+def run_migrations_online() -> None:
+    engine = create_engine(database_url())
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+            # SQLite can only alter tables by copying them
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            if connection.dialect.name == "postgresql":
+                connection.execute(
+                    text("SELECT pg_advisory_xact_lock(:key)"),
+                    {"key": MIGRATION_LOCK_KEY},
+                )
+            context.run_migrations()
+    engine.dispose()
+
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
@@ -0,0 +1,34 @@
+"""Schema checks for revisions that must also run on databases created by
+the app's old startup create_all(), which may already have any of the
+tables, columns and indexes a revision adds.
+
+In offline mode (`alembic upgrade head --sql`) there is no database to
+inspect, so nothing is reported as existing and the full DDL is emitted.
+"""
+
+import sqlalchemy as sa
+from alembic import context, op
+from sqlalchemy.dialects import postgresql
+
+# Column type of the JSON columns (app.models.models.JSONBType)
+JSON_TYPE = sa.String().with_variant(postgresql.JSONB(), "postgresql")
+
+
+def has_table(table: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    return sa.inspect(op.get_bind()).has_table(table)
+
+
+def has_column(table: str, column: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    columns = sa.inspect(op.get_bind()).get_columns(table)
+    return any(existing["name"] == column for existing in columns)
+
+
+def has_index(table: str, index: str) -> bool:
+    if context.is_offline_mode():
+        return False
+    indexes = sa.inspect(op.get_bind()).get_indexes(table)
+    return any(existing["name"] == index for existing in indexes)
@@ -0,0 +1,73 @@
+"""Initial schema: users, events and event participants
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import JSON_TYPE, has_table
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if has_table("users"):
+        # Created by the old startup create_all(); later revisions fill the gaps
+        return
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("email", sa.String(), nullable=True),
+        sa.Column("hashed_password", sa.String(), nullable=True),
+        sa.Column("image", sa.String(), nullable=True),
+        sa.Column("google_id", sa.String(), nullable=True),
+        sa.Column("github_id", sa.String(), nullable=True),
+        sa.Column("provider", sa.String(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("google_id"),
+        sa.UniqueConstraint("github_id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "events",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("time", sa.String(), nullable=True),
+        sa.Column("duration", sa.String(), nullable=True),
+        sa.Column("type", sa.String(), nullable=True),
+        sa.Column("startMinute", sa.Integer(), nullable=True),
+        sa.Column("endMinute", sa.Integer(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("location", JSON_TYPE, nullable=True),
+        sa.Column("creator_id", sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(["creator_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_events_id", "events", ["id"])
+    op.create_index("ix_events_title", "events", ["title"])
+
+    op.create_table(
+        "event_participants",
+        sa.Column("event_id", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["event_id"], ["events.id"]),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("event_id", "user_id"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("event_participants")
+    op.drop_table("events")
+    op.drop_table("users")
@@ -0,0 +1,28 @@
+"""Index events by (creator_id, start_date, startMinute) for date-range listings
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+from migrations.helpers import has_index
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_index("events", "ix_events_creator_start"):
+        op.create_index(
+            "ix_events_creator_start",
+            "events",
+            ["creator_id", "start_date", "startMinute"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_creator_start", table_name="events")
@@ -0,0 +1,43 @@
+"""Per-user event counts by day and type, backfilled from events
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import has_table
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_table("event_counts"):
+        op.create_table(
+            "event_counts",
+            sa.Column("user_id", sa.Integer(), nullable=False),
+            sa.Column("start_date", sa.Date(), nullable=False),
+            sa.Column("type", sa.String(), nullable=False),
+            sa.Column("count", sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+            sa.PrimaryKeyConstraint("user_id", "start_date", "type"),
+        )
+    # Same rule as the old startup backfill: only an empty table is filled
+    op.execute(
+        """
+        INSERT INTO event_counts (user_id, start_date, type, count)
+        SELECT creator_id, start_date, type, count(*)
+        FROM events
+        WHERE NOT EXISTS (SELECT 1 FROM event_counts)
+        GROUP BY creator_id, start_date, type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("event_counts")
@@ -0,0 +1,24 @@
+"""Index users by (username, id) for keyset pagination
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+from migrations.helpers import has_index
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_index("users", "ix_users_username_id"):
+        op.create_index("ix_users_username_id", "users", ["username", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_username_id", table_name="users")
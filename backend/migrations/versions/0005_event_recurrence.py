@@ -0,0 +1,38 @@
+"""Recurrence rule and series end on events
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import JSON_TYPE, has_column, has_index
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_column("events", "recurrence"):
+        op.add_column("events", sa.Column("recurrence", JSON_TYPE, nullable=True))
+    if not has_column("events", "recurrence_end"):
+        op.add_column("events", sa.Column("recurrence_end", sa.Date(), nullable=True))
+    if not has_index("events", "ix_events_creator_recurring"):
+        op.create_index(
+            "ix_events_creator_recurring",
+            "events",
+            ["creator_id", "recurrence_end"],
+            postgresql_where=sa.text("recurrence IS NOT NULL"),
+            sqlite_where=sa.text("recurrence IS NOT NULL"),
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_events_creator_recurring", table_name="events")
+    with op.batch_alter_table("events") as batch:
+        batch.drop_column("recurrence_end")
+        batch.drop_column("recurrence")
@@ -0,0 +1,29 @@
+"""Per-user events_version counter behind the event listing ETags
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import has_column
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_column("users", "events_version"):
+        op.add_column(
+            "users",
+            sa.Column("events_version", sa.Integer(), nullable=False, server_default="0"),
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("users") as batch:
+        batch.drop_column("events_version")
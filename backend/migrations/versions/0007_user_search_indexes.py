@@ -0,0 +1,52 @@
+"""Prefix and trigram indexes for the user directory search
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+# name -> (Postgres columns, SQLite columns, index method); None: not created
+INDEXES = {
+    "ix_users_username_lower": (
+        ['lower(username) COLLATE "C"', "id"], ["lower(username)"], "btree"
+    ),
+    "ix_users_email_lower": (['lower(email) COLLATE "C"', "id"], ["lower(email)"], "btree"),
+    "ix_users_username_trgm": (["lower(username) gin_trgm_ops"], None, "gin"),
+    "ix_users_email_trgm": (["lower(email) gin_trgm_ops"], None, "gin"),
+}
+
+
+def _columns(columns):
+    # Expressions as text, plain column names as they are
+    return [sa.text(column) if "(" in column else column for column in columns]
+
+
+def upgrade() -> None:
+    # Expression indexes are not reflected on SQLite, so existence is left to
+    # IF NOT EXISTS rather than migrations.helpers.has_index
+    dialect = op.get_context().dialect.name
+    if dialect == "postgresql":
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, (postgres, sqlite, method) in INDEXES.items():
+        columns = postgres if dialect == "postgresql" else sqlite
+        if columns is None:
+            continue
+        op.create_index(
+            name, "users", _columns(columns), postgresql_using=method, if_not_exists=True
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+    for name, (postgres, sqlite, _) in INDEXES.items():
+        if (postgres if dialect == "postgresql" else sqlite) is not None:
+            op.drop_index(name, table_name="users", if_exists=True)
+    # pg_trgm is left installed: other objects may depend on it
@@ -0,0 +1,85 @@
+"""Full-text event search: tsvector column on Postgres, FTS5 on SQLite
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18
+
+A copy of app.event_search's DDL as of this revision. On SQLite, any later
+revision that rebuilds the events table (batch "move and copy") drops the
+triggers and must recreate them.
+"""
+
+from alembic import op
+
+from migrations.helpers import has_column, has_table
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+PG_LOCATION = "coalesce(location->>'platform', '') || ' ' || coalesce(location->>'address', '')"
+
+
+def sqlite_values(row: str) -> str:
+    location = (
+        f"coalesce(json_extract({row}.location, '$.platform'), '') || ' ' || "
+        f"coalesce(json_extract({row}.location, '$.address'), '')"
+    )
+    return f"{row}.id, coalesce({row}.title, ''), coalesce({row}.description, ''), {location}"
+
+
+def upgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        if not has_column("events", "search_vector"):
+            # Rewrites the table once, computing the vector of every event
+            op.execute(
+                "ALTER TABLE events ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+                "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+                "setweight(to_tsvector('simple', coalesce(description, '')), 'B') || "
+                f"setweight(to_tsvector('simple', {PG_LOCATION}), 'C')"
+                ") STORED"
+            )
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_events_search_vector "
+            "ON events USING gin (search_vector)"
+        )
+        return
+
+    if not has_table("events_fts"):
+        op.execute(
+            "CREATE VIRTUAL TABLE events_fts USING fts5("
+            "title, description, location, content='', tokenize='unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO events_fts(rowid, title, description, location) "
+            f"SELECT {sqlite_values('events')} FROM events"
+        )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS events_fts_insert AFTER INSERT ON events BEGIN "
+        "INSERT INTO events_fts(rowid, title, description, location) "
+        f"VALUES ({sqlite_values('new')}); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS events_fts_delete AFTER DELETE ON events BEGIN "
+        "INSERT INTO events_fts(events_fts, rowid, title, description, location) "
+        f"VALUES ('delete', {sqlite_values('old')}); END"
+    )
+    op.execute(
+        "CREATE TRIGGER IF NOT EXISTS events_fts_update "
+        "AFTER UPDATE OF title, description, location ON events BEGIN "
+        "INSERT INTO events_fts(events_fts, rowid, title, description, location) "
+        f"VALUES ('delete', {sqlite_values('old')}); "
+        "INSERT INTO events_fts(rowid, title, description, location) "
+        f"VALUES ({sqlite_values('new')}); END"
+    )
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP INDEX IF EXISTS ix_events_search_vector")
+        op.execute("ALTER TABLE events DROP COLUMN IF EXISTS search_vector")
+        return
+    for trigger in ("events_fts_insert", "events_fts_delete", "events_fts_update"):
+        op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    op.execute("DROP TABLE IF EXISTS events_fts")
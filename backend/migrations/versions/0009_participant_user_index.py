@@ -0,0 +1,28 @@
+"""Index event_participants by (user_id, event_id)
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+
+from migrations.helpers import has_index
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_index("event_participants", "ix_event_participants_user_event"):
+        op.create_index(
+            "ix_event_participants_user_event",
+            "event_participants",
+            ["user_id", "event_id"],
+        )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_event_participants_user_event", table_name="event_participants")
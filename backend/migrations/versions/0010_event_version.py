@@ -0,0 +1,30 @@
+"""Per-event version column for conditional writes and If-Match
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from migrations.helpers import has_column
+
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if not has_column("events", "version"):
+        op.add_column(
+            "events",
+            sa.Column("version", sa.Integer(), nullable=False, server_default="1"),
+        )
+
+
+def downgrade() -> None:
+    # A plain DROP COLUMN (SQLite 3.35+), not a batch rebuild of events,
+    # which would drop the full-text search triggers of 0008
+    op.drop_column("events", "version")
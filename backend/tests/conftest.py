@@ -0,0 +1,40 @@
+import os
+import tempfile
+
+# Settings are read at import time; point the app at a throwaway database
+_db_dir = tempfile.mkdtemp()
+os.environ.setdefault("SECRET_KEY", "test-secret")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.db.session import engine
+from app.main import app
+from app.models.models import Base
+
+
+@pytest.fixture(scope="session")
+def client():
+    Base.metadata.create_all(engine)
+    with TestClient(app) as client:
+        yield client
+    Base.metadata.drop_all(engine)
+
+
+@pytest.fixture(scope="session")
+def register(client):
+    """Create users; each call returns the new user's id and auth headers."""
+    password = "password123"
+
+    def register(name: str) -> dict:
+        email = f"{name}@example.com"
+        user = client.post(
+            "/register", json={"username": name, "email": email, "password": password}
+        ).json()
+        token = client.post(
+            "/token", data={"username": email, "password": password}
+        ).json()["access_token"]
+        return {"id": user["id"], "headers": {"Authorization": f"Bearer {token}"}}
+
+    return register
@@ -0,0 +1,61 @@
+import itertools
+
+import pytest
+
+_names = itertools.count()
+
+
+def _event(**fields) -> dict:
+    return dict(
+        {
+            "title": "Standup",
+            "start_date": "2026-11-09",
+            "time": "09:00 - 09:15",
+            "duration": "15 minutes",
+            "type": "work",
+            "startMinute": 540,
+            "endMinute": 555,
+        },
+        **fields,
+    )
+
+
+@pytest.fixture
+def owner(register):
+    return register(f"batcher{next(_names)}")
+
+
+def _batch_update(client, owner, *items) -> list:
+    response = client.post(
+        "/events/batch", json={"update": list(items)}, headers=owner["headers"]
+    )
+    assert response.status_code == 200
+    return response.json()["results"]
+
+
+def test_batch_update_bumps_version_once(client, owner):
+    event = client.post("/events/", json=_event(), headers=owner["headers"]).json()
+    [result] = _batch_update(
+        client, owner, _event(id=event["id"], version=event["version"], title="Sync")
+    )
+    assert result["status"] == "ok"
+    stored = client.get(f"/events/{event['id']}", headers=owner["headers"]).json()
+    assert stored["title"] == "Sync"
+    assert stored["version"] == event["version"] + 1
+
+
+def test_batch_update_with_stale_version_conflicts(client, owner):
+    stale = client.post("/events/", json=_event(), headers=owner["headers"]).json()
+    other = client.post("/events/", json=_event(), headers=owner["headers"]).json()
+    _batch_update(client, owner, _event(id=stale["id"], title="First write"))
+
+    results = _batch_update(
+        client,
+        owner,
+        _event(id=stale["id"], version=stale["version"], title="Lost update"),
+        _event(id=other["id"], title="Applied"),
+    )
+    assert [r["status"] for r in results] == ["conflict", "ok"]
+    assert results[0]["detail"].endswith(f"version {stale['version'] + 1}")
+    stored = client.get(f"/events/{stale['id']}", headers=owner["headers"]).json()
+    assert stored["title"] == "First write"
@@ -0,0 +1,127 @@
+import itertools
+
+import pytest
+
+_names = itertools.count()
+
+
+def _event(**fields) -> dict:
+    return {
+        "title": "Dentist",
+        "start_date": "2026-11-12",
+        "time": "14:00 - 14:30",
+        "duration": "30 minutes",
+        "type": "personal",
+        "startMinute": 840,
+        "endMinute": 870,
+        **fields,
+    }
+
+
+@pytest.fixture
+def owner(register):
+    return register(f"etag{next(_names)}")
+
+
+def _create(client, owner, **fields):
+    response = client.post("/events/", json=_event(**fields), headers=owner["headers"])
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_listing_revalidates_until_a_write(client, register, owner):
+    guest = register(f"etag_guest{next(_names)}")
+    _create(client, owner)
+    first = client.get("/events/", headers=owner["headers"])
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "private, no-cache"
+
+    revalidated = client.get(
+        "/events/", headers={**owner["headers"], "If-None-Match": etag}
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["ETag"] == etag
+    assert revalidated.content == b""
+
+    # Another view of the same version has its own validator
+    other_view = client.get(
+        "/events/",
+        params={"date": "2026-11-12"},
+        headers={**owner["headers"], "If-None-Match": etag},
+    )
+    assert other_view.status_code == 200
+
+    # A write bumps events_version for the creator and every participant
+    guest_etag = client.get("/events/", headers=guest["headers"]).headers["ETag"]
+    _create(client, owner, title="Checkup", participants=[guest["id"]])
+    fresh = client.get("/events/", headers={**owner["headers"], "If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert len(fresh.json()) == 2
+    guest_listing = client.get(
+        "/events/", headers={**guest["headers"], "If-None-Match": guest_etag}
+    )
+    assert guest_listing.status_code == 200
+
+
+def test_put_with_if_match(client, owner):
+    event = _create(client, owner)
+    etag = client.get(f"/events/{event['id']}").headers["ETag"]
+    assert etag == f'"event-{event["id"]}-{event["version"]}"'
+
+    updated = client.put(
+        f"/events/{event['id']}",
+        json=_event(title="Moved"),
+        headers={**owner["headers"], "If-Match": etag},
+    )
+    assert updated.status_code == 200
+    assert updated.json()["version"] == event["version"] + 1
+    new_etag = updated.headers["ETag"]
+
+    stale = client.put(
+        f"/events/{event['id']}",
+        json=_event(title="Lost update"),
+        headers={**owner["headers"], "If-Match": etag},
+    )
+    assert stale.status_code == 412
+    assert stale.headers["ETag"] == new_etag
+    # Weak tags never satisfy If-Match
+    weak = client.put(
+        f"/events/{event['id']}",
+        json=_event(title="Lost update"),
+        headers={**owner["headers"], "If-Match": f"W/{new_etag}"},
+    )
+    assert weak.status_code == 412
+    assert client.get(f"/events/{event['id']}").json()["title"] == "Moved"
+
+
+def test_put_with_stale_body_version(client, owner):
+    event = _create(client, owner)
+    client.put(f"/events/{event['id']}", json=_event(), headers=owner["headers"])
+
+    stale = client.put(
+        f"/events/{event['id']}",
+        json=_event(title="Lost update", version=event["version"]),
+        headers=owner["headers"],
+    )
+    assert stale.status_code == 409
+    assert stale.json()["detail"].endswith(f"version {event['version'] + 1}")
+
+
+def test_delete_with_if_match(client, owner):
+    event = _create(client, owner)
+    client.put(f"/events/{event['id']}", json=_event(), headers=owner["headers"])
+    stale_etag = f'"event-{event["id"]}-{event["version"]}"'
+
+    refused = client.delete(
+        f"/events/{event['id']}", headers={**owner["headers"], "If-Match": stale_etag}
+    )
+    assert refused.status_code == 412
+
+    current_etag = refused.headers["ETag"]
+    deleted = client.delete(
+        f"/events/{event['id']}",
+        headers={**owner["headers"], "If-Match": current_etag},
+    )
+    assert deleted.status_code == 200
+    assert client.get(f"/events/{event['id']}").status_code == 404
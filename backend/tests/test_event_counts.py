@@ -0,0 +1,81 @@
+import app.crud as crud
+from app.db.session import SessionLocal
+
+
+def _event(start_date: str, event_type: str = "work", **fields) -> dict:
+    return {
+        "title": "Counted",
+        "start_date": start_date,
+        "time": "",
+        "duration": "60 minutes",
+        "type": event_type,
+        "startMinute": 600,
+        "endMinute": 660,
+        **fields,
+    }
+
+
+def test_counters_match_a_rebuild_after_mixed_writes(client, register):
+    user = register("counted")
+    headers = user["headers"]
+
+    def create(*args, **fields) -> int:
+        event = _event(*args, **fields)
+        return client.post("/events/", json=event, headers=headers).json()["id"]
+
+    kept = create("2026-11-02")
+    moved = create("2026-11-02", "personal")
+    removed = create("2026-11-03")
+    # Moves to another day and type: one counter down, another up
+    client.put(f"/events/{moved}", json=_event("2026-12-01", "work"), headers=headers)
+    client.delete(f"/events/{removed}", headers=headers)
+
+    batch = client.post(
+        "/events/batch",
+        json={
+            "create": [_event("2026-11-02"), _event("2026-11-04", "social")],
+            "update": [
+                dict(_event("2026-11-05", "personal"), id=kept),
+                dict(_event("2026-11-06"), id=moved, version=1),  # Stale: skipped
+            ],
+        },
+        headers=headers,
+    ).json()["results"]
+    batch_delete = [r["id"] for r in batch if r["op"] == "create"][:1]
+    client.post("/events/batch/delete", json={"ids": batch_delete}, headers=headers)
+
+    calendar = "\r\n".join(
+        [
+            "BEGIN:VCALENDAR",
+            *(
+                line
+                for day in ("20261102", "20261102", "20261201")
+                for line in (
+                    "BEGIN:VEVENT",
+                    f"DTSTART:{day}T090000",
+                    f"DTEND:{day}T100000",
+                    "SUMMARY:Imported",
+                    "END:VEVENT",
+                )
+            ),
+            "END:VCALENDAR",
+        ]
+    )
+    client.post(
+        "/events/import",
+        files={"file": ("calendar.ics", calendar.encode(), "text/calendar")},
+        headers=headers,
+    )
+
+    def stats() -> dict:
+        response = client.get(
+            "/events/stats", params={"bucket": "day"}, headers=headers
+        )
+        assert response.status_code == 200
+        return response.json()
+
+    maintained = stats()
+    assert maintained["total"] == 6
+    with SessionLocal() as db:
+        crud.rebuild_event_counts(db)
+    assert stats() == maintained
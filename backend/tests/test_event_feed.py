@@ -0,0 +1,59 @@
+import asyncio
+
+from app.event_feed import Broadcaster, MemoryBackend, PostgresNotifyBackend
+
+
+class FakeConnection:
+    def __init__(self):
+        self.listeners = []
+
+    def add_termination_listener(self, callback):
+        self.listeners.append(callback)
+
+    def drop(self):
+        for callback in self.listeners:
+            callback(self)
+
+    async def close(self):
+        pass
+
+
+def test_postgres_backend_reconnects_and_resyncs(monkeypatch):
+    backend = PostgresNotifyBackend("postgresql://localhost/calendar")
+    backend.RECONNECT_DELAYS = (0,)
+    attempts = []
+
+    async def connect():
+        attempts.append(len(attempts))
+        if len(attempts) == 2:  # The first reconnect attempt fails
+            raise OSError("connection refused")
+        backend._connection = FakeConnection()
+        backend._connection.add_termination_listener(backend._on_terminated)
+
+    monkeypatch.setattr(backend, "_connect", connect)
+    resyncs = []
+
+    async def scenario():
+        await backend.start(lambda payload: None, lambda: resyncs.append(True))
+        backend._connection.drop()
+        for _ in range(20):
+            await asyncio.sleep(0)
+        await backend.stop()
+
+    asyncio.run(scenario())
+    assert len(attempts) == 3
+    assert backend.reconnects == 1
+    assert resyncs == [True]
+
+
+def test_resync_all_reaches_every_stream():
+    broadcaster = Broadcaster(MemoryBackend(), queue_size=2)
+
+    async def scenario():
+        await broadcaster.start()
+        async with broadcaster.subscribe(1) as first:
+            async with broadcaster.subscribe(2) as second:
+                broadcaster.resync_all()
+                return first.get_nowait(), second.get_nowait()
+
+    assert asyncio.run(scenario()) == ({"type": "resync"}, {"type": "resync"})
@@ -0,0 +1,52 @@
+import re
+
+from app.ical import iter_vevents
+
+DATE_TIME = re.compile(r"^\d{8}T\d{6}$")
+
+
+def test_exported_until_matches_dtstart_value_type(client, register):
+    user = register("exporter")
+    event = {
+        "title": "Weekly review",
+        "start_date": "2026-11-06",
+        "time": "16:00 - 17:00",
+        "duration": "60 minutes",
+        "type": "work",
+        "startMinute": 960,
+        "endMinute": 1020,
+        "recurrence": {
+            "freq": "weekly",
+            "until": "2026-12-25",
+            "exceptions": ["2026-11-20"],
+        },
+    }
+    client.post("/events/", json=event, headers=user["headers"])
+
+    response = client.get("/events/export.ics", headers=user["headers"])
+    assert response.status_code == 200
+    [(_, props, error)] = list(iter_vevents(response.text.splitlines()))
+    assert error is None
+
+    [(_, dtstart)] = props["DTSTART"]
+    [(_, rrule)] = props["RRULE"]
+    [(_, exdate)] = props["EXDATE"]
+    rule = dict(part.split("=", 1) for part in rrule.split(";"))
+    assert dtstart == "20261106T160000"
+    assert rule == {"FREQ": "WEEKLY", "UNTIL": "20261225T235959"}
+    assert exdate == "20261120T160000"
+    assert all(DATE_TIME.match(value) for value in (dtstart, rule["UNTIL"], exdate))
+
+    # ...and it imports back to the same rule
+    other = register("reimporter")
+    response = client.post(
+        "/events/import",
+        files={"file": ("calendar.ics", response.content, "text/calendar")},
+        headers=other["headers"],
+    )
+    assert response.json()["imported"] == 1
+    [imported] = client.get(
+        "/events/", params={"to": "2026-11-06"}, headers=other["headers"]
+    ).json()
+    assert imported["recurrence"]["until"] == "2026-12-25"
+    assert imported["recurrence"]["exceptions"] == ["2026-11-20"]
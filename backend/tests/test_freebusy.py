@@ -0,0 +1,18 @@
+def test_freebusy_rejects_empty_day_window(client, register):
+    user = register("freebusy_window")
+    params = {
+        "user_ids": user["id"],
+        "from": "2026-11-02",
+        "to": "2026-11-03",
+        "day_start": 600,
+        "day_end": 600,
+    }
+    response = client.get("/freebusy", params=params, headers=user["headers"])
+    assert response.status_code == 400
+
+    params["day_end"] = 720
+    response = client.get("/freebusy", params=params, headers=user["headers"])
+    assert response.status_code == 200
+    assert response.json()["days"][0]["free"] == [
+        {"start_minute": 600, "end_minute": 720}
+    ]
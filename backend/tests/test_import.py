@@ -0,0 +1,76 @@
+from app.core.config import settings
+
+CALENDAR = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+DTSTART:20261102T090000
+DTEND:20261102T100000
+SUMMARY:Good
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:20261103T090000
+this line has no colon
+SUMMARY:Broken
+END:VEVENT
+BEGIN:VEVENT
+DTSTART:20261104T090000
+SUMMARY:Also good
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def _upload(client, user, content: str):
+    return client.post(
+        "/events/import",
+        files={"file": ("calendar.ics", content.encode(), "text/calendar")},
+        headers=user["headers"],
+    )
+
+
+def test_malformed_line_fails_only_its_event(client, register):
+    user = register("importer")
+    response = _upload(client, user, CALENDAR)
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["imported"] == 2
+    assert summary["errored"] == 1
+    assert summary["errors"][0]["line"] == 8
+    assert "Line 10" in summary["errors"][0]["detail"]
+
+
+def test_upload_size_limit(client, register, monkeypatch):
+    user = register("big_importer")
+    monkeypatch.setattr(settings, "EVENT_IMPORT_MAX_BYTES", 100)
+    assert _upload(client, user, CALENDAR).status_code == 413
+
+
+def test_oversized_csv_field_fails_only_its_row(client, register):
+    user = register("csv_importer")
+    header = "title,start_date,startMinute,endMinute,type,description"
+    rows = [
+        header,
+        "Huge,2026-11-02,540,600,work," + "x" * 200_000,
+        "Fine,2026-11-03,540,600,work,",
+    ]
+    response = client.post(
+        "/events/import",
+        files={"file": ("events.csv", "\n".join(rows).encode(), "text/csv")},
+        headers=user["headers"],
+    )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["imported"] == 1
+    assert summary["errored"] == 1
+    assert "field larger than field limit" in summary["errors"][0]["detail"]
+
+
+def test_undecodable_upload_is_rejected(client, register):
+    user = register("latin1_importer")
+    content = "title\nCaf\xe9\n".encode("latin-1")
+    response = client.post(
+        "/events/import",
+        files={"file": ("events.csv", content, "text/csv")},
+        headers=user["headers"],
+    )
+    assert response.status_code == 400
@@ -0,0 +1,32 @@
+import pytest
+
+from app.core.config import settings
+
+
+@pytest.fixture
+def internal_token(monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "ops-token")
+    return "ops-token"
+
+
+def test_internal_stats_disabled_without_token(client, monkeypatch):
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "")
+    assert client.get("/internal/stats").status_code == 404
+
+
+def test_internal_stats_requires_token(client, internal_token):
+    assert client.get("/internal/stats").status_code == 401
+    wrong = {"Authorization": "Bearer nope"}
+    assert client.get("/internal/stats", headers=wrong).status_code == 401
+    right = {"Authorization": f"Bearer {internal_token}"}
+    response = client.get("/internal/stats", headers=right)
+    assert response.status_code == 200
+    assert "db_pool" in response.json()
+
+
+def test_metrics_requires_token(client, internal_token):
+    assert client.get("/metrics").status_code == 401
+    response = client.get(
+        "/metrics", headers={"Authorization": f"Bearer {internal_token}"}
+    )
+    assert response.status_code == 200
@@ -0,0 +1,34 @@
+def _event(start: int, end: int) -> dict:
+    return {
+        "title": "Standup",
+        "start_date": "2026-11-16",
+        "time": "",
+        "duration": f"{end - start} minutes",
+        "type": "work",
+        "startMinute": start,
+        "endMinute": end,
+    }
+
+
+def _lanes(client, user) -> dict:
+    response = client.get(
+        "/events/",
+        params={"date": "2026-11-16", "layout": True},
+        headers=user["headers"],
+    )
+    assert response.status_code == 200
+    return {event["id"]: event["layout"]["lanes"] for event in response.json()}
+
+
+def test_layout_follows_writes(client, register):
+    user = register("layout_user")
+    first = client.post("/events/", json=_event(540, 600), headers=user["headers"])
+    second = client.post("/events/", json=_event(570, 630), headers=user["headers"])
+    first, second = first.json()["id"], second.json()["id"]
+    assert _lanes(client, user) == {first: 2, second: 2}
+    assert _lanes(client, user) == {first: 2, second: 2}  # Served from the cache
+
+    client.put(
+        f"/events/{second}", json=_event(600, 660), headers=user["headers"]
+    )
+    assert _lanes(client, user) == {first: 1, second: 1}
@@ -0,0 +1,83 @@
+import base64
+import json
+from datetime import date
+
+import pytest
+
+from app.pagination import NEXT_CURSOR_HEADER, encode_event_cursor
+
+
+def _event(day: int, start_minute: int) -> dict:
+    return {
+        "title": f"Slot {day}/{start_minute}",
+        "start_date": f"2026-11-{day:02d}",
+        "time": "",
+        "duration": "30 minutes",
+        "type": "work",
+        "startMinute": start_minute,
+        "endMinute": start_minute + 30,
+    }
+
+
+def _forge(kind: str, values: list) -> str:
+    raw = json.dumps({"k": kind, "v": values}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _pages(client, path: str, limit: int, headers=None) -> list:
+    ids, params = [], {"limit": limit}
+    while True:
+        response = client.get(path, params=params, headers=headers)
+        assert response.status_code == 200
+        ids.extend(item["id"] for item in response.json())
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            return ids
+        params = {"limit": limit, "cursor": cursor}
+
+
+def test_event_cursor_round_trip(client, register):
+    user = register("pager")
+    # Same-day ties on startMinute are ordered by id
+    for day, minute in [(3, 600), (1, 540), (3, 540), (2, 540), (3, 540)]:
+        client.post("/events/", json=_event(day, minute), headers=user["headers"])
+
+    everything = client.get("/events/", headers=user["headers"]).json()
+    paged = _pages(client, "/events/", limit=2, headers=user["headers"])
+    assert paged == [event["id"] for event in everything]
+    assert len(paged) == 5
+
+
+def test_user_cursor_round_trip(client, register):
+    for i in range(4):
+        register(f"listed{i}")
+    everything = client.get("/users/", params={"limit": 1000}).json()
+    assert _pages(client, "/users/", limit=3) == [user["id"] for user in everything]
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    ["not a cursor", _forge("users", [None, 1]), _forge("users", [5, 1])],
+)
+def test_malformed_user_cursor(client, cursor):
+    response = client.get("/users/", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Malformed cursor"
+
+
+def test_malformed_event_cursor(client, register):
+    user = register("forger")
+    response = client.get(
+        "/events/",
+        params={"cursor": _forge("events", ["2026-11-01", "540", 1])},
+        headers=user["headers"],
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Malformed cursor"
+
+
+def test_cursor_from_another_listing(client):
+    cursor = encode_event_cursor(date(2026, 11, 1), 540, 1)
+    response = client.get("/users/", params={"cursor": cursor})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Cursor does not belong to this listing"
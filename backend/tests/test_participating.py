@@ -0,0 +1,54 @@
+def _event(title: str, start_date: str, **fields) -> dict:
+    return {
+        "title": title,
+        "start_date": start_date,
+        "time": "",
+        "duration": "60 minutes",
+        "type": "social",
+        "startMinute": 720,
+        "endMinute": 780,
+        **fields,
+    }
+
+
+def test_listing_includes_attended_events_once(client, register):
+    host, guest = register("attended_host"), register("attended_guest")
+
+    def create(user, *args, **fields) -> int:
+        response = client.post(
+            "/events/", json=_event(*args, **fields), headers=user["headers"]
+        )
+        return response.json()["id"]
+
+    invited = create(host, "Lunch", "2026-11-10", participants=[guest["id"]])
+    create(host, "Host only", "2026-11-11")
+    # The creator also attends their own event, and names themselves here
+    own = create(guest, "Own", "2026-11-12", participants=[guest["id"], host["id"]])
+    series = create(
+        host,
+        "Weekly lunch",
+        "2026-11-03",
+        participants=[guest["id"]],
+        recurrence={"freq": "weekly", "count": 3},
+    )
+
+    def listing(**params) -> list:
+        response = client.get("/events/", params=params, headers=guest["headers"])
+        assert response.status_code == 200
+        return [(e["id"], e["start_date"]) for e in response.json()]
+
+    assert listing() == [(own, "2026-11-12")]
+    assert listing(include_participating=True) == [
+        (series, "2026-11-03"),
+        (invited, "2026-11-10"),
+        (own, "2026-11-12"),
+    ]
+    # Ranged: the attended series is expanded as well
+    assert listing(
+        include_participating=True, **{"from": "2026-11-09", "to": "2026-11-30"}
+    ) == [
+        (invited, "2026-11-10"),
+        (series, "2026-11-10"),
+        (own, "2026-11-12"),
+        (series, "2026-11-17"),
+    ]
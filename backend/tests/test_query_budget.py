@@ -0,0 +1,115 @@
+"""Statement budgets for the event endpoints.
+
+Each budget holds however many events and participants are involved, so an
+N+1 regression (a lazy load per event or per participant) fails here.
+"""
+
+import itertools
+
+import pytest
+
+from app.db.query_counter import QueryCounter, assert_max_queries
+
+_names = itertools.count()
+
+
+def _event(day: int = 10, **fields) -> dict:
+    return dict(
+        {
+            "title": "Planning",
+            "start_date": f"2026-11-{day:02d}",
+            "time": "09:00 - 10:00",
+            "duration": "60 minutes",
+            "type": "work",
+            "startMinute": 540,
+            "endMinute": 600,
+            "location": {"type": "online", "platform": "Zoom"},
+        },
+        **fields,
+    )
+
+
+@pytest.fixture
+def owner(register):
+    return register(f"owner{next(_names)}")
+
+
+@pytest.fixture
+def guests(register):
+    return [register(f"guest{next(_names)}") for _ in range(3)]
+
+
+def _seed(client, owner, guests, events: int) -> list:
+    participants = [guest["id"] for guest in guests]
+    return [
+        client.post(
+            "/events/",
+            json=_event(day=1 + i % 28, participants=participants),
+            headers=owner["headers"],
+        ).json()["id"]
+        for i in range(events)
+    ]
+
+
+def _listing_statements(client, owner) -> int:
+    client.get("/events/", headers=owner["headers"])  # Warm the user cache
+    with QueryCounter() as counter:
+        response = client.get(
+            "/events/", params={"limit": 1000}, headers=owner["headers"]
+        )
+    assert response.status_code == 200
+    return counter.count
+
+
+def test_listing_statements_do_not_grow_with_events(client, owner, guests):
+    _seed(client, owner, guests, 2)
+    few = _listing_statements(client, owner)
+    _seed(client, owner, guests, 30)
+    many = _listing_statements(client, owner)
+    assert many == few
+    assert many <= 3
+
+
+def test_listing_with_attended_events_budget(client, owner, guests):
+    _seed(client, owner, guests, 20)
+    guest = guests[0]
+    client.get("/events/", headers=guest["headers"])
+    with assert_max_queries(3):
+        response = client.get(
+            "/events/",
+            params={"include_participating": True, "limit": 1000},
+            headers=guest["headers"],
+        )
+    assert len(response.json()) == 20
+
+
+def test_create_budget(client, owner, guests):
+    participants = [guest["id"] for guest in guests]
+    client.get("/events/", headers=owner["headers"])
+    with assert_max_queries(7):
+        response = client.post(
+            "/events/", json=_event(participants=participants), headers=owner["headers"]
+        )
+    assert response.status_code == 200
+    assert len(response.json()["participants"]) == len(guests) + 1
+
+
+def test_update_budget(client, owner, guests):
+    (event_id,) = _seed(client, owner, guests, 1)
+    participants = [guest["id"] for guest in guests[:2]]
+    with assert_max_queries(8):
+        response = client.put(
+            f"/events/{event_id}",
+            json=_event(day=12, participants=[owner["id"], *participants]),
+            headers=owner["headers"],
+        )
+    assert response.status_code == 200
+    assert response.json()["version"] == 2
+
+
+def test_delete_budget(client, owner, guests):
+    (event_id,) = _seed(client, owner, guests, 1)
+    with assert_max_queries(6):
+        response = client.delete(f"/events/{event_id}", headers=owner["headers"])
+    assert response.status_code == 200
+    assert len(response.json()["participants"]) == len(guests) + 1
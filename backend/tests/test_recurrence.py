@@ -0,0 +1,143 @@
+import itertools
+from datetime import date
+
+import pytest
+
+from app.pagination import NEXT_CURSOR_HEADER
+from app.recurrence import iter_occurrences, series_end
+from app.schemas import RecurrenceRule
+
+_names = itertools.count()
+
+
+def _rule(**fields) -> RecurrenceRule:
+    return RecurrenceRule.model_validate(fields)
+
+
+def _dates(*isoformats: str) -> list:
+    return [date.fromisoformat(value) for value in isoformats]
+
+
+def test_monthly_on_the_31st_skips_short_months():
+    rule = _rule(freq="monthly", count=4)
+    assert list(iter_occurrences(date(2026, 1, 31), rule)) == _dates(
+        "2026-01-31", "2026-03-31"
+    )
+    # The skipped steps still count, and bound the series at the end of April
+    assert series_end(date(2026, 1, 31), rule) == date(2026, 4, 30)
+
+
+def test_monthly_on_the_29th_meets_february_only_in_leap_years():
+    rule = _rule(freq="monthly", interval=12)
+    window = (date(2027, 1, 1), date(2032, 12, 31))
+    assert list(iter_occurrences(date(2024, 2, 29), rule, *window)) == _dates(
+        "2028-02-29", "2032-02-29"
+    )
+
+
+def test_window_skips_ahead_and_honours_until_and_exceptions():
+    rule = _rule(
+        freq="weekly",
+        interval=2,
+        until="2027-06-30",
+        exceptions=["2027-06-09"],
+    )
+    occurrences = iter_occurrences(
+        date(2026, 1, 7), rule, date(2027, 5, 20), date(2027, 12, 31)
+    )
+    assert list(occurrences) == _dates("2027-05-26", "2027-06-23")
+    assert series_end(date(2026, 1, 7), rule) == date(2027, 6, 30)
+
+
+def test_daily_count_and_unbounded_series_end():
+    assert series_end(date(2026, 3, 1), _rule(freq="daily", count=10)) == date(
+        2026, 3, 10
+    )
+    assert series_end(date(2026, 3, 1), _rule(freq="daily")) is None
+
+
+# --- Listings ---
+@pytest.fixture
+def owner(register):
+    return register(f"recurring{next(_names)}")
+
+
+def _create(client, owner, start_date: str, start_minute: int, **fields) -> dict:
+    event = {
+        "title": "Recurring" if "recurrence" in fields else "Single",
+        "start_date": start_date,
+        "time": "",
+        "duration": "30 minutes",
+        "type": "personal",
+        "startMinute": start_minute,
+        "endMinute": start_minute + 30,
+        **fields,
+    }
+    response = client.post("/events/", json=event, headers=owner["headers"])
+    assert response.status_code == 200
+    return response.json()
+
+
+def _listing(client, owner, **params) -> list:
+    response = client.get("/events/", params=params, headers=owner["headers"])
+    assert response.status_code == 200
+    return [(e["start_date"], e["startMinute"], e["id"]) for e in response.json()]
+
+
+def test_listing_expands_series_in_range(client, owner):
+    series = _create(
+        client,
+        owner,
+        "2026-01-31",
+        480,
+        recurrence={"freq": "monthly", "exceptions": ["2026-05-31"]},
+    )
+    single = _create(client, owner, "2026-03-31", 420)
+
+    listing = _listing(client, owner, **{"from": "2026-02-01", "to": "2026-07-31"})
+    assert listing == [
+        ("2026-03-31", 420, single["id"]),
+        ("2026-03-31", 480, series["id"]),
+        ("2026-07-31", 480, series["id"]),
+    ]
+    [occurrence] = client.get(
+        "/events/", params={"date": "2026-07-31"}, headers=owner["headers"]
+    ).json()
+    assert occurrence["series_start_date"] == "2026-01-31"
+
+
+def test_ended_series_is_not_listed(client, owner):
+    _create(
+        client,
+        owner,
+        "2026-01-05",
+        600,
+        recurrence={"freq": "weekly", "until": "2026-02-28"},
+    )
+    assert len(_listing(client, owner, **{"from": "2026-02-01", "to": "2026-02-28"}))
+    assert _listing(client, owner, **{"from": "2026-03-01", "to": "2026-12-31"}) == []
+
+
+def test_cursor_pages_through_occurrences(client, owner):
+    _create(client, owner, "2026-06-01", 540, recurrence={"freq": "daily"})
+    _create(
+        client, owner, "2026-06-02", 600, recurrence={"freq": "weekly", "count": 3}
+    )
+    for day in ("2026-06-02", "2026-06-09", "2026-06-10"):
+        _create(client, owner, day, 540)
+    window = {"from": "2026-06-01", "to": "2026-06-14"}
+    everything = _listing(client, owner, limit=100, **window)
+    assert len(everything) == 14 + 2 + 3  # The third weekly one is on 06-16
+    assert everything == sorted(everything)
+
+    paged, params = [], {"limit": 3, **window}
+    while True:
+        response = client.get("/events/", params=params, headers=owner["headers"])
+        paged.extend(
+            (e["start_date"], e["startMinute"], e["id"]) for e in response.json()
+        )
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor is None:
+            break
+        params = {"limit": 3, "cursor": cursor, **window}
+    assert paged == everything
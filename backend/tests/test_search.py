@@ -0,0 +1,94 @@
+import pytest
+
+from app.event_search import fts5_query, search_terms, tsquery
+
+
+def _event(title: str, **fields) -> dict:
+    return {
+        "title": title,
+        "start_date": "2026-11-16",
+        "time": "",
+        "duration": "60 minutes",
+        "type": "work",
+        "startMinute": 600,
+        "endMinute": 660,
+        **fields,
+    }
+
+
+def test_query_terms_are_words_only():
+    terms = search_terms('Plan* "meet" OR (NEAR)-')
+    assert terms == ["plan", "meet", "or", "near"]
+    assert fts5_query(terms[:2]) == '"plan"* AND "meet"*'
+    assert tsquery(terms[:2]) == "plan:* & meet:*"
+
+
+@pytest.fixture(scope="module")
+def searchers(client, register):
+    owner, guest, outsider = (register(f"searcher_{n}") for n in ("a", "b", "c"))
+
+    def create(user, *args, **fields) -> int:
+        response = client.post(
+            "/events/", json=_event(*args, **fields), headers=user["headers"]
+        )
+        return response.json()["id"]
+
+    ids = {
+        "title": create(owner, "Planning meeting", participants=[guest["id"]]),
+        "description": create(
+            owner, "Sync", description="Meeting notes for the planning cycle"
+        ),
+        "location": create(
+            owner, "Offsite", location={"type": "onsite", "address": "Planet Hall"}
+        ),
+        "private": create(owner, "Planning retro"),
+        "foreign": create(outsider, "Planning meeting"),
+    }
+    return owner, guest, outsider, ids
+
+
+def _search(client, user, q: str, **params):
+    response = client.get(
+        "/events/search", params={"q": q, **params}, headers=user["headers"]
+    )
+    assert response.status_code == 200
+    return [event["id"] for event in response.json()]
+
+
+def test_prefix_matching_and_ranking(client, searchers):
+    owner, _, _, ids = searchers
+    # Every word must match as a prefix; title matches rank above description
+    assert _search(client, owner, "plan meet") == [ids["title"], ids["description"]]
+    assert set(_search(client, owner, "plan")) == {
+        ids["title"],
+        ids["private"],
+        ids["description"],
+        ids["location"],  # "Planet Hall"
+    }
+    assert _search(client, owner, "hall") == [ids["location"]]
+    assert _search(client, owner, "nothing") == []
+
+
+def test_results_are_limited_to_visible_events(client, searchers):
+    _, guest, outsider, ids = searchers
+    # The guest attends one of the owner's events and sees only that one
+    assert _search(client, guest, "planning") == [ids["title"]]
+    assert _search(client, outsider, "planning") == [ids["foreign"]]
+
+
+def test_index_follows_updates_and_deletes(client, searchers):
+    owner, _, _, ids = searchers
+    event_url = f"/events/{ids['private']}"
+    client.put(event_url, json=_event("Budget retro"), headers=owner["headers"])
+    assert ids["private"] not in _search(client, owner, "planning")
+    assert _search(client, owner, "budget") == [ids["private"]]
+    client.delete(event_url, headers=owner["headers"])
+    assert _search(client, owner, "budget") == []
+
+
+def test_query_without_words_is_rejected(client, searchers):
+    owner = searchers[0]
+    response = client.get(
+        "/events/search", params={"q": "*** --"}, headers=owner["headers"]
+    )
+    assert response.status_code == 400
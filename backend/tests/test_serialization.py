@@ -0,0 +1,63 @@
+import json
+from datetime import date
+
+import app.crud as crud
+from app.db.session import SessionLocal
+from app.schemas import EventResponse
+from app.serialization import dump_events, iter_event_chunks
+
+
+def test_fast_path_matches_event_response(client, register):
+    owner = register("serialized")
+    guests = [register(f"serialized_guest{i}")["id"] for i in range(2)]
+    base = {
+        "time": "10:00 - 11:00",
+        "duration": "60 minutes",
+        "type": "project",
+        "startMinute": 600,
+        "endMinute": 660,
+    }
+    events = [
+        # Null description and location, no other participants
+        dict(base, title="Bare", start_date="2026-11-02"),
+        dict(
+            base,
+            title="Full",
+            start_date="2026-11-03",
+            description="Quarterly planning",
+            location={"type": "online", "platform": "Zoom", "link": "https://x.test"},
+            participants=guests,
+        ),
+        dict(
+            base,
+            title="Series",
+            start_date="2026-11-04",
+            location={"type": "onsite", "address": "Room 4"},
+            recurrence={
+                "freq": "weekly",
+                "interval": 2,
+                "until": "2026-12-31",
+                "exceptions": ["2026-11-18"],
+            },
+            participants=guests[:1],
+        ),
+    ]
+    for event in events:
+        response = client.post("/events/", json=event, headers=owner["headers"])
+        assert response.status_code == 200
+
+    with SessionLocal() as db:
+        stored = crud.get_events(db, owner["id"])
+        # A ranged listing has the series' occurrences in its place
+        expanded = crud.get_events(
+            db, owner["id"], date_from=date(2026, 11, 1), date_to=date(2026, 12, 31)
+        )
+        assert len(expanded) == 6
+        for listing in (stored, expanded):
+            expected = [
+                EventResponse.model_validate(event).model_dump(mode="json")
+                for event in listing
+            ]
+            assert json.loads(dump_events(listing)) == expected
+            chunks = b"".join(iter_event_chunks(listing, chunk_size=2))
+            assert json.loads(chunks) == expected
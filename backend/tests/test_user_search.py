@@ -0,0 +1,9 @@
+def test_user_search_requires_authentication(client, register):
+    user = register("typeahead_target")
+    assert client.get("/users/search", params={"q": "typeahead"}).status_code == 401
+
+    response = client.get(
+        "/users/search", params={"q": "typeahead"}, headers=user["headers"]
+    )
+    assert response.status_code == 200
+    assert [found["id"] for found in response.json()] == [user["id"]]
@@ -51,7 +51,6 @@ export default function CreateEventModal() {
         address, setAddress,
         guests,
         currentUser,
-        users,
         toggleGuest
     } = useEventForm();
 
@@ -108,9 +107,10 @@ export default function CreateEventModal() {
             let response;
             if (eventToEdit) {
                 // Update existing event.
+                // The server refuses the edit (409) if the event changed since it was loaded.
                 response = await apiFetch(`/events/${eventToEdit.id}`, {
                     method: "PUT",
-                    body: JSON.stringify(eventData),
+                    body: JSON.stringify({ ...eventData, version: eventToEdit.version }),
                 });
             } else {
                 // Create new event.
@@ -120,6 +120,11 @@ export default function CreateEventModal() {
                 });
             }
 
+            if (eventToEdit && response.status === 409) {
+                alert("This event was changed by someone else. Reopen it to see the latest version.");
+                return;
+            }
+
             if (!response.ok) {
                 throw new Error(eventToEdit ? "Failed to update event" : "Failed to create event");
             }
@@ -447,7 +452,6 @@ export default function CreateEventModal() {
                     <GuestSelectionDialog
                         isOpen={isGuestDialogOpen}
                         onOpenChange={setIsGuestDialogOpen}
-                        users={users}
                         guests={guests}
                         currentUser={currentUser}
                         toggleGuest={toggleGuest}
@@ -1,3 +1,4 @@
+import { useEffect, useState } from "react";
 import {
     Dialog,
     DialogContent,
@@ -7,12 +8,16 @@ import {
 } from "@/components/ui/dialog";
 import { Avatar, AvatarFallback, AvatarImage } from "@/components/ui/avatar";
 import { Button } from "@/components/ui/button";
+import { Input } from "@/components/ui/input";
+import { useUsersStore } from "@/store/users";
 import { type User } from "@/types";
 
+// Wait for a pause in typing before asking the server
+const SEARCH_DEBOUNCE_MS = 150;
+
 interface GuestSelectionDialogProps {
     isOpen: boolean;
     onOpenChange: (isOpen: boolean) => void;
-    users: User[];
     guests: User[];
     currentUser: User | null;
     toggleGuest: (user: User) => void;
@@ -21,19 +26,41 @@ interface GuestSelectionDialogProps {
 export default function GuestSelectionDialog({
     isOpen,
     onOpenChange,
-    users,
     guests,
     currentUser,
     toggleGuest,
 }: GuestSelectionDialogProps) {
+    const [query, setQuery] = useState("");
+    const { users, isLoading, searchUsers } = useUsersStore();
+
+    useEffect(() => {
+        if (!isOpen) return;
+        const timer = setTimeout(() => searchUsers(query), SEARCH_DEBOUNCE_MS);
+        return () => clearTimeout(timer);
+    }, [isOpen, query, searchUsers]);
+
+    // Without a query, list the guests picked so far so they can be removed
+    const shown = query.trim() ? users : guests;
+
     return (
         <Dialog open={isOpen} onOpenChange={onOpenChange}>
             <DialogContent className="sm:max-w-md bg-white dark:bg-slate-900 border-gray-100 dark:border-slate-800 rounded-xl">
                 <DialogHeader>
                     <DialogTitle>Select Guests</DialogTitle>
                 </DialogHeader>
+                <Input
+                    autoFocus
+                    value={query}
+                    onChange={(e) => setQuery(e.target.value)}
+                    placeholder="Search by name or email"
+                />
                 <div className="py-4 space-y-2 max-h-[60vh] overflow-y-auto">
-                    {users
+                    {query.trim() && !isLoading && users.length === 0 && (
+                        <p className="text-sm text-muted-foreground text-center">
+                            No users found
+                        </p>
+                    )}
+                    {shown
                         .filter((user) => user.id !== currentUser?.id)
                         .map((user) => {
                             const isSelected = guests.some((g) => g.id === user.id);
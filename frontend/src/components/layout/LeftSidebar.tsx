@@ -5,7 +5,7 @@ import { ScrollArea } from "@/components/ui/scroll-area";
 import { useSelectDateStore } from '@/store/selectDate';
 import { useModalStore } from '@/store/modal';
 import { useAuthStore } from '@/store/auth';
-import { type Event } from '@/types';
+import { type EventStats } from '@/types';
 import { apiFetch } from '@/lib/api';
 import Footer from "./Footer";
 
@@ -26,23 +26,11 @@ export default function LeftSidebar() {
     useEffect(() => {
         const fetchEventCounts = async () => {
             try {
-                const response = await apiFetch(`/events/?limit=1000`);
+                // Counts are aggregated server-side; no need to download every event.
+                const response = await apiFetch(`/events/stats`);
                 if (response.ok) {
-                    const data: Event[] = await response.json();
-                    const counts: Record<string, number> = {
-                        work: 0,
-                        personal: 0,
-                        social: 0,
-                        project: 0
-                    };
-
-                    data.forEach(event => {
-                        if (counts[event.type] !== undefined) {
-                            counts[event.type]++;
-                        }
-                    });
-
-                    setEventCounts(counts);
+                    const data: EventStats = await response.json();
+                    setEventCounts(data.by_type);
                 }
             } catch (error) {
                 console.error("Failed to fetch event counts", error);
@@ -2,7 +2,6 @@ import { useState, useEffect } from 'react';
 import { useModalStore } from '@/store/modal';
 import { useAuthStore } from '@/store/auth';
 import { useSelectDateStore } from '@/store/selectDate';
-import { useUsersStore } from '@/store/users';
 import { type User, type DecodedToken } from '@/types';
 import { jwtDecode } from "jwt-decode";
 import { format } from "date-fns";
@@ -10,7 +9,7 @@ import { format } from "date-fns";
 /**
  * A custom hook to manage the state and logic of the event creation/editing form.
  * It encapsulates form field states, initialization logic for create/edit modes,
- * and handles user and guest data.
+ * and handles guest data.
  *
  * @returns An object containing form state, state setters, and helper functions.
  */
@@ -18,7 +17,6 @@ export function useEventForm() {
     const { isOpen, eventToEdit } = useModalStore();
     const token = useAuthStore((state) => state.token);
     const selectedDate = useSelectDateStore((state) => state.selectedDate);
-    const { users, fetchUsers } = useUsersStore();
 
     // Form field states
     const [title, setTitle] = useState("");
@@ -37,8 +35,6 @@ export function useEventForm() {
     // Effect to initialize the form when the modal opens.
     useEffect(() => {
         if (isOpen) {
-            fetchUsers();
-
             if (eventToEdit) {
                 // "Edit mode": Populate form with event data.
                 setTitle(eventToEdit.title);
@@ -73,7 +69,7 @@ export function useEventForm() {
                 setGuests(currentUser ? [currentUser] : []);
             }
         }
-    }, [isOpen, selectedDate, eventToEdit, currentUser, fetchUsers]);
+    }, [isOpen, selectedDate, eventToEdit, currentUser]);
 
     // Effect to decode the JWT and set the current user.
     useEffect(() => {
@@ -129,7 +125,6 @@ export function useEventForm() {
         address, setAddress,
         guests, setGuests,
         currentUser,
-        users,
         toggleGuest
     };
 }
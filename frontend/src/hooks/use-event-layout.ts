@@ -30,6 +30,17 @@ export function useEventLayout(events: Event[]) {
     // Memoize the layout calculation to handle overlaps.
     const eventsWithLayout = useMemo(() => {
         return processedEvents.map((event, _index, array) => {
+            // Prefer the lanes computed by the server (GET /events/?layout=true).
+            if (event.layout) {
+                const { lane, lanes } = event.layout;
+                return {
+                    ...event,
+                    widthPercent: 95 / lanes,
+                    leftPercent: lane * (100 / lanes),
+                    zIndex: 10 + lane,
+                };
+            }
+
             // Find all events that overlap with the current event.
             const overlappingEvents = array.filter(e =>
                 (e.startMinute < event.endMinute && e.endMinute > event.startMinute)
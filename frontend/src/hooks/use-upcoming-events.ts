@@ -1,21 +1,29 @@
-import { useState, useEffect, useCallback } from 'react';
+import { useState, useEffect, useCallback, useMemo } from 'react';
 import { type Event } from "@/types";
 import { apiFetch } from "@/lib/api";
 import { format, addDays } from "date-fns";
 import { useEventsStore } from "@/store/events";
+import { useAuthStore } from "@/store/auth";
+
+const BASE_URL = import.meta.env.VITE_API_BASE_URL;
+
+// The change stream drives refreshes; this slow poll only covers a dropped stream.
+const FALLBACK_REFRESH_MS = 5 * 60000;
 
 /**
  * A custom hook to fetch and manage upcoming events for today and tomorrow.
- * It periodically refreshes the event data to keep the view up-to-date.
+ * It refetches when the server pushes an event change and re-filters past events every minute.
  *
  * @returns An object containing `todayEvents`, `tomorrowEvents`, and a `loading` state.
  */
 export function useUpcomingEvents() {
-    const [todayEvents, setTodayEvents] = useState<Event[]>([]);
+    const [todayData, setTodayData] = useState<Event[]>([]);
     const [tomorrowEvents, setTomorrowEvents] = useState<Event[]>([]);
     const [loading, setLoading] = useState(true);
+    const [now, setNow] = useState(() => new Date());
+    const token = useAuthStore((state) => state.token);
 
-    // Fetches events for today and tomorrow and filters them.
+    // Fetches events for today and tomorrow.
     const fetchUpcomingEvents = useCallback(async () => {
         try {
             setLoading(true);
@@ -25,25 +33,13 @@ export function useUpcomingEvents() {
             const todayStr = format(today, "yyyy-MM-dd");
             const tomorrowStr = format(tomorrow, "yyyy-MM-dd");
 
-            const [todayRes, tomorrowRes] = await Promise.all([
-                apiFetch(`/events/?date=${todayStr}`),
-                apiFetch(`/events/?date=${tomorrowStr}`)
-            ]);
-
-            if (todayRes.ok && tomorrowRes.ok) {
-                const todayData: Event[] = await todayRes.json();
-                const tomorrowData: Event[] = await tomorrowRes.json();
-
-                const now = new Date();
-                const currentMinutes = now.getHours() * 60 + now.getMinutes();
+            // One range query covers both days.
+            const response = await apiFetch(`/events/?from=${todayStr}&to=${tomorrowStr}`);
 
-                // Filter today's events to only include future events.
-                const filteredToday = todayData.filter(event => {
-                    return event.startMinute > currentMinutes;
-                });
-
-                setTodayEvents(filteredToday);
-                setTomorrowEvents(tomorrowData);
+            if (response.ok) {
+                const data: Event[] = await response.json();
+                setTodayData(data.filter(event => event.start_date === todayStr));
+                setTomorrowEvents(data.filter(event => event.start_date === tomorrowStr));
             }
         } catch (error) {
             console.error("Failed to fetch upcoming events", error);
@@ -52,14 +48,36 @@ export function useUpcomingEvents() {
         }
     }, []);
 
+    // Filter today's events to only include future events.
+    const todayEvents = useMemo(() => {
+        const currentMinutes = now.getHours() * 60 + now.getMinutes();
+        return todayData.filter(event => event.startMinute > currentMinutes);
+    }, [todayData, now]);
+
     const refreshTrigger = useEventsStore((state) => state.refreshTrigger);
 
-    // Effect to fetch events on mount and set up a polling interval.
+    // Effect to fetch events on mount and keep a slow fallback refresh.
     useEffect(() => {
         fetchUpcomingEvents();
-        const interval = setInterval(fetchUpcomingEvents, 60000); // Refresh every minute.
+        const interval = setInterval(fetchUpcomingEvents, FALLBACK_REFRESH_MS);
         return () => clearInterval(interval);
     }, [fetchUpcomingEvents, refreshTrigger]);
 
+    // Effect to drop events that have started, without a network round trip.
+    useEffect(() => {
+        const interval = setInterval(() => setNow(new Date()), 60000);
+        return () => clearInterval(interval);
+    }, []);
+
+    // Effect to refetch whenever the server reports a change (GET /events/stream).
+    useEffect(() => {
+        if (!token) return;
+        const source = new EventSource(`${BASE_URL}/events/stream?token=${encodeURIComponent(token)}`);
+        for (const type of ['created', 'updated', 'deleted', 'resync']) {
+            source.addEventListener(type, fetchUpcomingEvents);
+        }
+        return () => source.close();
+    }, [token, fetchUpcomingEvents]);
+
     return { todayEvents, tomorrowEvents, loading };
 }
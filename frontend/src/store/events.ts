@@ -23,7 +23,7 @@ export const useEventsStore = create<EventsState>((set) => ({
         set({ isLoading: true, error: null });
         try {
             const formattedDate = format(date, "yyyy-MM-dd");
-            const response = await apiFetch(`/events/?date=${formattedDate}`);
+            const response = await apiFetch(`/events/?date=${formattedDate}&layout=true`);
 
             if (!response.ok) {
                 throw new Error("Failed to fetch events");
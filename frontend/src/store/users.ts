@@ -6,30 +6,36 @@ interface UsersState {
     users: User[];
     isLoading: boolean;
     error: string | null;
-    fetchUsers: () => Promise<void>;
+    searchUsers: (query: string) => Promise<void>;
 }
 
+// Typeahead responses can arrive out of order; only the latest one is kept.
+let latestSearch = 0;
+
 export const useUsersStore = create<UsersState>((set) => ({
     users: [],
     isLoading: false,
     error: null,
-    fetchUsers: async () => {
+    searchUsers: async (query: string) => {
+        const search = ++latestSearch;
+        if (!query.trim()) {
+            set({ users: [], isLoading: false, error: null });
+            return;
+        }
         set({ isLoading: true, error: null });
         try {
-            const response = await apiFetch('/users/', {
+            const params = new URLSearchParams({ q: query });
+            const response = await apiFetch(`/users/search?${params}`, {
                 method: 'GET',
-                // apiFetch handles Content-Type: application/json by default
             });
 
             if (!response.ok) {
-                throw new Error('Failed to fetch users');
+                throw new Error('Failed to search users');
             }
 
             const data = await response.json();
-            // data is UserResponse[], need to map to User type if they differ
+            if (search !== latestSearch) return;
             // UserResponse: { id: int, username: str, email: str, image: str }
-            // User type: { id: string, name: string, email: string, image: string, avatar?: string }
-
             const fetchedUsers: User[] = (data as any[]).map((u: any) => ({
                 id: String(u.id),
                 username: u.username,
@@ -39,6 +45,7 @@ export const useUsersStore = create<UsersState>((set) => ({
 
             set({ users: fetchedUsers, isLoading: false, error: null });
         } catch (error) {
+            if (search !== latestSearch) return;
             set({ error: (error as Error).message, isLoading: false });
         }
     },
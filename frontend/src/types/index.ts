@@ -33,9 +33,17 @@ export type Event = {
     description?: string; // Added description field
     location?: LocationType;
     start_date?: string; // YYYY-MM-DD
+    layout?: { lane: number; lanes: number }; // server-computed day-view lane
+    version?: number; // bumped by every write; sent back with edits
     // attachments?: { name: string; size: string; type: 'pdf' | 'image' | 'zip' }[];
 }
 
+export type EventStats = {
+    total: number;
+    by_type: Record<string, number>;
+    buckets: { date: string; counts: Record<string, number> }[];
+}
+
 export type DecodedToken = {
     sub: string; // User ID
     username: string;